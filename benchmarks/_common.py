@@ -0,0 +1,122 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Os benchmarks usam o psutil para medir memória e CPU da árvore de processos do
+navegador (pip install psutil).
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from typing import Dict, Any, List, Optional
+
+# Permite importar o pacote a partir da raiz do repositório (como o start.py)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# As configurações do .env valem também para os benchmarks
+from src.auto_search.config.environment import load_environment
+
+load_environment()
+
+
+def process_tree(pid: int) -> List[Any]:
+    """Retorna o processo e todos os seus descendentes"""
+    import psutil
+
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def tree_usage(pid: int) -> Dict[str, float]:
+    """Soma RSS (MB) e tempo de CPU (s) da árvore de processos"""
+    import psutil
+
+    rss = 0
+    cpu = 0.0
+    for process in process_tree(pid):
+        try:
+            rss += process.memory_info().rss
+            times = process.cpu_times()
+            cpu += times.user + times.system
+        except psutil.Error:
+            continue
+    return {'rss_mb': rss / (1024 * 1024), 'cpu_seconds': cpu}
+
+
+class ResourceSampler:
+    """Amostra periodicamente o uso de recursos de uma árvore de processos"""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[Dict[str, float]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.samples.append(tree_usage(self.pid))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.samples.append(tree_usage(self.pid))
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {'peak_rss_mb': 0.0, 'mean_rss_mb': 0.0, 'cpu_seconds': 0.0}
+        rss = [s['rss_mb'] for s in self.samples]
+        cpu = [s['cpu_seconds'] for s in self.samples]
+        return {
+            'peak_rss_mb': max(rss),
+            'mean_rss_mb': sum(rss) / len(rss),
+            'cpu_seconds': max(cpu) - min(cpu)
+        }
+
+
+def driver_pid(driver) -> Optional[int]:
+    """PID do msedgedriver, raiz da árvore de processos do navegador"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def print_table(rows: List[Dict[str, Any]], columns: List[str]):
+    """Imprime os resultados em formato de tabela"""
+    widths = {c: max([len(c)] + [len(_fmt(r.get(c))) for r in rows]) for c in columns}
+    print('  '.join(c.ljust(widths[c]) for c in columns))
+    print('  '.join('-' * widths[c] for c in columns))
+    for row in rows:
+        print('  '.join(_fmt(row.get(c)).ljust(widths[c]) for c in columns))
+
+
+def _fmt(value: Any) -> str:
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return str(value)
+
+
+def write_json(path: Optional[str], payload: Any):
+    """Grava os resultados em JSON, se um caminho foi informado"""
+    if not path:
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    print(f'Resultados gravados em {path}')
+
+
+def timestamp() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
@@ -0,0 +1,137 @@
+"""
+Compara os backends de automação Selenium e CDP/asyncio.
+
+Mede a latência por ação (script na página e navegação) em uma sessão e, com
+várias sessões simultâneas, o uso de CPU do processo controlador. O número de
+sessões por núcleo é estimado como sessões x tempo de parede / tempo de CPU do
+controlador (o custo dos navegadores em si não entra na conta).
+
+Uso:
+    python benchmarks/bench_backends.py --profile "C:\\...\\User Data\\Default" --actions 50 --sessions 4
+"""
+
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+from _common import print_table, write_json, timestamp
+
+from src.auto_search.core.automation import EdgeAutomation
+from src.auto_search.core.cdp_automation import CdpAutomation, run_sessions
+
+CONFIG = {
+    'typing_speed': 'instant',
+    'dwell_scale': 0,
+    'min_interval': 0,
+    'max_interval': 0,
+    'use_term_history': False,
+    'headless': True
+}
+
+
+def latency_row(backend: str, action: str, samples) -> dict:
+    ordered = sorted(samples)
+    return {
+        'backend': backend,
+        'action': action,
+        'mean_ms': statistics.mean(ordered) * 1000,
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000
+    }
+
+
+def selenium_latency(profile: str, actions: int) -> list:
+    automation = EdgeAutomation(profile_path=profile, config=CONFIG)
+    automation.setup_driver()
+    try:
+        script, navigate = [], []
+        for _ in range(actions):
+            start = time.perf_counter()
+            automation.driver.execute_script('return document.title')
+            script.append(time.perf_counter() - start)
+        for _ in range(max(1, actions // 10)):
+            start = time.perf_counter()
+            automation.driver.get(automation.base_url)
+            navigate.append(time.perf_counter() - start)
+    finally:
+        automation.stop_automation()
+    return [latency_row('selenium', 'script', script), latency_row('selenium', 'navigate', navigate)]
+
+
+async def cdp_latency(profile: str, actions: int) -> list:
+    automation = CdpAutomation(profile_path=profile, config=CONFIG)
+    await automation.setup_async()
+    try:
+        script, navigate = [], []
+        for _ in range(actions):
+            start = time.perf_counter()
+            await automation.page.evaluate('document.title')
+            script.append(time.perf_counter() - start)
+        for _ in range(max(1, actions // 10)):
+            start = time.perf_counter()
+            await automation.page.navigate(automation.base_url)
+            navigate.append(time.perf_counter() - start)
+    finally:
+        await automation.stop_automation_async()
+    return [latency_row('cdp', 'script', script), latency_row('cdp', 'navigate', navigate)]
+
+
+def concurrency_row(backend: str, sessions: int, automations, wall: float, cpu: float) -> dict:
+    searches = sum(a.metrics.snapshot()['counters'].get('searches', 0) for a in automations)
+    return {
+        'backend': backend,
+        'sessions': sessions,
+        'searches': int(searches),
+        'threads': threading.active_count(),
+        'controller_cpu_s': cpu,
+        'sessions_per_core': sessions * wall / cpu if cpu else float('inf')
+    }
+
+
+def selenium_concurrency(profile: str, sessions: int, searches: int) -> dict:
+    automations = [EdgeAutomation(profile_path=profile, config=CONFIG) for _ in range(sessions)]
+    threads = [threading.Thread(target=a.start_automation, args=(searches,)) for a in automations]
+    wall, cpu = time.perf_counter(), time.process_time()
+    for thread in threads:
+        thread.start()
+    peak_threads = threading.active_count()
+    for thread in threads:
+        thread.join()
+    row = concurrency_row('selenium', sessions, automations,
+                          time.perf_counter() - wall, time.process_time() - cpu)
+    row['threads'] = peak_threads
+    return row
+
+
+async def cdp_concurrency(profile: str, sessions: int, searches: int) -> dict:
+    automations = [CdpAutomation(profile_path=profile, config=CONFIG) for _ in range(sessions)]
+    wall, cpu = time.perf_counter(), time.process_time()
+    await run_sessions(automations, searches)
+    return concurrency_row('cdp', sessions, automations,
+                           time.perf_counter() - wall, time.process_time() - cpu)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', required=True, help='Caminho do perfil do Edge')
+    parser.add_argument('--actions', type=int, default=50)
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--searches', type=int, default=5, help='Pesquisas por sessão no teste de concorrência')
+    parser.add_argument('--json', help='Arquivo de saída com os resultados')
+    args = parser.parse_args()
+
+    latency = selenium_latency(args.profile, args.actions) + asyncio.run(cdp_latency(args.profile, args.actions))
+    print_table(latency, ['backend', 'action', 'mean_ms', 'p50_ms', 'p95_ms'])
+    print()
+
+    concurrency = [
+        selenium_concurrency(args.profile, args.sessions, args.searches),
+        asyncio.run(cdp_concurrency(args.profile, args.sessions, args.searches))
+    ]
+    print_table(concurrency, ['backend', 'sessions', 'searches', 'threads', 'controller_cpu_s', 'sessions_per_core'])
+    write_json(args.json, {'timestamp': timestamp(), 'latency': latency, 'concurrency': concurrency})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Compara os modos de navegação entre pesquisas (homepage, chain e direct).
+
+Para cada modo executa uma sequência de pesquisas e reporta o número de páginas
+carregadas, os bytes transferidos (a partir do log de performance do Edge) e os
+segundos por pesquisa. Pausas deliberadas e intervalos são desativados para que
+apenas o custo de navegação seja medido.
+
+Uso:
+    python benchmarks/bench_chaining.py --profile "C:\\...\\User Data\\Default" --searches 30
+"""
+
+import json
+import time
+import argparse
+from _common import print_table, write_json, timestamp
+
+from src.auto_search.core.automation import EdgeAutomation
+from src.auto_search.core.terms import TermGenerator
+
+
+class InstrumentedAutomation(EdgeAutomation):
+    """EdgeAutomation com o log de performance do navegador habilitado"""
+
+    def _apply_capabilities(self, options):
+        super()._apply_capabilities(options)
+        options.set_capability('ms:loggingPrefs', {'performance': 'ALL'})
+
+    def drain_transferred_bytes(self) -> int:
+        """Soma os bytes recebidos desde a última leitura do log de performance"""
+        total = 0
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if message.get('method') == 'Network.loadingFinished':
+                total += message['params'].get('encodedDataLength', 0)
+        return int(total)
+
+
+def page_loads(automation: EdgeAutomation) -> int:
+    counters = automation.metrics.snapshot()['counters']
+    return int(sum(v for k, v in counters.items() if k.startswith('page_loads')))
+
+
+def run_mode(profile: str, mode: str, searches: int, seed: int) -> dict:
+    automation = InstrumentedAutomation(
+        profile_path=profile,
+        config={
+            'search_navigation': mode,
+            'typing_speed': 'instant',
+            'dwell_scale': 0,
+            'use_term_history': False
+        }
+    )
+    terms = TermGenerator(seed=seed)
+    completed = 0
+    transferred = 0
+
+    automation.setup_driver()
+    automation.is_running = True
+    try:
+        automation.drain_transferred_bytes()
+        loads_before = page_loads(automation)
+        start = time.perf_counter()
+        for _ in range(searches):
+            if automation.perform_search(terms.next_term()):
+                completed += 1
+            transferred += automation.drain_transferred_bytes()
+        elapsed = time.perf_counter() - start
+        loads = page_loads(automation) - loads_before
+    finally:
+        automation.stop_automation()
+
+    return {
+        'mode': mode,
+        'searches': completed,
+        'page_loads': loads,
+        'mb_transferred': transferred / (1024 * 1024),
+        'seconds_per_search': elapsed / max(1, completed)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', required=True, help='Caminho do perfil do Edge')
+    parser.add_argument('--searches', type=int, default=30)
+    parser.add_argument('--modes', default='homepage,chain,direct')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Arquivo de saída com os resultados')
+    args = parser.parse_args()
+
+    rows = [run_mode(args.profile, mode, args.searches, args.seed) for mode in args.modes.split(',')]
+    print_table(rows, ['mode', 'searches', 'page_loads', 'mb_transferred', 'seconds_per_search'])
+    write_json(args.json, {'timestamp': timestamp(), 'results': rows})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Compara a memória de N navegadores separados com um navegador compartilhado por N contextos.
+
+Cada sessão abre a página inicial do Bing e fica ociosa enquanto a memória
+(RSS da árvore de processos) é medida. No modo compartilhado também é exibido
+o relatório por contexto do SharedBrowser.
+
+Uso:
+    python benchmarks/bench_contexts.py --profile "C:\\...\\User Data\\Default" --sessions 4 --devices desktop,mobile
+"""
+
+import asyncio
+import argparse
+from _common import tree_usage, print_table, write_json, timestamp
+
+from src.auto_search.core.cdp_automation import CdpAutomation
+from src.auto_search.core.contexts import SharedBrowser
+
+CONFIG = {'use_term_history': False, 'headless': True}
+
+
+async def separate_browsers(profile: str, devices) -> dict:
+    automations = [CdpAutomation(profile_path=profile, device_type=d, config=CONFIG) for d in devices]
+    try:
+        await asyncio.gather(*(a.setup_async() for a in automations))
+        await asyncio.sleep(2)
+        rss = sum(tree_usage(a.browser.pid)['rss_mb'] for a in automations)
+    finally:
+        await asyncio.gather(*(a.stop_automation_async() for a in automations))
+    return {'mode': 'separate', 'sessions': len(devices), 'browsers': len(devices), 'rss_mb': rss}
+
+
+async def shared_contexts(browser: SharedBrowser, profile: str, devices) -> dict:
+    automations = [
+        CdpAutomation(profile_path=profile, device_type=d, config=CONFIG, shared_browser=browser)
+        for d in devices
+    ]
+    try:
+        await asyncio.gather(*(a.setup_async() for a in automations))
+        await asyncio.sleep(2)
+        report = await browser._memory_report()
+    finally:
+        await asyncio.gather(*(a.stop_automation_async() for a in automations))
+    return {
+        'mode': 'shared',
+        'sessions': len(devices),
+        'browsers': 1,
+        'rss_mb': report['browser_rss_mb'],
+        'estimated_saved_mb': report['estimated_saved_mb'],
+        'contexts': report['contexts']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', required=True, help='Caminho do perfil do Edge')
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--devices', default='desktop,mobile', help='Dispositivos usados em rodízio')
+    parser.add_argument('--json', help='Arquivo de saída com os resultados')
+    args = parser.parse_args()
+
+    kinds = args.devices.split(',')
+    devices = [kinds[i % len(kinds)] for i in range(args.sessions)]
+
+    rows = [asyncio.run(separate_browsers(args.profile, devices))]
+    browser = SharedBrowser(headless=True)
+    browser.start()
+    try:
+        rows.append(browser.run(shared_contexts(browser, args.profile, devices)))
+    finally:
+        browser.close()
+
+    print_table(rows, ['mode', 'sessions', 'browsers', 'rss_mb', 'estimated_saved_mb'])
+    write_json(args.json, {'timestamp': timestamp(), 'results': rows})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Mede a vazão de ponta a ponta do EdgeAutomation contra o servidor local do Bing.
+
+Para cada combinação de velocidade de digitação, cliques em resultados, modo
+headless, número de sessões simultâneas e intervalo adaptativo, executa as pesquisas contra o
+bing_standin (sem acessar o bing.com) e reporta pesquisas por minuto, a latência
+por fase (p50/p95) e o pico de memória somado dos navegadores (requer psutil).
+
+Uso:
+    python benchmarks/bench_e2e.py --searches 10 --typing-speeds instant,normal --click-results false,true --concurrency 1,2
+    python benchmarks/bench_e2e.py --searches 30 --min-interval 1 --max-interval 8 --adaptive-interval false,true --jitter 0.5
+"""
+
+import os
+import time
+import argparse
+import tempfile
+import itertools
+import threading
+from _common import driver_pid, tree_usage, print_table, write_json, timestamp
+from bing_standin import BingStandIn
+
+from src.auto_search.core.automation import EdgeAutomation
+from src.auto_search.core.metrics import MetricsRegistry, RunMetrics
+
+# Fases reportadas na tabela (todas ficam no JSON)
+TABLE_PHASES = ('page_load', 'typing', 'results_wait', 'result_click')
+
+
+class PeakRssSampler:
+    """Amostra a memória somada dos navegadores de várias automações e guarda o pico"""
+
+    def __init__(self, automations, interval: float = 0.5):
+        self.automations = automations
+        self.interval = interval
+        self.peak_rss_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            pids = [driver_pid(a.driver) for a in self.automations if a.driver is not None]
+            total = sum(tree_usage(pid)['rss_mb'] for pid in pids if pid is not None)
+            self.peak_rss_mb = max(self.peak_rss_mb, total)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def parse_bools(value: str):
+    return [item.strip().lower() in ('1', 'true', 'yes', 'sim') for item in value.split(',')]
+
+
+def empty_profile() -> str:
+    """Perfil vazio para rodar sem copiar um perfil real do Edge"""
+    profile = os.path.join(tempfile.mkdtemp(prefix='bench_e2e_'), 'Default')
+    os.makedirs(profile)
+    return profile
+
+
+def run_config(profile: str, base_url: str, searches: int, typing_speed: str, click_results: bool,
+               headless: bool, concurrency: int, adaptive: bool, args) -> dict:
+    registry = MetricsRegistry()
+    config = {
+        'base_url': base_url,
+        'typing_speed': typing_speed,
+        'click_results': click_results,
+        'click_count': args.click_count,
+        'read_time': args.read_time,
+        'headless': headless,
+        'dwell_scale': args.dwell_scale,
+        'min_interval': args.min_interval,
+        'max_interval': args.max_interval,
+        'adaptive_interval': adaptive,
+        'use_term_history': False
+    }
+    automations = []
+    for index in range(concurrency):
+        automation = EdgeAutomation(profile_path=profile, config=dict(config, term_seed=args.seed + index))
+        automation.metrics = RunMetrics(parent=registry)
+        automations.append(automation)
+
+    threads = [threading.Thread(target=a.start_automation, args=(searches,)) for a in automations]
+    with PeakRssSampler(automations) as sampler:
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    snapshot = registry.snapshot()
+    completed = int(snapshot['counters'].get('searches', 0))
+    phases = {}
+    for name, histogram in snapshot['histograms'].items():
+        if name.startswith('phase_seconds{phase='):
+            phases[name[len('phase_seconds{phase='):-1]] = histogram
+
+    row = {
+        'typing': typing_speed,
+        'clicks': click_results,
+        'headless': headless,
+        'sessions': concurrency,
+        'adaptive': adaptive,
+        'searches': completed,
+        'failures': int(snapshot['counters'].get('search_failures', 0)),
+        'searches_per_min': completed / elapsed * 60 if elapsed else 0.0,
+        'peak_rss_mb': sampler.peak_rss_mb,
+        'phases': phases,
+        'pacing': [a.interval_controller.stats() for a in automations if a.interval_controller is not None]
+    }
+    intervals = snapshot['histograms'].get('search_interval_seconds')
+    if intervals:
+        row['interval_p50_s'] = intervals.get('p50', 0)
+    for phase in TABLE_PHASES:
+        if phase in phases:
+            row[f'{phase}_p50_ms'] = phases[phase].get('p50', 0) * 1000
+            row[f'{phase}_p95_ms'] = phases[phase].get('p95', 0) * 1000
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', help='Caminho do perfil do Edge (padrão: perfil vazio temporário)')
+    parser.add_argument('--searches', type=int, default=10, help='Pesquisas por sessão')
+    parser.add_argument('--typing-speeds', default='instant,normal')
+    parser.add_argument('--click-results', default='false,true')
+    parser.add_argument('--headless', default='true')
+    parser.add_argument('--concurrency', default='1,2')
+    parser.add_argument('--adaptive-interval', default='false', help='Intervalo adaptativo (ex.: false,true)')
+    parser.add_argument('--min-interval', type=float, default=0)
+    parser.add_argument('--max-interval', type=float, default=0)
+    parser.add_argument('--click-count', type=int, default=2)
+    parser.add_argument('--read-time', type=float, default=1)
+    parser.add_argument('--dwell-scale', type=float, default=0)
+    parser.add_argument('--results', type=int, default=10, help='Resultados por página do servidor local')
+    parser.add_argument('--latency-ms', type=float, default=100, help='Atraso da página de resultados')
+    parser.add_argument('--page-latency-ms', type=float, default=50, help='Atraso das páginas de resultado')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Variação relativa dos atrasos do servidor local')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Arquivo de saída com os resultados')
+    args = parser.parse_args()
+
+    profile = args.profile or empty_profile()
+    matrix = itertools.product(
+        args.typing_speeds.split(','),
+        parse_bools(args.click_results),
+        parse_bools(args.headless),
+        [int(n) for n in args.concurrency.split(',')],
+        parse_bools(args.adaptive_interval)
+    )
+
+    rows = []
+    with BingStandIn(results=args.results, latency_ms=args.latency_ms,
+                     page_latency_ms=args.page_latency_ms, jitter=args.jitter) as standin:
+        for typing_speed, click_results, headless, concurrency, adaptive in matrix:
+            rows.append(run_config(profile, standin.url, args.searches, typing_speed, click_results,
+                                   headless, concurrency, adaptive, args))
+        requests = dict(standin.requests)
+
+    columns = ['typing', 'clicks', 'headless', 'sessions', 'adaptive', 'searches', 'failures', 'searches_per_min',
+               'interval_p50_s', 'peak_rss_mb'] + [f'{phase}_p50_ms' for phase in TABLE_PHASES]
+    print_table(rows, columns)
+    write_json(args.json, {'timestamp': timestamp(), 'server_requests': requests, 'results': rows})
+
+
+if __name__ == '__main__':
+    main()
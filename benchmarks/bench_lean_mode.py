@@ -0,0 +1,73 @@
+"""
+Compara memória e CPU do navegador no modo padrão e no modo enxuto.
+
+Cada modo abre um Edge com o perfil informado, realiza algumas pesquisas e
+amostra o RSS e o tempo de CPU da árvore de processos do msedgedriver.
+
+Uso:
+    python benchmarks/bench_lean_mode.py --profile "C:\\...\\User Data\\Default" --searches 5
+"""
+
+import time
+import argparse
+from _common import ResourceSampler, driver_pid, print_table, write_json, timestamp
+
+from src.auto_search.core.automation import EdgeAutomation
+from src.auto_search.core.terms import TermGenerator
+
+MODES = {
+    'full': {'lean_mode': False, 'headless': False},
+    'headless': {'lean_mode': False, 'headless': True},
+    'lean': {'lean_mode': True},
+}
+
+
+def run_mode(profile: str, mode: str, searches: int, seed: int) -> dict:
+    automation = EdgeAutomation(
+        profile_path=profile,
+        config={
+            **MODES[mode],
+            'typing_speed': 'instant',
+            'dwell_scale': 0,
+            'use_term_history': False
+        }
+    )
+    terms = TermGenerator(seed=seed)
+    completed = 0
+
+    start = time.perf_counter()
+    automation.setup_driver()
+    automation.is_running = True
+    try:
+        with ResourceSampler(driver_pid(automation.driver)) as sampler:
+            for _ in range(searches):
+                if automation.perform_search(terms.next_term()):
+                    completed += 1
+    finally:
+        automation.stop_automation()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'searches': completed,
+        'seconds': elapsed,
+        **sampler.summary()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--profile', required=True, help='Caminho do perfil do Edge')
+    parser.add_argument('--searches', type=int, default=5)
+    parser.add_argument('--modes', default='full,headless,lean')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Arquivo de saída com os resultados')
+    args = parser.parse_args()
+
+    rows = [run_mode(args.profile, mode, args.searches, args.seed) for mode in args.modes.split(',')]
+    print_table(rows, ['mode', 'searches', 'seconds', 'peak_rss_mb', 'mean_rss_mb', 'cpu_seconds'])
+    write_json(args.json, {'timestamp': timestamp(), 'results': rows})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+"""
+Microbenchmarks dos trechos em Python puro (sem navegador), com limites de regressão.
+
+Cobre o sorteio de termos do start_automation (e a seleção diversa por
+embeddings, se o numpy estiver instalado), a detecção de perfis sobre
+árvores "User Data" sintéticas, o snapshot/cópia do perfil feito no
+setup_driver e a limpeza do diretório temporário. Cada caso é repetido
+--repeat vezes (mínimo, mediana e desvio em ms). Com --baseline, as medianas
+são comparadas a uma execução anterior e o processo termina com código 1 se
+algum caso ficar mais lento que o limite (--threshold).
+
+Uso:
+    python benchmarks/bench_micro.py --json results/micro_base.json
+    python benchmarks/bench_micro.py --baseline results/micro_base.json --threshold 0.25
+    python benchmarks/bench_micro.py --profile-mb 4096 --filter snapshot
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from typing import Callable, Optional, Dict, Any, List
+from _common import print_table, write_json, timestamp
+
+from src.auto_search.core.terms import TermGenerator, TermPoolExhausted
+from src.auto_search.core.profiles import ProfileRegistry
+from src.auto_search.core.snapshot import ProfileSnapshot
+from src.auto_search.core.janitor import TempJanitor, janitor
+
+# Bloco gravado repetidamente nos arquivos sintéticos (dados reais, não esparsos)
+BLOCK = os.urandom(1024 * 1024)
+
+
+class Case:
+    """Caso de benchmark: setup (não medido), função medida e teardown"""
+
+    def __init__(self, name: str, func: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None,
+                 teardown: Optional[Callable[[Any], None]] = None, number: int = 1):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.teardown = teardown
+        self.number = number
+
+    def run(self, repeat: int) -> Dict[str, float]:
+        samples = []
+        for _ in range(repeat):
+            context = self.setup() if self.setup else None
+            start = time.perf_counter()
+            for _ in range(self.number):
+                self.func(context)
+            samples.append((time.perf_counter() - start) / self.number)
+            if self.teardown:
+                self.teardown(context)
+        return {
+            'min_ms': min(samples) * 1000,
+            'median_ms': statistics.median(samples) * 1000,
+            'stdev_ms': statistics.stdev(samples) * 1000 if len(samples) > 1 else 0.0,
+            'repeat': repeat,
+            'number': self.number
+        }
+
+
+def write_file(path: str, size: int):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        while size > 0:
+            chunk = BLOCK[:min(size, len(BLOCK))]
+            f.write(chunk)
+            size -= len(chunk)
+
+
+# Termos
+
+def term_cases() -> List[Case]:
+    history = {f'termo antigo {i}' for i in range(5000)}
+
+    def run_searches(count: int):
+        def func(_):
+            terms = TermGenerator(seed=42, exclude=history.__contains__)
+            for _ in range(count):
+                terms.next_term()
+        return func
+
+    def exhaust(_):
+        terms = TermGenerator(seed=42, exclude=history.__contains__)
+        try:
+            while True:
+                terms.next_term()
+        except TermPoolExhausted:
+            pass
+
+    return [
+        Case('terms.run_30_searches', run_searches(30), number=20),
+        Case('terms.exhaust_pool', exhaust, number=5)
+    ]
+
+
+def diverse_term_cases(pool_size: int, dimensions: int = 384) -> List[Case]:
+    """Seleção max-min do DiverseTermGenerator sobre vetores sintéticos (requer numpy)"""
+    try:
+        import numpy as np
+        from src.auto_search.core.embeddings import EmbeddingIndex, DiverseTermGenerator
+    except ImportError:
+        return []
+
+    terms = [f'termo {i}' for i in range(pool_size)]
+    vectors = np.random.default_rng(42).standard_normal((pool_size, dimensions)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = EmbeddingIndex(terms, vectors)
+
+    def generator():
+        return DiverseTermGenerator(seed=42, index=index, base_terms=[], templates=terms, topics=[])
+
+    def run_searches(terms):
+        for _ in range(30):
+            terms.next_term()
+
+    return [Case(f'terms.diverse_30_searches[{pool_size}]', run_searches, setup=generator)]
+
+
+# Perfis
+
+def synthetic_preferences(name: str, size_kb: int) -> str:
+    """Preferences com um bloco grande antes da chave do nome, como nos perfis reais"""
+    filler = {f'extension_{i}': {'state': 1, 'path': 'x' * 200} for i in range(max(1, size_kb * 1024 // 240))}
+    return json.dumps({'extensions': {'settings': filler}, 'profile': {'name': name, 'avatar_index': 26}})
+
+
+def build_user_data(root: str, count: int, preferences_kb: int) -> str:
+    user_data = os.path.join(root, f'user_data_{count}')
+    for index in range(count):
+        item = 'Default' if index == 0 else f'Profile {index}'
+        profile = os.path.join(user_data, item)
+        os.makedirs(profile, exist_ok=True)
+        with open(os.path.join(profile, 'Preferences'), 'w', encoding='utf-8') as f:
+            f.write(synthetic_preferences(f'Perfil {index}', preferences_kb))
+    # Pastas que não são perfis
+    for extra in ('Crashpad', 'ShaderCache', 'Safe Browsing'):
+        os.makedirs(os.path.join(user_data, extra), exist_ok=True)
+    return user_data
+
+
+def profile_cases(root: str, counts: List[int], preferences_kb: int) -> List[Case]:
+    cases = []
+    for count in counts:
+        user_data = build_user_data(root, count, preferences_kb)
+
+        def cold(registry):
+            registry.refresh()
+
+        def warm_setup(user_data=user_data):
+            registry = ProfileRegistry(user_data)
+            registry.refresh()
+            return registry
+
+        cases.append(Case(f'profiles.detect_cold[{count}]', cold,
+                          setup=lambda user_data=user_data: ProfileRegistry(user_data)))
+        cases.append(Case(f'profiles.detect_warm[{count}]', cold, setup=warm_setup))
+    return cases
+
+
+# Snapshot do perfil
+
+def build_profile_tree(root: str, total_mb: int) -> str:
+    """
+    Perfil sintético: metade do tamanho em arquivos grandes (bancos de dados),
+    metade em milhares de arquivos pequenos, mais um cache que deve ser ignorado
+    """
+    profile = os.path.join(root, 'profile_tree', 'Default')
+    total = total_mb * 1024 * 1024
+    large_size = 64 * 1024 * 1024
+    large_budget = total // 2
+    index = 0
+    while large_budget > 0:
+        size = min(large_size, large_budget)
+        write_file(os.path.join(profile, 'IndexedDB', f'db_{index}.ldb'), size)
+        large_budget -= size
+        index += 1
+
+    small_size = 16 * 1024
+    for index in range((total // 2) // small_size):
+        write_file(os.path.join(profile, 'Local Storage', f'leveldb_{index // 500}', f'{index:06d}.log'), small_size)
+    write_file(os.path.join(profile, 'Preferences'), 256 * 1024)
+    write_file(os.path.join(profile, 'Cache', 'Cache_Data', 'data_0'), 32 * 1024 * 1024)
+    return profile
+
+
+def snapshot_cases(root: str, total_mb: int) -> List[Case]:
+    profile = build_profile_tree(root, total_mb)
+    staging_root = os.path.join(root, 'staging')
+    sessions_root = os.path.join(root, 'sessions')
+
+    def fresh_snapshot():
+        shutil.rmtree(staging_root, ignore_errors=True)
+        os.makedirs(staging_root)
+        return ProfileSnapshot(profile, staging_root=staging_root)
+
+    def synced_snapshot():
+        snapshot = ProfileSnapshot(profile, staging_root=staging_root)
+        snapshot.sync()
+        return snapshot
+
+    def materialize_setup():
+        snapshot = synced_snapshot()
+        target = tempfile.mkdtemp(dir=sessions_root)
+        return snapshot, os.path.join(target, 'Default')
+
+    def materialize_teardown(context):
+        shutil.rmtree(os.path.dirname(context[1]), ignore_errors=True)
+
+    os.makedirs(sessions_root, exist_ok=True)
+    return [
+        Case(f'snapshot.sync_cold[{total_mb}MB]', lambda s: s.sync(), setup=fresh_snapshot),
+        Case(f'snapshot.sync_warm[{total_mb}MB]', lambda s: s.sync(), setup=synced_snapshot),
+        Case(f'snapshot.materialize[{total_mb}MB]', lambda c: c[0].materialize(c[1]),
+             setup=materialize_setup, teardown=materialize_teardown)
+    ]
+
+
+# Limpeza
+
+def cleanup_cases(root: str) -> List[Case]:
+    from src.auto_search.core.automation import EdgeAutomation
+
+    profile = build_profile_tree(os.path.join(root, 'cleanup_source'), 64)
+    snapshot = ProfileSnapshot(profile, staging_root=os.path.join(root, 'cleanup_staging'))
+    snapshot.sync()
+
+    def session_dir() -> str:
+        temp_dir = tempfile.mkdtemp(dir=root, prefix='edge_automation_')
+        snapshot.materialize(os.path.join(temp_dir, 'Default'))
+        return temp_dir
+
+    def automation_setup():
+        automation = EdgeAutomation(profile_path=profile, config={'use_term_history': False})
+        automation.temp_dir = session_dir()
+        return automation
+
+    def wait_janitor(_):
+        # Espera a remoção em segundo plano para não interferir na próxima repetição
+        while janitor.stats()['pending']:
+            time.sleep(0.01)
+
+    remover = TempJanitor(temp_root=root, staging_root=os.path.join(root, 'cleanup_staging'))
+    return [
+        Case('cleanup.cleanup_temp_dir', lambda a: a._cleanup_temp_dir(), setup=automation_setup,
+             teardown=wait_janitor),
+        Case('cleanup.remove_session_dir', lambda path: remover._remove(path, 0), setup=session_dir)
+    ]
+
+
+# Comparação com a linha de base
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """Anota a variação de cada caso e retorna os que regrediram além do limite"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        change = result['median_ms'] / previous['median_ms'] - 1 if previous['median_ms'] else 0.0
+        result['baseline_ms'] = previous['median_ms']
+        result['change'] = f'{change:+.1%}'
+        if change > threshold:
+            result['change'] += ' REGRESSÃO'
+            regressions.append(name)
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--filter', help='Prefixo dos casos executados (ex.: snapshot ou profiles.detect_cold)')
+    parser.add_argument('--diverse-pool', type=int, default=100000, help='Termos do pool da seleção diversa')
+    parser.add_argument('--profiles', default='1,50,500', help='Quantidades de perfis sintéticos')
+    parser.add_argument('--preferences-kb', type=int, default=256, help='Tamanho de cada Preferences')
+    parser.add_argument('--profile-mb', type=int, default=512, help='Tamanho do perfil sintético copiado')
+    parser.add_argument('--workdir', help='Diretório dos dados sintéticos (padrão: temporário)')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para comparação')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Aumento máximo aceito da mediana (0.25 = 25%%)')
+    parser.add_argument('--json', help='Arquivo de saída com os resultados')
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='bench_micro_', dir=args.workdir)
+    groups = [
+        ('terms', lambda: term_cases() + diverse_term_cases(args.diverse_pool)),
+        ('profiles', lambda: profile_cases(root, [int(n) for n in args.profiles.split(',')], args.preferences_kb)),
+        ('snapshot', lambda: snapshot_cases(root, args.profile_mb)),
+        ('cleanup', lambda: cleanup_cases(root))
+    ]
+
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        for group, build in groups:
+            if args.filter and not group.startswith(args.filter.split('.')[0]):
+                continue
+            for case in build():
+                if args.filter and not case.name.startswith(args.filter):
+                    continue
+                print(f'{case.name}...', file=sys.stderr)
+                results[case.name] = case.run(args.repeat)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f)['results'], args.threshold)
+
+    rows = [{'case': name, **result} for name, result in results.items()]
+    columns = ['case', 'median_ms', 'min_ms', 'stdev_ms'] + (['baseline_ms', 'change'] if args.baseline else [])
+    print_table(rows, columns)
+    write_json(args.json, {
+        'timestamp': timestamp(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    })
+
+    if regressions:
+        print(f'\n{len(regressions)} casos regrediram mais de {args.threshold:.0%}: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Mede o tempo até a primeira resposta HTTP do servidor no modo de início rápido.
+
+Inicia o start.py --fast (ou python -m src.auto_search) em uma porta livre,
+consulta GET / até a primeira resposta e encerra o processo, --repeat vezes.
+Uma execução extra com -X importtime soma o tempo de importação próprio de cada
+pacote, mostrando o que ainda pesa na inicialização. O processo termina com
+código 1 se a mediana passar de --target-ms.
+
+Uso:
+    python benchmarks/bench_startup.py --repeat 5
+    python benchmarks/bench_startup.py --entry module --target-ms 300 --json results/startup.json
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import platform
+import statistics
+import subprocess
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from _common import ROOT_DIR, print_table, write_json, timestamp
+
+ENTRY_POINTS = {
+    'start': ['start.py', '--fast'],
+    'module': ['-m', 'src.auto_search']
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def launch(entry: str, port: int, importtime: bool) -> subprocess.Popen:
+    """
+    Inicia o servidor com stdin em um terminal: o Flask-SocketIO recusa o servidor
+    do Werkzeug quando stdin não é interativo
+    """
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ENTRY_POINTS[entry]
+    env = dict(os.environ, HOST='127.0.0.1', PORT=str(port), FAST_START='true', LOG_TO_FILE='false',
+               DEBUG='false')
+    options = {'cwd': ROOT_DIR, 'env': env, 'stdout': subprocess.DEVNULL, 'stderr': subprocess.PIPE}
+
+    if platform.system() == 'Windows':
+        return subprocess.Popen(command, creationflags=subprocess.CREATE_NEW_CONSOLE, **options)
+
+    import pty
+    master, slave = pty.openpty()
+    try:
+        process = subprocess.Popen(command, stdin=slave, **options)
+    finally:
+        os.close(slave)
+    process.pty_master = master
+    return process
+
+
+def stop(process: subprocess.Popen) -> str:
+    """Encerra o servidor e retorna o que ele escreveu em stderr"""
+    process.terminate()
+    try:
+        _, stderr = process.communicate(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        _, stderr = process.communicate()
+    if getattr(process, 'pty_master', None) is not None:
+        os.close(process.pty_master)
+    return stderr.decode('utf-8', errors='replace')
+
+
+def time_to_first_response(entry: str, timeout: float, importtime: bool = False) -> Tuple[float, str]:
+    """Segundos entre iniciar o processo e a primeira resposta de GET /"""
+    port = free_port()
+    url = f'http://127.0.0.1:{port}/'
+    start = time.perf_counter()
+    process = launch(entry, port, importtime)
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    response.read()
+                return time.perf_counter() - start, stop(process)
+            except OSError:
+                if process.poll() is not None:
+                    raise RuntimeError(f'O servidor encerrou antes de responder:\n{stop(process)}')
+                if time.perf_counter() - start > timeout:
+                    raise RuntimeError(f'Sem resposta em {timeout:g}s:\n{stop(process)}')
+                time.sleep(0.005)
+    except BaseException:
+        if process.poll() is None:
+            stop(process)
+        raise
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Soma o tempo de importação próprio (ms) por pacote de primeiro nível"""
+    packages: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|', 2)
+        packages[name.strip().split('.')[0]] += int(self_us) / 1000
+    return dict(packages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entry', choices=sorted(ENTRY_POINTS), default='start')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=30, help='Espera máxima pela primeira resposta')
+    parser.add_argument('--target-ms', type=float, default=300, help='Mediana máxima aceita')
+    parser.add_argument('--top', type=int, default=10, help='Pacotes listados no detalhamento')
+    parser.add_argument('--json', help='Arquivo de saída com os resultados')
+    args = parser.parse_args()
+
+    samples = []
+    for index in range(args.repeat):
+        elapsed, _ = time_to_first_response(args.entry, args.timeout)
+        samples.append(elapsed * 1000)
+        print(f'execução {index + 1}: {samples[-1]:.0f} ms', file=sys.stderr)
+
+    _, stderr = time_to_first_response(args.entry, args.timeout, importtime=True)
+    packages = parse_importtime(stderr)
+    heaviest: List[Tuple[str, float]] = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+
+    median = statistics.median(samples)
+    print_table([{'package': name, 'import_ms': ms} for name, ms in heaviest[:args.top]], ['package', 'import_ms'])
+    print(f'\nimportação total: {sum(packages.values()):.0f} ms')
+    print(f'primeira resposta: mediana {median:.0f} ms, mínimo {min(samples):.0f} ms '
+          f'(alvo {args.target_ms:.0f} ms)')
+    write_json(args.json, {
+        'timestamp': timestamp(),
+        'entry': args.entry,
+        'python': platform.python_version(),
+        'first_response_ms': samples,
+        'median_ms': median,
+        'target_ms': args.target_ms,
+        'import_ms_by_package': packages
+    })
+
+    if median > args.target_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
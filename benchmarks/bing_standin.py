@@ -0,0 +1,177 @@
+"""
+Servidor HTTP local que imita as páginas do Bing usadas pela automação.
+
+Serve uma página inicial com o campo de pesquisa `q`, uma página de resultados
+com `#b_results` (quantidade de resultados e latência configuráveis) e páginas
+de resultado simples, permitindo medir a automação sem acessar o bing.com.
+
+Uso:
+    python benchmarks/bing_standin.py --port 8765 --results 10 --latency-ms 150
+    SEARCH_BASE_URL=http://127.0.0.1:8765 python start.py
+"""
+
+import time
+import random
+import argparse
+import threading
+from html import escape
+from collections import Counter
+from urllib.parse import urlparse, parse_qs, quote_plus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+{body}
+</body>
+</html>"""
+
+SEARCH_FORM = """<form id="sb_form" action="/search" method="get">
+    <input type="search" name="q" id="sb_form_q" value="{query}" autocomplete="off">
+</form>"""
+
+PARAGRAPH = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+             "incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud "
+             "exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat.")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: 'StandInServer'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query).get('q', [''])[0]
+        config = self.server.standin
+
+        if url.path == '/':
+            kind, body = 'homepage', SEARCH_FORM.format(query='')
+            title = 'Bing'
+        elif url.path == '/search':
+            kind, title = 'results', f'{escape(query)} - Pesquisar'
+            body = self._results_page(query, config.results)
+            config.sleep(config.latency_ms)
+        elif url.path.startswith('/page/'):
+            kind, title = 'page', f'Resultado {escape(url.path[6:])}'
+            body = '\n'.join(f'<p>{PARAGRAPH}</p>' for _ in range(config.page_paragraphs))
+            config.sleep(config.page_latency_ms)
+        elif url.path == '/favicon.ico':
+            self.send_response(204)
+            self.end_headers()
+            return
+        else:
+            self.send_error(404)
+            return
+
+        config.count(kind)
+        payload = PAGE_TEMPLATE.format(title=title, body=body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    @staticmethod
+    def _results_page(query: str, results: int) -> str:
+        items = []
+        for index in range(results):
+            href = f'/page/{index}?q={quote_plus(query)}'
+            items.append(
+                f'<li class="b_algo"><h2><a href="{escape(href)}">{escape(query)} - resultado {index + 1}</a></h2>'
+                f'<p>{PARAGRAPH}</p></li>'
+            )
+        return SEARCH_FORM.format(query=escape(query)) + '\n<ol id="b_results">\n' + '\n'.join(items) + '\n</ol>'
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class BingStandIn:
+    """Servidor local em segundo plano, utilizável como context manager"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, results: int = 10,
+                 latency_ms: float = 0, page_latency_ms: float = 0, page_paragraphs: int = 30,
+                 jitter: float = 0.0):
+        """
+        Args:
+            host: Endereço de escuta
+            port: Porta (0 escolhe uma porta livre)
+            results: Resultados por página de pesquisa
+            latency_ms: Atraso das páginas de resultados
+            page_latency_ms: Atraso das páginas de resultado
+            page_paragraphs: Parágrafos de cada página de resultado
+            jitter: Variação relativa aleatória dos atrasos (0.2 = ±20%)
+        """
+        self.results = results
+        self.latency_ms = latency_ms
+        self.page_latency_ms = page_latency_ms
+        self.page_paragraphs = page_paragraphs
+        self.jitter = jitter
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        self._server = StandInServer((host, port), StandInHandler)
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def sleep(self, milliseconds: float):
+        if milliseconds <= 0:
+            return
+        if self.jitter:
+            milliseconds *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        time.sleep(milliseconds / 1000)
+
+    def count(self, kind: str):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def start(self) -> 'BingStandIn':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='bing-standin', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--results', type=int, default=10, help='Resultados por página')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Atraso da página de resultados')
+    parser.add_argument('--page-latency-ms', type=float, default=0, help='Atraso das páginas de resultado')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Variação relativa dos atrasos')
+    args = parser.parse_args()
+
+    standin = BingStandIn(args.host, args.port, args.results, args.latency_ms, args.page_latency_ms,
+                          jitter=args.jitter)
+    print(f'Servidor local do Bing em {standin.url} (Ctrl+C para encerrar)')
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
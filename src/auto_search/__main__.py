@@ -1,23 +1,34 @@
 import os
-import logging
-from .web.app import run_server
-from .config.settings import LOG_LEVEL, LOG_FILE
+import argparse
+from .config.environment import load_environment
 
-def setup_logging():
-    """Configura o sistema de logging"""
-    logging.basicConfig(
-        level=getattr(logging, LOG_LEVEL.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(LOG_FILE),
-            logging.StreamHandler()
-        ]
+def parse_args():
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(prog='auto_search')
+    parser.add_argument(
+        '--driver-path',
+        help='Caminho de um msedgedriver fixo (dispensa a resolução automática)'
     )
+    parser.add_argument(
+        '--log-json',
+        action='store_true',
+        help='Grava os logs em JSON, um objeto por linha'
+    )
+    return parser.parse_args()
 
 def main():
     """Função principal que inicia a aplicação"""
-    # Configurar logging
-    setup_logging()
+    args = parse_args()
+    if args.driver_path:
+        os.environ['EDGE_DRIVER_PATH'] = os.path.abspath(args.driver_path)
+    
+    # Carregar variáveis do .env antes de importar as configurações
+    load_environment()
+    from .config.logging_config import setup_logging
+    
+    # Configurar logging antes de importar o app, que já cria o scheduler e a sua fila de logs
+    setup_logging(json_output=True if args.log_json else None)
+    from .web.app import run_server
     
     # Iniciar servidor web
     host = os.getenv('HOST', '0.0.0.0')
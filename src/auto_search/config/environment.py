@@ -0,0 +1,36 @@
+import os
+import threading
+from typing import Optional
+
+# Arquivo .env da raiz do repositório (ENV_FILE aponta para outro arquivo)
+DEFAULT_ENV_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env')
+
+_loaded = False
+_load_lock = threading.Lock()
+
+
+def load_environment(path: Optional[str] = None) -> bool:
+    """
+    Carrega as variáveis do arquivo .env no ambiente do processo
+
+    Deve ser chamada pelos pontos de entrada antes de importar config.settings,
+    que apenas lê os.environ. Variáveis já definidas no ambiente têm prioridade
+    e chamadas repetidas não fazem nada.
+
+    Args:
+        path: Arquivo .env (padrão: ENV_FILE ou o .env da raiz do repositório)
+
+    Returns:
+        True se um arquivo foi carregado
+    """
+    global _loaded
+    with _load_lock:
+        if _loaded:
+            return False
+        _loaded = True
+
+        path = os.path.abspath(path or os.getenv('ENV_FILE') or DEFAULT_ENV_FILE)
+        if not os.path.isfile(path):
+            return False
+        from dotenv import load_dotenv
+        return load_dotenv(path, override=False)
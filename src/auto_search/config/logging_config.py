@@ -0,0 +1,189 @@
+import os
+import copy
+import json
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Dict, Any, List, Iterator
+from .settings import (
+    LOG_LEVEL,
+    LOG_FILE,
+    LOG_FORMAT,
+    LOG_DATE_FORMAT,
+    LOG_MAX_SIZE,
+    LOG_BACKUP_COUNT,
+    LOG_TO_CONSOLE,
+    LOG_TO_FILE,
+    LOG_JSON
+)
+
+# Campos de contexto anexados a cada registro (valor '-' quando ausentes)
+CONTEXT_FIELDS = ('run_id', 'profile', 'device')
+
+_log_context = contextvars.ContextVar('log_context', default={})
+
+_handlers: List[logging.Handler] = []
+_listeners: List[QueueListener] = []
+_setup_lock = threading.Lock()
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """
+    Anexa campos de contexto aos logs emitidos dentro do bloco
+
+    O contexto acompanha a thread ou a tarefa asyncio atual e blocos aninhados
+    acrescentam campos aos já definidos.
+    """
+    values = {**_log_context.get(), **{k: str(v) for k, v in fields.items() if v is not None}}
+    token = _log_context.set(values)
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copia o contexto atual para o registro antes dele sair da thread de origem"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field, '-'))
+        if not hasattr(record, 'context'):
+            labels = ' '.join(f'{k}={context[k]}' for k in CONTEXT_FIELDS if k in context)
+            record.context = f'[{labels}] ' if labels else ''
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formata cada registro como um objeto JSON por linha"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, '-')
+            if value != '-':
+                entry[field] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler que mantém o traceback em exc_text
+
+    O QueueHandler padrão junta o traceback à mensagem, e o JsonFormatter não
+    consegue mais emitir o campo 'exception' (inclusive para registros de
+    processos filhos, que chegam já preparados).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class HandlersListener(QueueListener):
+    """QueueListener que entrega cada registro aos handlers configurados no momento da entrega"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue, respect_handler_level=True)
+
+    def handle(self, record: logging.LogRecord):
+        # Filas ouvidas antes do setup_logging (ex.: a do scheduler) também chegam aos handlers
+        record = self.prepare(record)
+        for handler in list(_handlers):
+            if not self.respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def _build_handlers(json_output: bool) -> List[logging.Handler]:
+    formatter = JsonFormatter(datefmt=LOG_DATE_FORMAT) if json_output else \
+        logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+
+    handlers: List[logging.Handler] = []
+    if LOG_TO_FILE:
+        os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+        file_handler = RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_SIZE, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True
+        )
+        handlers.append(file_handler)
+    if LOG_TO_CONSOLE:
+        handlers.append(logging.StreamHandler())
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def _install_queue_handler(log_queue, level: str):
+    """Substitui os handlers da raiz por um QueueHandler com o filtro de contexto"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    queue_handler = ContextQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+
+def setup_logging(level: Optional[str] = None, json_output: Optional[bool] = None):
+    """
+    Configura o logging do processo (apenas na primeira chamada)
+
+    As threads apenas enfileiram os registros; a escrita em arquivo (com rotação
+    por tamanho) e no console fica a cargo de um QueueListener em thread própria.
+
+    Args:
+        level: Nível mínimo (padrão: LOG_LEVEL)
+        json_output: Grava os registros em JSON (padrão: LOG_JSON)
+    """
+    with _setup_lock:
+        if _handlers:
+            return
+        _handlers.extend(_build_handlers(LOG_JSON if json_output is None else json_output))
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _install_queue_handler(log_queue, level or LOG_LEVEL)
+    listen_queue(log_queue)
+    atexit.register(shutdown_logging)
+
+
+def listen_queue(log_queue) -> QueueListener:
+    """Encaminha os registros de uma fila (ex.: de processos filhos) para os handlers configurados"""
+    listener = HandlersListener(log_queue)
+    listener.start()
+    _listeners.append(listener)
+    return listener
+
+
+def setup_worker_logging(log_queue, level: Optional[str] = None):
+    """Configura um processo filho para enviar os registros à fila do processo principal"""
+    _install_queue_handler(log_queue, level or LOG_LEVEL)
+
+
+def shutdown_logging():
+    """Esvazia as filas e fecha os handlers"""
+    while _listeners:
+        _listeners.pop().stop()
+    for handler in _handlers:
+        handler.close()
@@ -1,13 +1,11 @@
 import os
 import platform
-import logging
+import tempfile
 from pathlib import Path
-from dotenv import load_dotenv
-from typing import List, Dict, Any
-import random
+from typing import List, Dict, Any, Tuple
 
-# Carregar variáveis de ambiente
-load_dotenv()
+# As variáveis do .env são carregadas pelos pontos de entrada
+# (config.environment.load_environment) antes deste módulo ser importado
 
 # Configurações básicas
 SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-here')
@@ -27,10 +25,25 @@ def get_edge_profiles_path():
     return ''
 
 EDGE_PROFILES_PATH = os.getenv('EDGE_PROFILES_PATH', get_edge_profiles_path())
+AUTO_DETECT_PROFILES = os.getenv('AUTO_DETECT_PROFILES', 'true').lower() == 'true'
+PROFILE_REFRESH_INTERVAL = float(os.getenv('PROFILE_REFRESH_INTERVAL', 300))  # segundos
 DEFAULT_SEARCH_COUNT = 30
 MIN_SEARCH_INTERVAL = 2  # segundos
 MAX_SEARCH_INTERVAL = 5  # segundos
 
+# Intervalo adaptativo entre pesquisas (AIMD): diminui um passo enquanto as páginas
+# respondem sem falhas e cresce multiplicativamente quando a latência sobe ou as
+# falhas aumentam, sempre entre o intervalo mínimo e o máximo
+ADAPTIVE_INTERVAL = os.getenv('ADAPTIVE_INTERVAL', 'false').lower() == 'true'
+ADAPTIVE_INTERVAL_STEP = float(os.getenv('ADAPTIVE_INTERVAL_STEP', 0.25))  # segundos
+ADAPTIVE_INTERVAL_BACKOFF = float(os.getenv('ADAPTIVE_INTERVAL_BACKOFF', 1.5))
+ADAPTIVE_INTERVAL_WINDOW = int(os.getenv('ADAPTIVE_INTERVAL_WINDOW', 10))  # pesquisas
+# Latência mediana da janela / menor latência recente acima da qual o intervalo aumenta
+ADAPTIVE_LATENCY_TOLERANCE = float(os.getenv('ADAPTIVE_LATENCY_TOLERANCE', 2.0))
+ADAPTIVE_MAX_FAILURE_RATE = float(os.getenv('ADAPTIVE_MAX_FAILURE_RATE', 0.2))
+# Decisões do controle de intervalo mantidas por execução (expostas em /api/stats)
+INTERVAL_HISTORY_SIZE = int(os.getenv('INTERVAL_HISTORY_SIZE', 500))
+
 # Configurações de digitação
 TYPING_SPEEDS: Dict[str, float] = {
     'instant': 0,
@@ -44,6 +57,111 @@ DEFAULT_CLICK_COUNT = 2
 DEFAULT_READ_TIME = 10  # segundos
 SCROLL_PROBABILITY = 0.7
 
+# Endereço do buscador (ex.: o servidor local de benchmarks/bing_standin.py)
+SEARCH_BASE_URL = os.getenv('SEARCH_BASE_URL', 'https://www.bing.com').rstrip('/')
+
+# Navegação entre pesquisas:
+#   'homepage' - abre a página inicial do Bing antes de cada pesquisa
+#   'chain'    - reaproveita o campo de pesquisa da página de resultados atual
+#   'direct'   - navega diretamente para a URL de resultados
+SEARCH_NAVIGATION = os.getenv('SEARCH_NAVIGATION', 'homepage')
+
+# Leitura simultânea dos resultados: as abas abertas são lidas ao mesmo tempo,
+# limitadas pelo número de abas e pela memória do navegador (0 = sem limite, requer psutil)
+CONCURRENT_READING = os.getenv('CONCURRENT_READING', 'false').lower() == 'true'
+MAX_OPEN_TABS = int(os.getenv('MAX_OPEN_TABS', 3))
+TABS_MEMORY_LIMIT_MB = int(os.getenv('TABS_MEMORY_LIMIT_MB', 0))
+
+# Configurações de ritmo (esperas e pausas deliberadas)
+WAIT_TIMEOUT = 10  # segundos
+WAIT_POLL_FREQUENCY = 0.1  # segundos
+DWELL_SCALE = float(os.getenv('DWELL_SCALE', 1.0))
+DWELL_BUDGET: Dict[str, Tuple[float, float]] = {
+    'before_typing': (0.3, 0.8),
+    'before_click': (0.5, 1.0),
+    'scroll': (0.5, 1.5),
+    'scroll_up': (0.3, 0.8)
+}
+
+# Tempo máximo que um pedido de parada aguarda a automação antes de encerrar o navegador à força.
+# Pausas e esperas saem na hora; o prazo cobre um comando já em andamento no navegador
+# (ex.: um carregamento de página), e encerrar à força descarta a sessão do pool
+STOP_TIMEOUT = float(os.getenv('STOP_TIMEOUT', 5))  # segundos
+
+# Watchdog dos navegadores: sessões acima do limite de memória (MB, 0 = sem limite,
+# requer psutil) ou que não respondem ao ping do WebDriver são recicladas entre pesquisas
+BROWSER_MEMORY_LIMIT = int(os.getenv('BROWSER_MEMORY_LIMIT', 2048))
+WATCHDOG_INTERVAL = float(os.getenv('WATCHDOG_INTERVAL', 5))  # segundos (0 = desativado)
+WATCHDOG_PING_TIMEOUT = float(os.getenv('WATCHDOG_PING_TIMEOUT', 30))  # segundos (0 = sem ping)
+
+# Intervalo de envio das estatísticas para o painel
+STATS_INTERVAL = float(os.getenv('STATS_INTERVAL', 5))  # segundos
+
+# Eventos das execuções são enviados ao painel em lotes, por sala de execução
+EVENT_FLUSH_INTERVAL = float(os.getenv('EVENT_FLUSH_INTERVAL', 0.25))  # segundos
+# Eventos recentes mantidos por execução para clientes que entram depois
+EVENT_BACKLOG_SIZE = int(os.getenv('EVENT_BACKLOG_SIZE', 200))
+
+# Configurações de snapshot de perfil
+PROFILE_STAGING_DIR = os.getenv(
+    'PROFILE_STAGING_DIR',
+    os.path.join(tempfile.gettempdir(), 'edge_automation_staging')
+)
+# Diretórios de cache ignorados ao sincronizar o perfil
+PROFILE_SKIP_DIRS: List[str] = [
+    'Cache',
+    'Code Cache',
+    'GPUCache',
+    'DawnCache',
+    'DawnGraphiteCache',
+    'DawnWebGPUCache',
+    'GrShaderCache',
+    'ShaderCache',
+    'Service Worker',
+    'Media Cache',
+    'blob_storage',
+    'Crashpad'
+]
+
+# Limpeza em segundo plano dos diretórios temporários das sessões
+JANITOR_INTERVAL = float(os.getenv('JANITOR_INTERVAL', 600))  # segundos
+# Diretórios sem marcador de dono (versões anteriores) são órfãos após este tempo
+JANITOR_ORPHAN_AGE = float(os.getenv('JANITOR_ORPHAN_AGE', 3600))  # segundos
+# Espaço máximo ocupado pelos stagings de perfis (0 = sem limite)
+PROFILE_STAGING_QUOTA_MB = int(os.getenv('PROFILE_STAGING_QUOTA_MB', 4096))
+
+# Cache local de binários do msedgedriver (por versão principal)
+DRIVER_CACHE_DIR = os.getenv('DRIVER_CACHE_DIR') or os.path.join(
+    os.getenv('LOCALAPPDATA') or os.path.join(str(Path.home()), '.cache'), 'auto_search', 'drivers'
+)
+
+# Backend de automação:
+#   'selenium' - EdgeAutomation via msedgedriver (padrão)
+#   'cdp'      - CdpAutomation via DevTools Protocol e asyncio (requer websockets)
+AUTOMATION_BACKEND = os.getenv('AUTOMATION_BACKEND', 'selenium').lower()
+
+# Com o backend 'cdp', executa todas as sessões em um único Edge compartilhado,
+# cada uma em um contexto de navegação isolado com os cookies do seu perfil
+SHARED_BROWSER = os.getenv('SHARED_BROWSER', 'false').lower() == 'true'
+
+# Emulação de tela usada nos contextos mobile (Emulation.setDeviceMetricsOverride)
+MOBILE_DEVICE_METRICS: Dict[str, Any] = {
+    'width': 412,
+    'height': 915,
+    'deviceScaleFactor': 2.625,
+    'mobile': True
+}
+
+# Configurações de execução simultânea
+PARALLEL_SEARCHES = os.getenv('PARALLEL_SEARCHES', 'false').lower() == 'true'
+MAX_CONCURRENT_SEARCHES = int(os.getenv('MAX_CONCURRENT_SEARCHES', 2))
+SCHEDULER_USE_PROCESSES = os.getenv('SCHEDULER_USE_PROCESSES', 'false').lower() == 'true'
+
+# Configurações do pool de sessões
+DRIVER_POOL_ENABLED = os.getenv('DRIVER_POOL_ENABLED', 'true').lower() == 'true'
+DRIVER_POOL_TTL = float(os.getenv('DRIVER_POOL_TTL', 300))  # segundos
+DRIVER_POOL_MAX_IDLE = int(os.getenv('DRIVER_POOL_MAX_IDLE', 4))
+
 # Configurações de pesquisa
 SEARCH_TERMS: List[str] = [
     "notícias hoje",
@@ -68,20 +186,71 @@ SEARCH_TERMS: List[str] = [
     "cursos gratuitos"
 ]
 
-# Configurações de logging
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-LOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'logs', 'auto_search.log')
-
-# Configurar logging
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
+# Templates de perguntas comuns
+QUESTION_TEMPLATES: List[str] = [
+    "Como fazer {}?",
+    "Qual é a melhor maneira de {}?",
+    "O que significa {}?",
+    "Onde encontrar {}?",
+    "Quais são os benefícios de {}?",
+    "Por que {} acontece?",
+    "Quando devo {}?",
+    "Como funciona {}?",
+    "Qual a diferença entre {} e {}?",
+    "Como resolver problemas com {}?"
+]
+
+# Tópicos comuns para gerar perguntas relevantes
+SEARCH_TOPICS: List[str] = [
+    "exercícios", "meditação", "alimentação saudável", "sono", "produtividade",
+    "estudo", "trabalho remoto", "investimentos", "programação", "idiomas",
+    "jardinagem", "culinária", "fotografia", "música", "arte",
+    "viagem", "tecnologia", "saúde", "bem-estar", "sustentabilidade",
+    "reciclagem", "energia renovável", "marketing digital", "redes sociais",
+    "desenvolvimento pessoal", "carreira", "finanças pessoais", "decoração",
+    "organização", "limpeza", "manutenção", "consertos", "DIY"
+]
+
+# Probabilidade de usar um termo direto em vez de uma pergunta gerada
+DIRECT_TERM_PROBABILITY = 0.7
+
+# Semente opcional do gerador de termos (execuções reproduzíveis)
+TERM_SEED = int(os.environ['TERM_SEED']) if os.getenv('TERM_SEED') else None
+
+# Histórico persistente de termos (evita repetir termos entre execuções)
+TERM_HISTORY_ENABLED = os.getenv('TERM_HISTORY_ENABLED', 'true').lower() == 'true'
+TERM_HISTORY_DB = os.getenv('TERM_HISTORY_DB') or os.path.join(
+    os.getenv('LOCALAPPDATA') or os.path.join(str(Path.home()), '.cache'), 'auto_search', 'term_history.sqlite'
 )
+TERM_HISTORY_DAYS = float(os.getenv('TERM_HISTORY_DAYS', 7))
+TERM_HISTORY_BLOOM_CAPACITY = int(os.getenv('TERM_HISTORY_BLOOM_CAPACITY', 1000000))
+TERM_HISTORY_SHARED = os.getenv('TERM_HISTORY_SHARED', 'false').lower() == 'true'
+
+# Seleção diversa de termos: cada pesquisa usa o termo mais distante (embeddings,
+# distância de cosseno) dos já usados. Requer requirements-embeddings.txt
+TERM_DIVERSITY = os.getenv('TERM_DIVERSITY', 'false').lower() == 'true'
+# Candidatos avaliados a cada escolha (pools maiores são percorridos em janelas)
+TERM_DIVERSITY_WINDOW = int(os.getenv('TERM_DIVERSITY_WINDOW', 4096))
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'paraphrase-multilingual-MiniLM-L12-v2')
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 256))
+# Vetores do pool de termos, gravados uma vez por pool e modelo e lidos via mmap
+EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR') or os.path.join(
+    os.getenv('LOCALAPPDATA') or os.path.join(str(Path.home()), '.cache'), 'auto_search', 'embeddings'
+)
+
+# Configurações de logging (aplicadas por logging_config.setup_logging)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_DIR = os.path.join(os.path.dirname(__file__), '..', 'logs')
+LOG_FILE = os.path.join(LOG_DIR, os.getenv('LOG_FILE', 'auto_search.log'))
+# %(context)s contém os campos run_id/profile/device da execução, quando definidos
+LOG_FORMAT = os.getenv('LOG_FORMAT', '%(asctime)s - %(name)s - %(levelname)s - %(context)s%(message)s')
+LOG_DATE_FORMAT = os.getenv('LOG_DATE_FORMAT') or None
+LOG_MAX_SIZE = int(os.getenv('LOG_MAX_SIZE', 5 * 1024 * 1024))  # bytes
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+LOG_TO_CONSOLE = os.getenv('LOG_TO_CONSOLE', 'true').lower() == 'true'
+LOG_TO_FILE = os.getenv('LOG_TO_FILE', 'true').lower() == 'true'
+# Grava os logs como JSON (um objeto por linha)
+LOG_JSON = os.getenv('LOG_JSON', 'false').lower() == 'true'
 
 # Configurações de arquivos
 PROFILES_FILE = 'profiles.json'
@@ -141,6 +310,36 @@ EDGE_CAPABILITIES = {
     }
 }
 
-# Seleciona um User Agent aleatório baseado no tipo de dispositivo
-MOBILE_USER_AGENT = random.choice(MOBILE_USER_AGENTS)
-DESKTOP_USER_AGENT = random.choice(DESKTOP_USER_AGENTS) 
\ No newline at end of file
+# Configurações do modo enxuto (headless com bloqueio de recursos)
+BROWSER_HEADLESS = os.getenv('BROWSER_HEADLESS', 'false').lower() == 'true'
+BROWSER_DISABLE_IMAGES = os.getenv('BROWSER_DISABLE_IMAGES', 'false').lower() == 'true'
+BROWSER_LEAN_MODE = os.getenv('BROWSER_LEAN_MODE', 'false').lower() == 'true'
+
+# Padrões bloqueados via Network.setBlockedURLs quando imagens estão desativadas
+IMAGE_BLOCKED_URLS: List[str] = [
+    '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*',
+    '*th.bing.com/th*'
+]
+
+# Domínios de terceiros bloqueados no modo enxuto. Além do Network.setBlockedURLs
+# da aba principal, eles deixam de resolver no navegador inteiro (--host-resolver-rules),
+# o que vale também para as abas de resultados
+LEAN_BLOCKED_HOSTS: List[str] = [
+    'doubleclick.net', 'googlesyndication.com', 'google-analytics.com',
+    'googletagmanager.com', 'clarity.ms', 'scorecardresearch.com',
+    'facebook.net', 'adnxs.com', 'taboola.com', 'outbrain.com'
+]
+
+# Padrões adicionais bloqueados no modo enxuto (mídia, fontes e terceiros)
+LEAN_BLOCKED_URLS: List[str] = IMAGE_BLOCKED_URLS + [
+    '*.mp4*', '*.webm*', '*.mp3*', '*.m4a*', '*.ogg*',
+    '*.woff*', '*.woff2*', '*.ttf*', '*.otf*'
+] + [f'*{host}*' for host in LEAN_BLOCKED_HOSTS]
+
+# Preferências de conteúdo aplicadas no modo enxuto
+LEAN_CONTENT_PREFS: Dict[str, Any] = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.managed_default_content_settings.media_stream': 2,
+    'profile.managed_default_content_settings.plugins': 2,
+    'profile.managed_default_content_settings.sound': 2
+} 
\ No newline at end of file
@@ -2,32 +2,67 @@ import os
 import time
 import random
 import logging
-import shutil
 import tempfile
 import uuid
-from typing import Optional, Dict, Any
+import heapq
+import threading
+from urllib.parse import quote_plus
+from typing import Optional, Dict, Any, List
 from selenium import webdriver
 from selenium.webdriver.edge.service import Service
 from selenium.webdriver.edge.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from ..config.settings import (
     MOBILE_USER_AGENTS,
     DESKTOP_USER_AGENTS,
     DEFAULT_SEARCH_COUNT,
     MIN_SEARCH_INTERVAL,
     MAX_SEARCH_INTERVAL,
-    SEARCH_TERMS
+    DWELL_SCALE,
+    TERM_SEED,
+    TERM_HISTORY_ENABLED,
+    TERM_DIVERSITY,
+    ADAPTIVE_INTERVAL,
+    BROWSER_HEADLESS,
+    BROWSER_DISABLE_IMAGES,
+    BROWSER_LEAN_MODE,
+    SEARCH_NAVIGATION,
+    CONCURRENT_READING,
+    MAX_OPEN_TABS,
+    TABS_MEMORY_LIMIT_MB,
+    STOP_TIMEOUT,
+    BROWSER_MEMORY_LIMIT,
+    SEARCH_BASE_URL
 )
+from ..config.logging_config import log_context
+from .snapshot import prepare_profile
+from .browser import (
+    BASE_EDGE_ARGUMENTS,
+    STEALTH_SCRIPT,
+    HARVEST_RESULTS_SCRIPT,
+    RESULT_TABS_SCRIPT,
+    edge_arguments,
+    edge_prefs,
+    blocked_url_patterns
+)
+from .pool import DriverPool, PooledSession, PoolKey
+from .driver_resolver import resolve_driver_path
+from .pacing import Pacer, AutomationCancelled
+from .interval import AdaptiveInterval, page_seconds
+from .metrics import RunMetrics
+from .terms import create_term_generator, TermPoolExhausted
+from .history import TermHistory
+from .resources import driver_memory_mb, kill_process_tree
+from .janitor import janitor, mark_owner
+from .watchdog import watchdog
 
 logger = logging.getLogger(__name__)
 
 class EdgeAutomation:
-    def __init__(self, profile_path: str, device_type: str = 'desktop', config: Optional[Dict[str, Any]] = None):
+    def __init__(self, profile_path: str, device_type: str = 'desktop', config: Optional[Dict[str, Any]] = None,
+                 pool: Optional[DriverPool] = None):
         """
         Inicializa a automação do Edge
         
@@ -35,12 +70,31 @@ class EdgeAutomation:
             profile_path: Caminho para o perfil do Edge
             device_type: Tipo de dispositivo ('desktop' ou 'mobile')
             config: Configurações adicionais
+            pool: Pool de sessões aquecidas (opcional)
         """
         self.profile_path = profile_path
         self.device_type = device_type
         self.driver = None
+        self.pool = pool
+        self.session = None
+        self.temp_dir = None
+        self.pacer = None
+        self.interval_controller: Optional[AdaptiveInterval] = None
+        self.metrics = RunMetrics()
+        self.round_trips = 0
         self.is_running = False
         
+        # Token de cancelamento observado por todas as esperas da automação
+        self.stop_event = threading.Event()
+        self._finished = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._stop_requested_at: Optional[float] = None
+        self._forced_stop = False
+        self._teardown_lock = threading.Lock()
+        
+        # Motivo pendente para reciclar o navegador, definido pelo watchdog
+        self._recycle_reason: Optional[str] = None
+        
         # Configurações padrão
         self.config = config or {}
         self.typing_speed = self.config.get('typing_speed', 'normal')
@@ -49,12 +103,30 @@ class EdgeAutomation:
         self.read_time = self.config.get('read_time', 10)
         self.min_interval = self.config.get('min_interval', MIN_SEARCH_INTERVAL)
         self.max_interval = self.config.get('max_interval', MAX_SEARCH_INTERVAL)
+        self.adaptive_interval = self.config.get('adaptive_interval', ADAPTIVE_INTERVAL)
         self.min_typing_delay = self.config.get('min_typing_delay', 0.1)
         self.max_typing_delay = self.config.get('max_typing_delay', 0.3)
         self.click_random_results_prob = self.config.get('click_random_results_prob', 0.7)
         self.use_custom_terms = self.config.get('use_custom_terms', False)
         self.custom_terms = self.config.get('custom_terms', [])
+        self.term_seed = self.config.get('term_seed', TERM_SEED)
+        self.use_term_history = self.config.get('use_term_history', TERM_HISTORY_ENABLED)
+        self.term_diversity = self.config.get('term_diversity', TERM_DIVERSITY)
         self.random_scroll = self.config.get('random_scroll', False)
+        self.dwell_scale = self.config.get('dwell_scale', DWELL_SCALE)
+        self.dwell_budget = self.config.get('dwell_budget')
+        self.lean_mode = self.config.get('lean_mode', BROWSER_LEAN_MODE)
+        self.headless = self.config.get('headless', BROWSER_HEADLESS)
+        self.disable_images = self.config.get('disable_images', BROWSER_DISABLE_IMAGES)
+        self.search_navigation = self.config.get('search_navigation', SEARCH_NAVIGATION)
+        self.base_url = self.config.get('base_url', SEARCH_BASE_URL).rstrip('/')
+        self.concurrent_reading = self.config.get('concurrent_reading', CONCURRENT_READING)
+        self.max_open_tabs = self.config.get('max_open_tabs', MAX_OPEN_TABS)
+        self.tabs_memory_limit_mb = self.config.get('tabs_memory_limit_mb', TABS_MEMORY_LIMIT_MB)
+        self.browser_memory_limit = self.config.get('browser_memory_limit', BROWSER_MEMORY_LIMIT)
+        self._on_results_page = False
+        # Indica se a pesquisa atual já chegou ao Bing (após o Enter ou a navegação direta)
+        self._search_submitted = False
         
         # Sobrescrever configurações padrão com as fornecidas
         if config:
@@ -62,8 +134,62 @@ class EdgeAutomation:
                 if hasattr(self, key):
                     setattr(self, key, value)
         
+    def _pool_key(self) -> PoolKey:
+        """Chave usada para reaproveitar sessões no pool"""
+        mode = 'lean' if self.lean_mode else 'headless' if self.headless else 'full'
+        return (os.path.abspath(self.profile_path), self.device_type, mode)
+
+    def _create_session(self) -> PooledSession:
+        """Cria uma nova sessão para o pool, transferindo a posse do diretório temporário"""
+        driver = self._launch_browser()
+        session = PooledSession(self._pool_key(), driver, self.temp_dir)
+        self.temp_dir = None
+        return session
+
     def setup_driver(self):
-        """Configura e inicializa o driver do Edge com configurações anti-detecção"""
+        """Configura e inicializa o driver do Edge, reaproveitando uma sessão do pool se disponível"""
+        try:
+            if self.pool is not None:
+                self.session = self.pool.acquire(self._pool_key(), self._create_session)
+                self.driver = self.session.driver
+            else:
+                self.driver = self._launch_browser()
+            
+            self._count_round_trips(self.driver)
+            watchdog.watch(self, self.driver, self.browser_memory_limit, self._request_recycle,
+                           name=os.path.basename(self.profile_path))
+            self.pacer = Pacer(self.driver, dwell_budget=self.dwell_budget, dwell_scale=self.dwell_scale,
+                               cancel_event=self.stop_event)
+            
+            # Configurar cookies do Bing
+            with self.metrics.time('page_load'):
+                self.driver.get(self.base_url)
+                self.metrics.inc('page_loads', kind='homepage')
+                self.pacer.wait_page_ready()
+            
+        except Exception as e:
+            logger.error(f"Erro ao configurar driver: {str(e)}")
+            watchdog.unwatch(self)
+            if self.session is not None:
+                self.pool.release(self.session, reusable=False)
+                self.session = None
+                self.driver = None
+            raise
+
+    def _count_round_trips(self, driver):
+        """Contabiliza cada comando enviado ao msedgedriver em self.round_trips"""
+        # Sessões do pool já podem ter sido instrumentadas por outra automação
+        execute = getattr(driver, '_untracked_execute', None) or driver.execute
+        driver._untracked_execute = execute
+
+        def tracked_execute(driver_command, params=None):
+            self.round_trips += 1
+            return execute(driver_command, params)
+
+        driver.execute = tracked_execute
+
+    def _launch_browser(self):
+        """Inicia um novo navegador Edge com configurações anti-detecção"""
         try:
             options = Options()
             
@@ -73,50 +199,13 @@ class EdgeAutomation:
             
             # Cria o diretório temporário
             os.makedirs(temp_dir, exist_ok=True)
+            mark_owner(temp_dir)
             
-            # Copia apenas os arquivos necessários do perfil original
+            # Materializa o perfil a partir do snapshot incremental
             profile_name = os.path.basename(self.profile_path)
             temp_profile_dir = os.path.join(temp_dir, profile_name)
-            
-            # Lista de arquivos/pastas importantes para copiar
-            important_items = [
-                'Preferences',
-                'Cookies',
-                'Login Data',
-                'Web Data',
-                'Network',
-                'Local Storage',
-                'Extension State',
-                'Sync Data',
-                'Sessions',
-                'Accounts'
-            ]
-            
-            try:
-                os.makedirs(temp_profile_dir, exist_ok=True)
-                
-                # Primeiro, tenta copiar todo o perfil
-                try:
-                    shutil.copytree(self.profile_path, temp_profile_dir, dirs_exist_ok=True)
-                    logger.info("Perfil copiado com sucesso")
-                except Exception as e:
-                    logger.warning(f"Erro ao copiar perfil completo, tentando copiar arquivos importantes: {str(e)}")
-                    # Se falhar, tenta copiar apenas os arquivos importantes
-                    for item in important_items:
-                        src = os.path.join(self.profile_path, item)
-                        dst = os.path.join(temp_profile_dir, item)
-                        if os.path.exists(src):
-                            try:
-                                if os.path.isfile(src):
-                                    shutil.copy2(src, dst)
-                                elif os.path.isdir(src):
-                                    shutil.copytree(src, dst, dirs_exist_ok=True)
-                            except Exception as e:
-                                logger.warning(f"Erro ao copiar {item}: {str(e)}")
-                                continue
-                
-            except Exception as e:
-                logger.warning(f"Erro ao copiar arquivos do perfil: {str(e)}")
+            with self.metrics.time('profile_copy'):
+                self._prepare_profile(temp_profile_dir)
             
             # Configura o Edge para usar o diretório temporário
             options.add_argument(f'--user-data-dir={temp_dir}')
@@ -130,67 +219,61 @@ class EdgeAutomation:
             self.temp_dir = temp_dir
             
             # Configurações adicionais
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--disable-notifications')
-            options.add_argument('--disable-default-apps')
-            options.add_argument('--no-first-run')
-            options.add_argument('--no-default-browser-check')
-            options.add_argument('--start-maximized')
-            options.add_argument('--window-size=1920,1080')
+            for arg in BASE_EDGE_ARGUMENTS:
+                options.add_argument(arg)
             
             # Configurações experimentais
             options.add_experimental_option('excludeSwitches', ['enable-automation', 'enable-logging'])
             options.add_experimental_option('useAutomationExtension', False)
+            self._apply_capabilities(options)
             
             # Configurar User Agent aleatório
             user_agents = MOBILE_USER_AGENTS if self.device_type == 'mobile' else DESKTOP_USER_AGENTS
             options.add_argument(f'user-agent={random.choice(user_agents)}')
             
-            service = Service(EdgeChromiumDriverManager().install())
-            self.driver = webdriver.Edge(service=service, options=options)
+            with self.metrics.time('driver_install'):
+                service = Service(resolve_driver_path())
+            with self.metrics.time('browser_launch'):
+                driver = webdriver.Edge(service=service, options=options)
             
             # Remover flags de automação
-            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': '''
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-                    delete navigator.__proto__.webdriver;
-                '''
-            })
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': STEALTH_SCRIPT})
+            self._apply_resource_blocking(driver)
             
-            # Configurar cookies do Bing
-            self.driver.get("https://www.bing.com")
-            time.sleep(random.uniform(1, 2))
+            return driver
             
         except Exception as e:
             # Limpa o diretório temporário em caso de erro
             self._cleanup_temp_dir()
-            logger.error(f"Erro ao configurar driver: {str(e)}")
+            logger.error(f"Erro ao iniciar navegador: {str(e)}")
             raise
             
+    def _apply_capabilities(self, options: Options):
+        """Aplica os argumentos e preferências do EDGE_CAPABILITIES e do modo enxuto"""
+        for arg in edge_arguments(self.lean_mode, self.headless):
+            options.add_argument(arg)
+        options.add_experimental_option('prefs', edge_prefs(self.lean_mode, self.disable_images))
+
+    def _apply_resource_blocking(self, driver):
+        """Bloqueia imagens, mídia, fontes e terceiros na aba atual via CDP"""
+        patterns = blocked_url_patterns(self.lean_mode, self.disable_images)
+        if patterns is None:
+            return
+        
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        except Exception as e:
+            logger.warning(f"Erro ao configurar bloqueio de recursos: {str(e)}")
+
+    def _prepare_profile(self, temp_profile_dir: str):
+        """Prepara o perfil da sessão a partir do snapshot persistente do perfil original"""
+        prepare_profile(self.profile_path, temp_profile_dir)
+            
     def _cleanup_temp_dir(self):
-        """Limpa o diretório temporário"""
-        if hasattr(self, 'temp_dir') and self.temp_dir and os.path.exists(self.temp_dir):
-            try:
-                # Tenta remover o diretório várias vezes com pequenos intervalos
-                max_attempts = 3
-                for attempt in range(max_attempts):
-                    try:
-                        shutil.rmtree(self.temp_dir, ignore_errors=True)
-                        if not os.path.exists(self.temp_dir):
-                            logger.info(f"Diretório temporário removido: {self.temp_dir}")
-                            break
-                        time.sleep(1)  # Aguarda um pouco antes de tentar novamente
-                    except Exception as e:
-                        if attempt == max_attempts - 1:  # Última tentativa
-                            logger.error(f"Erro ao remover diretório temporário após {max_attempts} tentativas: {str(e)}")
-                        else:
-                            logger.warning(f"Tentativa {attempt + 1} falhou ao remover diretório temporário: {str(e)}")
-            except Exception as e:
-                logger.error(f"Erro ao remover diretório temporário: {str(e)}")
+        """Agenda a remoção do diretório temporário em segundo plano"""
+        temp_dir, self.temp_dir = self.temp_dir, None
+        janitor.schedule(temp_dir)
                 
     def _get_typing_delay(self) -> float:
         """Retorna o delay de digitação baseado na velocidade configurada"""
@@ -209,8 +292,10 @@ class EdgeAutomation:
             element.send_keys(text)
         else:
             for char in text:
+                if not self.is_running:
+                    return
                 element.send_keys(char)
-                time.sleep(random.uniform(delay * 0.8, delay * 1.2))
+                self.pacer.pause(random.uniform(delay * 0.8, delay * 1.2))
 
     def _simulate_human_behavior(self):
         """Simula comportamento humano aleatório"""
@@ -219,13 +304,13 @@ class EdgeAutomation:
             for _ in range(random.randint(1, 3)):
                 scroll_amount = random.randint(100, 800)
                 self.driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-                time.sleep(random.uniform(0.5, 1.5))
+                self.pacer.dwell('scroll')
                 
                 # Chance de scroll para cima
                 if random.random() < 0.3:
                     scroll_up = random.randint(50, scroll_amount)
                     self.driver.execute_script(f"window.scrollBy(0, -{scroll_up});")
-                    time.sleep(random.uniform(0.3, 0.8))
+                    self.pacer.dwell('scroll_up')
 
         # Movimento do mouse (simulado)
         self.driver.execute_script("""
@@ -239,59 +324,153 @@ class EdgeAutomation:
             document.dispatchEvent(event);
         """, random.randint(0, 800), random.randint(0, 600))
 
-    def _click_random_results(self):
-        """Clica em resultados aleatórios da pesquisa"""
-        if not self.click_results:
-            return
+    def _harvest_results(self) -> List[str]:
+        """Coleta os links dos resultados como strings em uma única chamada ao driver"""
+        return self.pacer.wait_for(lambda driver: driver.execute_script(HARVEST_RESULTS_SCRIPT))
 
-        try:
-            # Encontra todos os resultados
-            results = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "#b_results h2 a"))
-            )
+    def _result_tabs(self, href: Optional[str] = None, close: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Fecha abas de resultado e abre a próxima em uma única chamada ao driver
 
-            # Seleciona resultados aleatórios para clicar
-            clicks = min(self.click_count, len(results))
-            selected_results = random.sample(results, clicks)
+        As abas são abertas pela própria página de resultados (window.open), então
+        a janela atual do driver nunca muda e nenhuma troca de janela é necessária.
 
-            main_window = self.driver.current_window_handle
+        Args:
+            href: Resultado a abrir (None apenas fecha)
+            close: Ids das abas a fechar
 
-            for result in selected_results:
-                try:
-                    if not self.is_running:
-                        return
+        Returns:
+            Id da aba aberta, ou None
+        """
+        return self.driver.execute_script(RESULT_TABS_SCRIPT, href, close or [])
 
-                    # Scroll até o resultado
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", result)
-                    time.sleep(random.uniform(0.5, 1))
+    def _open_result(self, href: str, close: List[str]) -> Optional[str]:
+        """Fecha as abas já lidas e abre um resultado em uma nova aba, com um único comando"""
+        self.pacer.dwell('before_click')
+        if not self.is_running:
+            return None
 
-                    # Abre o link em nova aba
-                    self.driver.execute_script("window.open(arguments[0].href, '_blank');", result)
-                    time.sleep(1)
+        with self.metrics.time('result_click'):
+            tab = self._result_tabs(href, close)
+        if tab is None:
+            logger.warning(f"Não foi possível abrir o resultado em uma nova aba: {href}")
+        return tab
 
-                    # Muda para a nova aba
-                    new_window = self.driver.window_handles[-1]
-                    self.driver.switch_to.window(new_window)
+    def _close_result_tabs(self, tabs: List[str]):
+        """Fecha as abas de resultado restantes, recorrendo às janelas do driver se a página não responder"""
+        if not tabs:
+            return
+        try:
+            self._result_tabs(None, tabs)
+            return
+        except Exception as e:
+            logger.warning(f"Erro ao fechar abas de resultado: {str(e)}")
 
-                    # Simula leitura da página
-                    self._simulate_human_behavior()
-                    time.sleep(random.uniform(self.read_time * 0.8, self.read_time * 1.2))
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
 
-                    # Fecha a aba atual
-                    self.driver.close()
+    def _read_time(self) -> float:
+        return random.uniform(self.read_time * 0.8, self.read_time * 1.2)
 
-                    # Volta para a aba principal
-                    self.driver.switch_to.window(main_window)
+    def _read_results(self, links: List[str]):
+        """
+        Lê os resultados um de cada vez
 
+        A aba lida é fechada no mesmo comando que abre a próxima, então cada
+        resultado custa uma chamada ao driver, mais uma para fechar a última aba.
+        """
+        pending: List[str] = []
+        try:
+            for href in links:
+                if not self.is_running:
+                    return
+                try:
+                    tab = self._open_result(href, pending)
+                except AutomationCancelled:
+                    raise
                 except Exception as e:
                     logger.warning(f"Erro ao processar resultado: {str(e)}")
-                    # Garante que voltamos para a janela principal em caso de erro
-                    try:
-                        self.driver.switch_to.window(main_window)
-                    except:
-                        pass
                     continue
+                pending = []
+                if tab is None:
+                    continue
+                pending = [tab]
+
+                # Simula leitura da página
+                self.pacer.pause(self._read_time())
+        finally:
+            self._close_result_tabs(pending)
+
+    def _tabs_over_memory_limit(self) -> bool:
+        if not self.tabs_memory_limit_mb:
+            return False
+        memory = driver_memory_mb(self.driver)
+        return memory is not None and memory >= self.tabs_memory_limit_mb
+
+    def _finish_next_tab(self, open_tabs: list) -> str:
+        """Aguarda o fim da leitura mais próxima e retorna a aba correspondente"""
+        deadline, tab = heapq.heappop(open_tabs)
+        if self.is_running:
+            self.pacer.pause(deadline - time.monotonic())
+        return tab
+
+    def _read_results_concurrently(self, links: List[str]):
+        """
+        Abre os resultados em abas simultâneas para que os tempos de leitura se sobreponham
+
+        A duração total fica limitada pela leitura mais longa em vez da soma de todas.
+        Novas abas só são abertas enquanto houver espaço dentro dos limites de abas e memória.
+        As abas cuja leitura terminou são fechadas no mesmo comando que abre a próxima.
+        """
+        open_tabs = []  # heap de (fim da leitura, id da aba)
+        finished: List[str] = []
+        try:
+            for href in links:
+                if not self.is_running:
+                    break
+                while open_tabs and (len(open_tabs) >= self.max_open_tabs or self._tabs_over_memory_limit()):
+                    finished.append(self._finish_next_tab(open_tabs))
+                    if self.tabs_memory_limit_mb:
+                        # A memória só diminui depois que a aba é realmente fechada
+                        self._result_tabs(None, finished)
+                        finished = []
+
+                try:
+                    tab = self._open_result(href, finished)
+                except Exception as e:
+                    logger.warning(f"Erro ao abrir resultado: {str(e)}")
+                    continue
+                finished = []
+                if tab is not None:
+                    heapq.heappush(open_tabs, (time.monotonic() + self._read_time(), tab))
+        finally:
+            while open_tabs:
+                finished.append(self._finish_next_tab(open_tabs))
+            self._close_result_tabs(finished)
+
+    def _click_random_results(self):
+        """Clica em resultados aleatórios da pesquisa"""
+        if not self.click_results:
+            return
+
+        try:
+            # Coleta os links de todos os resultados de uma vez
+            links = self._harvest_results()
+
+            # Seleciona resultados aleatórios para clicar
+            clicks = min(self.click_count, len(links))
+            selected_links = random.sample(links, clicks)
 
+            if self.concurrent_reading and clicks > 1:
+                self._read_results_concurrently(selected_links)
+            else:
+                self._read_results(selected_links)
+
+        except AutomationCancelled:
+            return
         except Exception as e:
             logger.error(f"Erro ao interagir com resultados: {str(e)}")
             # Tenta recuperar a janela principal
@@ -300,46 +479,111 @@ class EdgeAutomation:
             except:
                 pass
 
-    def perform_search(self, search_term: str):
-        """Realiza uma única pesquisa simulando comportamento humano"""
+    def _type_and_submit(self, search_box, search_term: str) -> bool:
+        """Digita o termo no campo de pesquisa e envia"""
+        self.pacer.dwell('before_typing')
         if not self.is_running:
             return False
-
-        try:
-            # Abre o Bing
-            self.driver.get("https://www.bing.com")
-            if not self.is_running:
-                return False
-            time.sleep(random.uniform(1, 2))
             
-            # Encontra o campo de pesquisa
-            search_box = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "q"))
-            )
-            
-            if not self.is_running:
-                return False
-                
-            # Limpa o campo e digita como humano
+        # Limpa o campo e digita como humano
+        with self.metrics.time('typing'):
             search_box.clear()
             self._type_like_human(search_box, search_term)
+        
+        if not self.is_running:
+            return False
             
-            if not self.is_running:
-                return False
-                
-            # Simula comportamento antes de pesquisar
-            self._simulate_human_behavior()
+        # Simula comportamento antes de pesquisar
+        self._simulate_human_behavior()
+        
+        if not self.is_running:
+            return False
             
+        # Pressiona Enter
+        self._search_submitted = True
+        search_box.send_keys(Keys.RETURN)
+        self.metrics.inc('page_loads', kind='results')
+        return True
+
+    def _search_from_homepage(self, search_term: str) -> bool:
+        """Pesquisa a partir da página inicial do Bing"""
+        # Abre o Bing
+        with self.metrics.time('page_load'):
+            self.driver.get(self.base_url)
+            self.metrics.inc('page_loads', kind='homepage')
             if not self.is_running:
                 return False
-                
-            # Pressiona Enter
-            search_box.send_keys(Keys.RETURN)
-            
-            # Aguarda resultados e simula leitura
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "b_results"))
-            )
+            self.pacer.wait_page_ready()
+        
+        # Encontra o campo de pesquisa assim que a página estiver pronta
+        with self.metrics.time('search_box_wait'):
+            search_box = self.pacer.wait_element((By.NAME, "q"))
+        
+        if not self._type_and_submit(search_box, search_term):
+            return False
+        
+        # Aguarda resultados
+        with self.metrics.time('results_wait'):
+            self.pacer.wait_element((By.ID, "b_results"))
+        return True
+
+    def _search_from_results_page(self, search_term: str) -> bool:
+        """Pesquisa reaproveitando o campo de pesquisa da página de resultados atual"""
+        previous_results = self.driver.find_element(By.ID, "b_results")
+        with self.metrics.time('search_box_wait'):
+            search_box = self.pacer.wait_element((By.NAME, "q"), timeout=2)
+        
+        if not self._type_and_submit(search_box, search_term):
+            return False
+        
+        # Aguarda a troca da página antes de procurar os novos resultados
+        with self.metrics.time('results_wait'):
+            self.pacer.wait_for(EC.staleness_of(previous_results))
+            self.pacer.wait_element((By.ID, "b_results"))
+        return True
+
+    def _search_direct(self, search_term: str) -> bool:
+        """Navega diretamente para a URL de resultados"""
+        with self.metrics.time('page_load'):
+            self._search_submitted = True
+            self.driver.get(f"{self.base_url}/search?q={quote_plus(search_term)}")
+            self.metrics.inc('page_loads', kind='results')
+        with self.metrics.time('results_wait'):
+            self.pacer.wait_element((By.ID, "b_results"))
+        return True
+
+    def _submit_search(self, search_term: str) -> bool:
+        """Envia a pesquisa usando o modo de navegação configurado, com a página inicial como fallback"""
+        mode = self.search_navigation
+        self._search_submitted = False
+        if mode == 'direct' or (mode == 'chain' and self._on_results_page):
+            try:
+                if mode == 'direct':
+                    return self._search_direct(search_term)
+                return self._search_from_results_page(search_term)
+            except AutomationCancelled:
+                raise
+            except Exception as e:
+                # Depois do envio, repetir pela página inicial faria o Bing receber a pesquisa duas vezes
+                if self._search_submitted:
+                    raise
+                logger.warning(f"Falha ao pesquisar sem a página inicial, usando fallback: {str(e)}")
+                self._on_results_page = False
+                if not self.is_running:
+                    return False
+        
+        return self._search_from_homepage(search_term)
+
+    def perform_search(self, search_term: str):
+        """Realiza uma única pesquisa simulando comportamento humano"""
+        if not self.is_running:
+            return False
+
+        round_trips_before = self.round_trips
+        try:
+            if not self._submit_search(search_term):
+                return False
+            self._on_results_page = True
             
             if not self.is_running:
                 return False
@@ -351,8 +595,12 @@ class EdgeAutomation:
                 self._click_random_results()
             
             return True
+        except AutomationCancelled:
+            return False
         except Exception as e:
             logger.error(f"Erro na pesquisa '{search_term}': {str(e)}")
+            self.metrics.inc('search_failures')
+            self._on_results_page = False
             # Tenta recuperar em caso de erro
             try:
                 if self.driver.window_handles:
@@ -360,141 +608,224 @@ class EdgeAutomation:
             except:
                 pass
             return False
+        finally:
+            self.metrics.observe('round_trips', self.round_trips - round_trips_before)
 
     def start_automation(self, search_count: int = DEFAULT_SEARCH_COUNT):
         """Inicia o processo de automação"""
+        with log_context(profile=os.path.basename(self.profile_path), device=self.device_type):
+            self._run_searches(search_count)
+
+    def _run_searches(self, search_count: int):
+        history = None
+        self._worker = threading.current_thread()
+        self._finished.clear()
         try:
+            if self.stop_event.is_set():
+                return
             self.setup_driver()
-            self.is_running = True
+            # Uma parada pode ter sido solicitada enquanto o navegador iniciava
+            self.is_running = not self.stop_event.is_set()
             
             searches_completed = 0
-            termos_usados = set()
+            if self.use_term_history:
+                history = TermHistory(self.profile_path)
+            terms = create_term_generator(
+                diverse=self.term_diversity,
+                extra_terms=self.custom_terms if self.use_custom_terms else None,
+                seed=self.term_seed,
+                exclude=history.contains if history is not None else None,
+                last_used=history.last_used if history is not None else None
+            )
+            self.interval_controller = AdaptiveInterval(
+                self.min_interval, self.max_interval, adaptive=self.adaptive_interval
+            )
 
             while searches_completed < search_count and self.is_running:
-                # Gera uma pergunta natural usando templates
-                import random
-                from ..config.settings import SEARCH_TERMS
-
-                # Templates de perguntas comuns
-                templates_perguntas = [
-                    "Como fazer {}?",
-                    "Qual é a melhor maneira de {}?",
-                    "O que significa {}?",
-                    "Onde encontrar {}?",
-                    "Quais são os benefícios de {}?",
-                    "Por que {} acontece?",
-                    "Quando devo {}?",
-                    "Como funciona {}?",
-                    "Qual a diferença entre {} e {}?",
-                    "Como resolver problemas com {}?"
-                ]
-
-                # Tópicos comuns para gerar perguntas relevantes
-                topicos = [
-                    "exercícios", "meditação", "alimentação saudável", "sono", "produtividade",
-                    "estudo", "trabalho remoto", "investimentos", "programação", "idiomas",
-                    "jardinagem", "culinária", "fotografia", "música", "arte",
-                    "viagem", "tecnologia", "saúde", "bem-estar", "sustentabilidade",
-                    "reciclagem", "energia renovável", "marketing digital", "redes sociais",
-                    "desenvolvimento pessoal", "carreira", "finanças pessoais", "decoração",
-                    "organização", "limpeza", "manutenção", "consertos", "DIY"
-                ]
-
-                # Gera uma pergunta aleatória
-                if random.random() > 0.3 and SEARCH_TERMS:  # 30% de chance de usar termos personalizados
-                    search_term = random.choice(SEARCH_TERMS)
-                else:
-                    template = random.choice(templates_perguntas)
-                    if "{}" in template:
-                        if template.count("{}") == 2:
-                            # Para templates que precisam de dois tópicos
-                            topicos_selecionados = random.sample(topicos, 2)
-                            search_term = template.format(topicos_selecionados[0], topicos_selecionados[1])
-                        else:
-                            # Para templates que precisam de um tópico
-                            topico = random.choice(topicos)
-                            search_term = template.format(topico)
+                if self._recycle_reason is not None:
+                    self._recycle_session(searches_completed, search_count)
+                    continue
                 
-                # Se o termo já foi usado, gerar outro
-                while search_term in termos_usados:
-                    if random.random() > 0.3 and SEARCH_TERMS:
-                        search_term = random.choice(SEARCH_TERMS)
-                    else:
-                        template = random.choice(templates_perguntas)
-                        if "{}" in template:
-                            if template.count("{}") == 2:
-                                topicos_selecionados = random.sample(topicos, 2)
-                                search_term = template.format(topicos_selecionados[0], topicos_selecionados[1])
-                            else:
-                                topico = random.choice(topicos)
-                                search_term = template.format(topico)
+                # Próximo termo inédito desta execução
+                try:
+                    search_term = terms.next_term()
+                except TermPoolExhausted:
+                    logger.warning("Todos os termos de pesquisa disponíveis já foram usados")
+                    break
                 
-                termos_usados.add(search_term)
+                page_time = page_seconds(self.metrics)
+                succeeded = self.perform_search(search_term)
+                # Pesquisas interrompidas pela parada não contam para o controle de intervalo
+                if self.is_running:
+                    self.interval_controller.record(succeeded, page_seconds(self.metrics) - page_time)
                 
-                if self.perform_search(search_term):
+                if succeeded:
                     searches_completed += 1
+                    self.metrics.inc('searches')
+                    if history is not None:
+                        history.add(search_term)
                     logger.info(f"Pesquisa {searches_completed}/{search_count} realizada: {search_term}")
-                    
-                    # Intervalo aleatório entre pesquisas
-                    if searches_completed < search_count:
-                        delay = random.uniform(self.min_interval, self.max_interval)
-                        time.sleep(delay)
+                
+                # Intervalo entre pesquisas, ajustado pela latência e pelas falhas recentes. Com o
+                # ajuste ativo ele vale também após uma falha, para que o aumento espace a nova tentativa
+                if (self.is_running and searches_completed < search_count
+                        and (succeeded or self.interval_controller.adaptive)):
+                    delay = self.interval_controller.next_interval()
+                    self.metrics.observe('search_interval_seconds', delay)
+                    self.pacer.pause(delay)
                         
+        except AutomationCancelled:
+            pass
         except Exception as e:
             logger.error(f"Erro durante a automação: {str(e)}")
         finally:
-            self.stop_automation()
+            self.is_running = False
+            self._finished.set()
+            if self._stop_requested_at is not None:
+                self.metrics.observe('stop_latency_seconds', time.perf_counter() - self._stop_requested_at)
+            if self.pacer is not None:
+                summary = self.pacer.summary()
+                logger.info(
+                    f"Tempo da execução: {summary['total']:.1f}s total, "
+                    f"{summary['waiting']:.1f}s aguardando a página, "
+                    f"{summary['dwell']:.1f}s em pausas deliberadas, "
+                    f"{summary['busy']:.1f}s com o navegador ocupado"
+                )
+            if history is not None:
+                history.close()
+            self._teardown()
+            self._worker = None
             
     def stop_automation(self):
-        """Para o processo de automação e limpa recursos"""
+        """
+        Para o processo de automação e limpa recursos
+
+        Chamado de outra thread durante a execução, apenas sinaliza o cancelamento:
+        a thread da automação sai de qualquer espera e libera os próprios recursos.
+        Se ela não responder em STOP_TIMEOUT (ex.: presa em um carregamento de
+        página), o navegador é encerrado à força para destravá-la.
+        """
         logger.info("Iniciando parada da automação...")
-        
-        # Marca como não executando primeiro
         self.is_running = False
         
+        worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            if self._stop_requested_at is None:
+                self._stop_requested_at = time.perf_counter()
+            self.stop_event.set()
+            if not self._finished.wait(STOP_TIMEOUT):
+                logger.warning("Automação não respondeu à parada a tempo, encerrando o navegador")
+                self._force_close()
+            return
+        
+        self.stop_event.set()
+        self._teardown()
+
+    def _request_recycle(self, kind: str, reason: str):
+        """Chamado pelo watchdog: marca o navegador para ser reciclado antes da próxima pesquisa"""
+        self._recycle_reason = reason
+        self.metrics.inc('session_recycles', reason=kind)
+        if kind == 'unresponsive':
+            # A thread da automação provavelmente está presa no driver; encerrar o
+            # navegador faz o comando atual falhar e a pesquisa ser repetida
+            self._force_close()
+
+    def _recycle_session(self, searches_completed: int, search_count: int):
+        """Troca o navegador por um novo e continua a execução do mesmo ponto"""
+        reason, self._recycle_reason = self._recycle_reason, None
+        logger.warning(
+            f"Reciclando o navegador após {searches_completed}/{search_count} pesquisas: {reason}"
+        )
+        with self.metrics.time('recycle'):
+            self._release_browser(discard=True)
+            self._forced_stop = False
+            self._on_results_page = False
+            if self.stop_event.is_set():
+                return
+            self.setup_driver()
+
+    def _force_close(self):
+        """Encerra os processos do navegador sem passar pelo driver, que está ocupado"""
+        driver = self.driver
+        if driver is None:
+            return
+        try:
+            kill_process_tree(driver.service.process.pid)
+            self._forced_stop = True
+        except AttributeError:
+            pass
+
+    def _teardown(self):
+        """Fecha ou devolve o navegador e remove o diretório temporário (apenas uma vez)"""
+        teardown_start = time.perf_counter()
+        if self._release_browser():
+            self.metrics.observe('phase_seconds', time.perf_counter() - teardown_start, phase='teardown')
+        logger.info("Automação parada com sucesso")
+
+    def _release_browser(self, discard: bool = False) -> bool:
+        """
+        Fecha ou devolve ao pool o navegador atual e agenda a remoção do diretório temporário
+
+        Args:
+            discard: Descarta a sessão do pool em vez de devolvê-la para reuso
+
+        Returns:
+            False se não havia navegador nem diretório a liberar
+        """
+        with self._teardown_lock:
+            session, self.session = self.session, None
+            driver, self.driver = self.driver, None
+            temp_dir_exists = bool(self.temp_dir)
+        watchdog.unwatch(self)
+        if not (session or driver or temp_dir_exists):
+            return False
+        
+        # Devolve a sessão ao pool em vez de fechar o navegador
+        if session is not None:
+            driver = None
+            self.pool.release(session, reusable=not (self._forced_stop or discard))
+            logger.info("Sessão descartada" if discard else "Sessão devolvida ao pool")
+        
         # Tenta fechar o navegador com segurança
-        if self.driver:
+        if driver and not self._forced_stop:
             try:
                 # Lista todas as janelas antes de começar a fechar
-                all_handles = self.driver.window_handles
+                all_handles = driver.window_handles
                 logger.info(f"Fechando {len(all_handles)} janelas")
                 
                 # Se tiver mais de uma janela, tenta fechar uma por uma
                 if len(all_handles) > 1:
                     # Guarda a janela principal
-                    main_window = self.driver.current_window_handle
+                    main_window = driver.current_window_handle
                     
                     for handle in all_handles:
                         if handle != main_window:
                             try:
-                                self.driver.switch_to.window(handle)
-                                self.driver.close()
+                                driver.switch_to.window(handle)
+                                driver.close()
                                 logger.info(f"Janela fechada: {handle}")
                             except Exception as e:
                                 logger.warning(f"Erro ao fechar janela {handle}: {str(e)}")
                     
                     # Volta para a janela principal
                     try:
-                        self.driver.switch_to.window(main_window)
+                        driver.switch_to.window(main_window)
                     except Exception as e:
                         logger.warning(f"Erro ao voltar para janela principal: {str(e)}")
                 
                 # Tenta fechar apenas a janela atual do navegador
                 try:
-                    self.driver.quit()
+                    driver.quit()
                     logger.info("Navegador fechado normalmente")
                 except Exception as e:
                     logger.warning(f"Erro ao fechar navegador normalmente: {str(e)}")
                 
             except Exception as e:
                 logger.error(f"Erro durante o processo de parada: {str(e)}")
-            finally:
-                self.driver = None
         
         # Limpa o diretório temporário
         try:
             self._cleanup_temp_dir()
         except Exception as e:
             logger.error(f"Erro ao limpar diretório temporário: {str(e)}")
-        
-        logger.info("Automação parada com sucesso") 
\ No newline at end of file
+        return True 
\ No newline at end of file
@@ -0,0 +1,34 @@
+import logging
+from typing import Optional, Dict, Any
+from ..config.settings import AUTOMATION_BACKEND, SHARED_BROWSER
+from .pool import DriverPool
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('selenium', 'cdp')
+
+
+def create_automation(profile_path: str, device_type: str = 'desktop', config: Optional[Dict[str, Any]] = None,
+                      pool: Optional[DriverPool] = None):
+    """
+    Cria a automação do backend configurado
+
+    O backend vem da chave 'backend' do config ou, na falta dela, de AUTOMATION_BACKEND.
+    No backend 'cdp', SHARED_BROWSER (ou config['shared_browser']) coloca a sessão
+    em um contexto do navegador compartilhado. Os módulos de cada backend só são
+    importados quando usados.
+    """
+    config = config or {}
+    backend = config.get('backend') or AUTOMATION_BACKEND
+    if backend == 'cdp':
+        from .cdp_automation import CdpAutomation
+        shared_browser = None
+        if config.get('shared_browser', SHARED_BROWSER):
+            from .contexts import get_shared_browser
+            shared_browser = get_shared_browser()
+        return CdpAutomation(profile_path=profile_path, device_type=device_type, config=config,
+                             shared_browser=shared_browser)
+    if backend == 'selenium':
+        from .automation import EdgeAutomation
+        return EdgeAutomation(profile_path=profile_path, device_type=device_type, config=config, pool=pool)
+    raise ValueError(f"Backend de automação desconhecido: {backend} (opções: {', '.join(BACKENDS)})")
@@ -0,0 +1,138 @@
+from typing import Optional, Dict, Any, List
+from ..config.settings import (
+    EDGE_CAPABILITIES,
+    IMAGE_BLOCKED_URLS,
+    LEAN_BLOCKED_HOSTS,
+    LEAN_BLOCKED_URLS,
+    LEAN_CONTENT_PREFS
+)
+
+# Argumentos de linha de comando comuns a todas as sessões do Edge
+BASE_EDGE_ARGUMENTS = [
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-gpu',
+    '--disable-notifications',
+    '--disable-default-apps',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--start-maximized',
+    '--window-size=1920,1080'
+]
+
+# Argumentos adicionais do modo enxuto
+LEAN_EDGE_ARGUMENTS = [
+    '--blink-settings=imagesEnabled=false',
+    '--mute-audio',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--renderer-process-limit=2'
+]
+
+# Remove a marca de automação do navegador em cada documento
+STEALTH_SCRIPT = '''
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    delete navigator.__proto__.webdriver;
+'''
+
+# Links dos resultados orgânicos, sem duplicatas, extraídos em uma única chamada
+HARVEST_RESULTS_SCRIPT = """
+    var links = [];
+    document.querySelectorAll('#b_results h2 a').forEach(function(a) {
+        if (a.href && a.href.indexOf('http') === 0 && links.indexOf(a.href) === -1) {
+            links.push(a.href);
+        }
+    });
+    return links;
+"""
+
+# Fecha as abas de resultado informadas (arguments[1]) e, se arguments[0] tiver
+# um link, rola até ele e o abre em uma nova aba a partir da própria página.
+# As abas ficam registradas na página e são identificadas pelo id retornado;
+# retorna null se a aba não pôde ser aberta
+RESULT_TABS_SCRIPT = """
+    var tabs = window.__resultTabs = window.__resultTabs || {};
+    var close = arguments[1] || [];
+    for (var i = 0; i < close.length; i++) {
+        if (tabs[close[i]]) {
+            tabs[close[i]].close();
+            delete tabs[close[i]];
+        }
+    }
+    var href = arguments[0];
+    if (!href) {
+        return null;
+    }
+    var links = document.querySelectorAll('#b_results h2 a');
+    for (var j = 0; j < links.length; j++) {
+        if (links[j].href === href) {
+            links[j].scrollIntoView(true);
+            break;
+        }
+    }
+    var tab = window.open(href, '_blank');
+    if (!tab) {
+        return null;
+    }
+    window.__resultTabsCount = (window.__resultTabsCount || 0) + 1;
+    var id = 'tab' + window.__resultTabsCount;
+    tabs[id] = tab;
+    return id;
+"""
+
+SCROLL_TO_RESULT_SCRIPT = """
+    var links = document.querySelectorAll('#b_results h2 a');
+    for (var i = 0; i < links.length; i++) {
+        if (links[i].href === arguments[0]) {
+            links[i].scrollIntoView(true);
+            return true;
+        }
+    }
+    return false;
+"""
+
+
+def edge_arguments(lean_mode: bool = False, headless: bool = False) -> List[str]:
+    """
+    Argumentos do EDGE_CAPABILITIES e dos modos headless/enxuto
+
+    O Edge considera apenas o último --disable-features, então os valores são unidos.
+    """
+    arguments = []
+    disabled_features = []
+    for arg in EDGE_CAPABILITIES.get('ms:edgeOptions', {}).get('args', []):
+        if arg.startswith('--disable-features='):
+            disabled_features.extend(arg.split('=', 1)[1].split(','))
+        else:
+            arguments.append(arg)
+    if disabled_features:
+        arguments.append(f"--disable-features={','.join(disabled_features)}")
+
+    if lean_mode or headless:
+        arguments.append('--headless=new')
+    if lean_mode:
+        arguments.extend(LEAN_EDGE_ARGUMENTS)
+        rules = ', '.join(f'MAP {host} ~NOTFOUND, MAP *.{host} ~NOTFOUND' for host in LEAN_BLOCKED_HOSTS)
+        arguments.append(f'--host-resolver-rules={rules}')
+    return arguments
+
+
+def edge_prefs(lean_mode: bool = False, disable_images: bool = False) -> Dict[str, Any]:
+    """Preferências do EDGE_CAPABILITIES com as restrições de conteúdo do modo configurado"""
+    prefs = dict(EDGE_CAPABILITIES.get('ms:edgeOptions', {}).get('prefs', {}))
+    if lean_mode:
+        prefs.update(LEAN_CONTENT_PREFS)
+    elif disable_images:
+        prefs['profile.managed_default_content_settings.images'] = 2
+    return prefs
+
+
+def blocked_url_patterns(lean_mode: bool = False, disable_images: bool = False) -> Optional[List[str]]:
+    """Padrões de URL bloqueados via CDP, ou None se nada deve ser bloqueado"""
+    if lean_mode:
+        return LEAN_BLOCKED_URLS
+    if disable_images:
+        return IMAGE_BLOCKED_URLS
+    return None
@@ -0,0 +1,268 @@
+import os
+import json
+import asyncio
+import logging
+import itertools
+from typing import Optional, Dict, Any, List, Callable
+import websockets
+
+logger = logging.getLogger(__name__)
+
+# Tempo máximo de resposta de um comando CDP (segundos)
+COMMAND_TIMEOUT = 30
+
+# Tempo máximo para o Edge publicar a porta de depuração (segundos)
+LAUNCH_TIMEOUT = 30
+
+Listener = Callable[[Dict[str, Any]], None]
+
+
+class CdpError(Exception):
+    """Erro retornado pelo navegador para um comando CDP"""
+
+
+class CdpConnection:
+    """
+    Conexão websocket com o DevTools do navegador.
+
+    Todas as páginas compartilham a mesma conexão (sessões "flatten"), então um
+    único loop asyncio atende qualquer número de abas e navegadores sem threads.
+    """
+
+    def __init__(self, websocket):
+        self._websocket = websocket
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._listeners: Dict[tuple, List[Listener]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self.commands = 0
+
+    @classmethod
+    async def connect(cls, url: str) -> 'CdpConnection':
+        websocket = await websockets.connect(url, max_size=None, ping_interval=None)
+        connection = cls(websocket)
+        connection._reader = asyncio.ensure_future(connection._read_loop())
+        return connection
+
+    async def _read_loop(self):
+        try:
+            async for raw in self._websocket:
+                message = json.loads(raw)
+                if 'id' in message:
+                    future = self._pending.pop(message['id'], None)
+                    if future is None or future.done():
+                        continue
+                    if 'error' in message:
+                        future.set_exception(CdpError(message['error'].get('message', str(message['error']))))
+                    else:
+                        future.set_result(message.get('result', {}))
+                else:
+                    self._dispatch(message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Conexão CDP encerrada"))
+            self._pending.clear()
+
+    def _dispatch(self, message: Dict[str, Any]):
+        key = (message.get('sessionId'), message.get('method'))
+        for listener in list(self._listeners.get(key, [])):
+            try:
+                listener(message.get('params', {}))
+            except Exception as e:
+                logger.warning(f"Erro ao processar evento {key[1]}: {str(e)}")
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None,
+                   session_id: Optional[str] = None, timeout: float = COMMAND_TIMEOUT) -> Dict[str, Any]:
+        """Envia um comando e aguarda a resposta"""
+        message_id = next(self._ids)
+        payload = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            payload['sessionId'] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        self.commands += 1
+        try:
+            await self._websocket.send(json.dumps(payload))
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(message_id, None)
+
+    def on(self, method: str, listener: Listener, session_id: Optional[str] = None):
+        self._listeners.setdefault((session_id, method), []).append(listener)
+
+    def off(self, method: str, listener: Listener, session_id: Optional[str] = None):
+        listeners = self._listeners.get((session_id, method), [])
+        if listener in listeners:
+            listeners.remove(listener)
+
+    def expect_event(self, method: str, session_id: Optional[str] = None) -> asyncio.Future:
+        """
+        Registra a espera por um evento antes de disparar a ação que o provoca
+
+        Returns:
+            Future resolvido com os parâmetros da primeira ocorrência do evento
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        def listener(params: Dict[str, Any]):
+            self.off(method, listener, session_id)
+            if not future.done():
+                future.set_result(params)
+
+        self.on(method, listener, session_id)
+        future.add_done_callback(lambda _: self.off(method, listener, session_id))
+        return future
+
+    async def close(self):
+        await self._websocket.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+
+
+class CdpPage:
+    """Aba do navegador controlada por uma sessão CDP"""
+
+    def __init__(self, connection: CdpConnection, target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    @classmethod
+    async def attach(cls, connection: CdpConnection, target_id: str) -> 'CdpPage':
+        result = await connection.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True})
+        page = cls(connection, target_id, result['sessionId'])
+        await page.send('Page.enable')
+        return page
+
+    @classmethod
+    async def create(cls, connection: CdpConnection, url: str = 'about:blank',
+                     browser_context_id: Optional[str] = None) -> 'CdpPage':
+        """Abre uma nova aba e se conecta a ela"""
+        params: Dict[str, Any] = {'url': url}
+        if browser_context_id:
+            params['browserContextId'] = browser_context_id
+        result = await connection.send('Target.createTarget', params)
+        return await cls.attach(connection, result['targetId'])
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.connection.send(method, params, session_id=self.session_id)
+
+    async def navigate(self, url: str, timeout: float = COMMAND_TIMEOUT):
+        """Navega para a URL e aguarda o evento de carregamento"""
+        loaded = self.connection.expect_event('Page.loadEventFired', self.session_id)
+        try:
+            result = await self.send('Page.navigate', {'url': url})
+            if result.get('errorText'):
+                raise CdpError(f"Falha ao navegar para {url}: {result['errorText']}")
+            await asyncio.wait_for(loaded, timeout)
+        finally:
+            loaded.cancel()
+
+    async def evaluate(self, expression: str) -> Any:
+        """Avalia uma expressão JavaScript na página e retorna o valor serializado"""
+        result = await self.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': True
+        })
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise CdpError(details.get('exception', {}).get('description') or details.get('text', 'Erro de script'))
+        return result.get('result', {}).get('value')
+
+    async def call(self, function_body: str, *args) -> Any:
+        """Executa o corpo de uma função (como no execute_script do Selenium) com os argumentos informados"""
+        return await self.evaluate(f"(function() {{ {function_body} }}).apply(null, {json.dumps(list(args))})")
+
+    async def wait_for(self, expression: str, timeout: float, poll_frequency: float = 0.1) -> Any:
+        """Aguarda até que a expressão retorne um valor verdadeiro"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            value = await self.evaluate(expression)
+            if value:
+                return value
+            if asyncio.get_running_loop().time() >= deadline:
+                raise asyncio.TimeoutError(f"Tempo esgotado aguardando: {expression}")
+            await asyncio.sleep(poll_frequency)
+
+    async def insert_text(self, text: str):
+        await self.send('Input.insertText', {'text': text})
+
+    async def press_enter(self):
+        key = {'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13}
+        await self.send('Input.dispatchKeyEvent', {'type': 'keyDown', 'text': '\r', **key})
+        await self.send('Input.dispatchKeyEvent', {'type': 'keyUp', **key})
+
+    async def close(self):
+        try:
+            await self.connection.send('Target.closeTarget', {'targetId': self.target_id})
+        except (CdpError, ConnectionError) as e:
+            logger.debug(f"Erro ao fechar aba: {str(e)}")
+
+
+class EdgeProcess:
+    """Processo do Edge iniciado com a porta de depuração remota habilitada"""
+
+    def __init__(self, process: asyncio.subprocess.Process, user_data_dir: str, websocket_url: str):
+        self.process = process
+        self.user_data_dir = user_data_dir
+        self.websocket_url = websocket_url
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @classmethod
+    async def launch(cls, binary: str, user_data_dir: str, arguments: List[str],
+                     timeout: float = LAUNCH_TIMEOUT) -> 'EdgeProcess':
+        """
+        Inicia o Edge e aguarda o endpoint do DevTools
+
+        Com --remote-debugging-port=0 o navegador escolhe uma porta livre e a
+        publica, junto com o caminho do websocket, no arquivo DevToolsActivePort.
+        """
+        port_file = os.path.join(user_data_dir, 'DevToolsActivePort')
+        if os.path.exists(port_file):
+            os.remove(port_file)
+
+        process = await asyncio.create_subprocess_exec(
+            binary,
+            '--remote-debugging-port=0',
+            f'--user-data-dir={user_data_dir}',
+            *arguments,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            if process.returncode is not None:
+                raise RuntimeError(f"Edge terminou ao iniciar (código {process.returncode})")
+            try:
+                with open(port_file, 'r', encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+                if len(lines) >= 2:
+                    return cls(process, user_data_dir, f'ws://127.0.0.1:{lines[0]}{lines[1]}')
+            except OSError:
+                pass
+            await asyncio.sleep(0.05)
+
+        process.kill()
+        await process.wait()
+        raise TimeoutError("Edge não publicou a porta de depuração a tempo")
+
+    async def terminate(self, timeout: float = 5):
+        """Encerra o navegador, forçando se ele não sair a tempo"""
+        if self.process.returncode is not None:
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
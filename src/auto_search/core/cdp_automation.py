@@ -0,0 +1,608 @@
+import os
+import time
+import uuid
+import random
+import asyncio
+import threading
+import logging
+import tempfile
+from urllib.parse import quote_plus
+from typing import Optional, Dict, Any, List
+from ..config.settings import (
+    MOBILE_USER_AGENTS,
+    DESKTOP_USER_AGENTS,
+    DEFAULT_SEARCH_COUNT,
+    MIN_SEARCH_INTERVAL,
+    MAX_SEARCH_INTERVAL,
+    TYPING_SPEEDS,
+    DWELL_BUDGET,
+    DWELL_SCALE,
+    WAIT_TIMEOUT,
+    WAIT_POLL_FREQUENCY,
+    STOP_TIMEOUT,
+    TERM_SEED,
+    TERM_HISTORY_ENABLED,
+    TERM_DIVERSITY,
+    ADAPTIVE_INTERVAL,
+    BROWSER_HEADLESS,
+    BROWSER_DISABLE_IMAGES,
+    BROWSER_LEAN_MODE,
+    SEARCH_NAVIGATION,
+    CONCURRENT_READING,
+    MAX_OPEN_TABS,
+    SEARCH_BASE_URL
+)
+from ..config.logging_config import log_context
+from .snapshot import prepare_profile
+from .browser import (
+    BASE_EDGE_ARGUMENTS,
+    STEALTH_SCRIPT,
+    HARVEST_RESULTS_SCRIPT,
+    SCROLL_TO_RESULT_SCRIPT,
+    edge_arguments,
+    blocked_url_patterns
+)
+from .cdp import CdpConnection, CdpPage, EdgeProcess
+from .contexts import SharedBrowser, BrowserContext
+from .driver_resolver import find_edge_binary
+from .metrics import RunMetrics
+from .interval import AdaptiveInterval, page_seconds
+from .terms import create_term_generator, TermPoolExhausted
+from .history import TermHistory
+from .resources import kill_process_tree
+from .janitor import janitor, mark_owner
+
+logger = logging.getLogger(__name__)
+
+# Foca e limpa o campo de pesquisa; retorna false se ele não existir
+FOCUS_SEARCH_BOX_SCRIPT = """
+    var box = document.querySelector('[name="q"]');
+    if (!box) { return false; }
+    box.focus();
+    box.value = '';
+    return true;
+"""
+
+MOUSE_MOVE_SCRIPT = """
+    document.dispatchEvent(new MouseEvent('mousemove', {
+        view: window, bubbles: true, cancelable: true,
+        clientX: arguments[0], clientY: arguments[1]
+    }));
+"""
+
+
+class CdpAutomation:
+    """
+    Backend de automação que controla o Edge diretamente pelo DevTools Protocol.
+
+    Tem a mesma interface pública do EdgeAutomation (start_automation,
+    perform_search, stop_automation), mas cada ação é um comando no websocket
+    do navegador em vez de uma requisição HTTP ao msedgedriver. As versões
+    assíncronas (*_async) permitem que um único loop asyncio conduza várias
+    sessões ao mesmo tempo (veja run_sessions).
+
+    Fora do run_sessions e sem SharedBrowser, a interface síncrona cria um loop
+    próprio por automação, na thread de quem a chama. É assim que o scheduler do
+    painel executa cada sessão (uma thread ou processo com o seu loop); com
+    SharedBrowser, todas as sessões usam o loop do navegador compartilhado.
+
+    Com um SharedBrowser, a sessão roda em um contexto isolado do navegador
+    compartilhado em vez de iniciar o seu próprio Edge.
+    """
+
+    def __init__(self, profile_path: str, device_type: str = 'desktop', config: Optional[Dict[str, Any]] = None,
+                 pool=None, shared_browser: Optional[SharedBrowser] = None):
+        """
+        Args:
+            profile_path: Caminho para o perfil do Edge
+            device_type: Tipo de dispositivo ('desktop' ou 'mobile')
+            config: Configurações adicionais (mesmas chaves do EdgeAutomation)
+            pool: Ignorado; o pool de sessões é exclusivo do backend Selenium
+            shared_browser: Navegador compartilhado onde a sessão abre o seu contexto (opcional)
+        """
+        self.profile_path = profile_path
+        self.device_type = device_type
+        self.browser: Optional[EdgeProcess] = None
+        self.connection: Optional[CdpConnection] = None
+        self.page: Optional[CdpPage] = None
+        self.shared_browser = shared_browser
+        self.context: Optional[BrowserContext] = None
+        self.temp_dir = None
+        self.interval_controller: Optional[AdaptiveInterval] = None
+        self.metrics = RunMetrics()
+        self.round_trips = 0
+        self.is_running = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Token de parada visto por qualquer thread; _stopped é o seu espelho no loop
+        # da execução, que interrompe as pausas
+        self.stop_event = threading.Event()
+        self._stopped: Optional[asyncio.Event] = None
+        self._finished = threading.Event()
+        self._in_progress = False
+        self._worker: Optional[threading.Thread] = None
+        self._run_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop_requested_at: Optional[float] = None
+        self._on_results_page = False
+        # Indica se a pesquisa atual já chegou ao Bing (após o Enter)
+        self._search_submitted = False
+
+        self.config = config or {}
+        self.typing_speed = self.config.get('typing_speed', 'normal')
+        self.click_results = self.config.get('click_results', False)
+        self.click_count = self.config.get('click_count', 2)
+        self.read_time = self.config.get('read_time', 10)
+        self.min_interval = self.config.get('min_interval', MIN_SEARCH_INTERVAL)
+        self.max_interval = self.config.get('max_interval', MAX_SEARCH_INTERVAL)
+        self.adaptive_interval = self.config.get('adaptive_interval', ADAPTIVE_INTERVAL)
+        self.use_custom_terms = self.config.get('use_custom_terms', False)
+        self.custom_terms = self.config.get('custom_terms', [])
+        self.term_seed = self.config.get('term_seed', TERM_SEED)
+        self.use_term_history = self.config.get('use_term_history', TERM_HISTORY_ENABLED)
+        self.term_diversity = self.config.get('term_diversity', TERM_DIVERSITY)
+        self.random_scroll = self.config.get('random_scroll', False)
+        self.dwell_scale = self.config.get('dwell_scale', DWELL_SCALE)
+        self.dwell_budget = dict(DWELL_BUDGET)
+        self.dwell_budget.update(self.config.get('dwell_budget') or {})
+        self.lean_mode = self.config.get('lean_mode', BROWSER_LEAN_MODE)
+        self.headless = self.config.get('headless', BROWSER_HEADLESS)
+        self.disable_images = self.config.get('disable_images', BROWSER_DISABLE_IMAGES)
+        self.search_navigation = self.config.get('search_navigation', SEARCH_NAVIGATION)
+        self.base_url = self.config.get('base_url', SEARCH_BASE_URL).rstrip('/')
+        self.concurrent_reading = self.config.get('concurrent_reading', CONCURRENT_READING)
+        self.max_open_tabs = self.config.get('max_open_tabs', MAX_OPEN_TABS)
+
+    # Ritmo
+
+    def _new_stop_signal(self):
+        """Cria o evento de parada do loop atual, já sinalizado se a parada veio antes"""
+        self._stopped = asyncio.Event()
+        if self.stop_event.is_set():
+            self._stopped.set()
+
+    async def _pause(self, seconds: float):
+        """Pausa deliberada, interrompida imediatamente quando a automação é parada"""
+        if seconds <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._stopped.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _dwell(self, kind: str):
+        low, high = self.dwell_budget.get(kind, (0, 0))
+        await self._pause(random.uniform(low, high) * self.dwell_scale)
+
+    async def _wait_for(self, page: CdpPage, expression: str, timeout: float = WAIT_TIMEOUT) -> Any:
+        return await page.wait_for(expression, timeout, WAIT_POLL_FREQUENCY)
+
+    # Navegador
+
+    def _browser_arguments(self) -> List[str]:
+        profile_name = os.path.basename(self.profile_path)
+        user_agents = MOBILE_USER_AGENTS if self.device_type == 'mobile' else DESKTOP_USER_AGENTS
+        arguments = BASE_EDGE_ARGUMENTS + edge_arguments(self.lean_mode, self.headless)
+        arguments.append(f'--user-agent={random.choice(user_agents)}')
+        if profile_name != "Default":
+            arguments.append(f'--profile-directory={profile_name}')
+        arguments.append('about:blank')
+        return arguments
+
+    async def _prepare_page(self, page: CdpPage):
+        """Aplica o script anti-detecção e o bloqueio de recursos em uma aba"""
+        await page.send('Page.addScriptToEvaluateOnNewDocument', {'source': STEALTH_SCRIPT})
+        patterns = blocked_url_patterns(self.lean_mode, self.disable_images)
+        if patterns is not None:
+            await page.send('Network.enable')
+            await page.send('Network.setBlockedURLs', {'urls': patterns})
+
+    async def _new_page(self) -> CdpPage:
+        """Abre uma nova aba (no contexto da sessão, se houver) pronta para navegar"""
+        if self.context is not None:
+            page = await self.context.new_page()
+        else:
+            page = await CdpPage.create(self.connection)
+        await self._prepare_page(page)
+        return page
+
+    async def _close_page(self, page: CdpPage):
+        if self.context is not None:
+            await self.context.close_page(page)
+        else:
+            await page.close()
+
+    async def _setup_context(self):
+        """Abre a sessão como um contexto isolado do navegador compartilhado"""
+        with self.metrics.time('context_create'):
+            self.context = await self.shared_browser.create_context(self.profile_path, self.device_type)
+        self.connection = self.shared_browser.connection
+        self.page = await self._new_page()
+
+    async def setup_async(self):
+        """Inicia o Edge com o perfil da sessão e abre a página inicial do Bing"""
+        if not self._in_progress:
+            self._new_stop_signal()
+        if self.shared_browser is not None:
+            try:
+                await self._setup_context()
+                with self.metrics.time('page_load'):
+                    await self.page.navigate(self.base_url)
+                    self.metrics.inc('page_loads', kind='homepage')
+            except Exception as e:
+                logger.error(f"Erro ao criar contexto no navegador compartilhado: {str(e)}")
+                await self.stop_automation_async()
+                raise
+            return
+
+        binary = find_edge_binary()
+        if binary is None:
+            raise RuntimeError("Executável do Microsoft Edge não encontrado")
+
+        try:
+            self.temp_dir = os.path.join(tempfile.gettempdir(), f'edge_automation_{uuid.uuid4().hex[:8]}')
+            os.makedirs(self.temp_dir, exist_ok=True)
+            mark_owner(self.temp_dir)
+            with self.metrics.time('profile_copy'):
+                profile_dir = os.path.join(self.temp_dir, os.path.basename(self.profile_path))
+                await asyncio.get_running_loop().run_in_executor(
+                    None, prepare_profile, self.profile_path, profile_dir
+                )
+            logger.info(f"Usando diretório temporário: {self.temp_dir}")
+
+            with self.metrics.time('browser_launch'):
+                self.browser = await EdgeProcess.launch(binary, self.temp_dir, self._browser_arguments())
+                self.connection = await CdpConnection.connect(self.browser.websocket_url)
+
+            # Usa a aba aberta pelo navegador em vez de criar outra
+            targets = await self.connection.send('Target.getTargets')
+            pages = [t for t in targets['targetInfos'] if t['type'] == 'page']
+            if pages:
+                self.page = await CdpPage.attach(self.connection, pages[0]['targetId'])
+            else:
+                self.page = await CdpPage.create(self.connection)
+            await self._prepare_page(self.page)
+
+            with self.metrics.time('page_load'):
+                await self.page.navigate(self.base_url)
+                self.metrics.inc('page_loads', kind='homepage')
+        except Exception as e:
+            logger.error(f"Erro ao configurar navegador: {str(e)}")
+            await self.stop_automation_async()
+            raise
+
+    # Pesquisa
+
+    async def _type_like_human(self, text: str):
+        delay = TYPING_SPEEDS.get(self.typing_speed, 0.05)
+        if delay == 0:
+            await self.page.insert_text(text)
+            return
+        for char in text:
+            await self.page.insert_text(char)
+            await self._pause(random.uniform(delay * 0.8, delay * 1.2))
+
+    async def _simulate_human_behavior(self, page: CdpPage):
+        if self.random_scroll:
+            for _ in range(random.randint(1, 3)):
+                scroll_amount = random.randint(100, 800)
+                await page.evaluate(f"window.scrollBy(0, {scroll_amount})")
+                await self._dwell('scroll')
+                if random.random() < 0.3:
+                    await page.evaluate(f"window.scrollBy(0, -{random.randint(50, scroll_amount)})")
+                    await self._dwell('scroll_up')
+
+        await page.call(MOUSE_MOVE_SCRIPT, random.randint(0, 800), random.randint(0, 600))
+
+    async def _type_and_submit(self, search_term: str) -> bool:
+        """Digita o termo no campo de pesquisa da página atual e envia"""
+        with self.metrics.time('search_box_wait'):
+            await self._wait_for(self.page, f"(function() {{ {FOCUS_SEARCH_BOX_SCRIPT} }})()")
+
+        await self._dwell('before_typing')
+        if not self.is_running:
+            return False
+
+        with self.metrics.time('typing'):
+            await self._type_like_human(search_term)
+        await self._simulate_human_behavior(self.page)
+        if not self.is_running:
+            return False
+
+        loaded = self.connection.expect_event('Page.loadEventFired', self.page.session_id)
+        try:
+            self._search_submitted = True
+            await self.page.press_enter()
+            self.metrics.inc('page_loads', kind='results')
+            with self.metrics.time('results_wait'):
+                await asyncio.wait_for(loaded, WAIT_TIMEOUT)
+                await self._wait_for(self.page, "!!document.getElementById('b_results')")
+        finally:
+            loaded.cancel()
+        return True
+
+    async def _search_direct(self, search_term: str) -> bool:
+        """Navega diretamente para a URL de resultados"""
+        with self.metrics.time('page_load'):
+            self._search_submitted = True
+            await self.page.navigate(f"{self.base_url}/search?q={quote_plus(search_term)}")
+            self.metrics.inc('page_loads', kind='results')
+        with self.metrics.time('results_wait'):
+            await self._wait_for(self.page, "!!document.getElementById('b_results')")
+        return True
+
+    async def _submit_search(self, search_term: str) -> bool:
+        """Envia a pesquisa usando o modo de navegação configurado, com a página inicial como fallback"""
+        mode = self.search_navigation
+        self._search_submitted = False
+        if mode == 'direct' or (mode == 'chain' and self._on_results_page):
+            try:
+                if mode == 'direct':
+                    return await self._search_direct(search_term)
+                return await self._type_and_submit(search_term)
+            except Exception as e:
+                # Depois do envio, repetir pela página inicial faria o Bing receber a pesquisa duas vezes
+                if self._search_submitted:
+                    raise
+                logger.warning(f"Falha ao pesquisar sem a página inicial, usando fallback: {str(e)}")
+                if not self.is_running:
+                    return False
+
+        with self.metrics.time('page_load'):
+            await self.page.navigate(self.base_url)
+            self.metrics.inc('page_loads', kind='homepage')
+        return await self._type_and_submit(search_term)
+
+    async def _read_result(self, href: str, semaphore: asyncio.Semaphore):
+        """Abre um resultado em uma nova aba, simula a leitura e fecha a aba"""
+        async with semaphore:
+            if not self.is_running:
+                return
+            await self.page.call(SCROLL_TO_RESULT_SCRIPT, href)
+            await self._dwell('before_click')
+
+            page = None
+            try:
+                with self.metrics.time('result_click'):
+                    page = await self._new_page()
+                    await page.navigate(href)
+                await self._simulate_human_behavior(page)
+                await self._pause(random.uniform(self.read_time * 0.8, self.read_time * 1.2))
+            except Exception as e:
+                logger.warning(f"Erro ao processar resultado: {str(e)}")
+            finally:
+                if page is not None:
+                    await self._close_page(page)
+
+    async def _click_random_results(self):
+        if not self.click_results:
+            return
+        try:
+            links = await self._wait_for(self.page, f"(function() {{ {HARVEST_RESULTS_SCRIPT} }})()")
+            selected_links = random.sample(links, min(self.click_count, len(links)))
+
+            # Em modo simultâneo as leituras se sobrepõem, limitadas por max_open_tabs
+            limit = max(1, self.max_open_tabs) if self.concurrent_reading else 1
+            semaphore = asyncio.Semaphore(limit)
+            await asyncio.gather(*(self._read_result(href, semaphore) for href in selected_links))
+        except Exception as e:
+            logger.error(f"Erro ao interagir com resultados: {str(e)}")
+
+    async def perform_search_async(self, search_term: str) -> bool:
+        """Realiza uma única pesquisa simulando comportamento humano"""
+        if not self.is_running:
+            return False
+
+        commands_before = self.connection.commands
+        try:
+            if not await self._submit_search(search_term):
+                return False
+            self._on_results_page = True
+
+            if not self.is_running:
+                return False
+            await self._simulate_human_behavior(self.page)
+            if self.is_running:
+                await self._click_random_results()
+            return True
+        except Exception as e:
+            logger.error(f"Erro na pesquisa '{search_term}': {str(e)}")
+            self.metrics.inc('search_failures')
+            self._on_results_page = False
+            return False
+        finally:
+            round_trips = self.connection.commands - commands_before
+            self.round_trips += round_trips
+            self.metrics.observe('round_trips', round_trips)
+
+    async def start_automation_async(self, search_count: int = DEFAULT_SEARCH_COUNT):
+        """Executa a automação completa no loop asyncio atual"""
+        with log_context(profile=os.path.basename(self.profile_path), device=self.device_type):
+            await self._run_searches_async(search_count)
+
+    async def _run_searches_async(self, search_count: int):
+        history = None
+        self._in_progress = True
+        self._worker = threading.current_thread()
+        self._run_loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._finished.clear()
+        self._new_stop_signal()
+        try:
+            if self.stop_event.is_set():
+                return
+            await self.setup_async()
+            # Uma parada pode ter sido solicitada enquanto o navegador iniciava
+            self.is_running = not self.stop_event.is_set()
+
+            searches_completed = 0
+            if self.use_term_history:
+                history = TermHistory(self.profile_path)
+            terms = create_term_generator(
+                diverse=self.term_diversity,
+                extra_terms=self.custom_terms if self.use_custom_terms else None,
+                seed=self.term_seed,
+                exclude=history.contains if history is not None else None,
+                last_used=history.last_used if history is not None else None
+            )
+            self.interval_controller = AdaptiveInterval(
+                self.min_interval, self.max_interval, adaptive=self.adaptive_interval
+            )
+
+            while searches_completed < search_count and self.is_running:
+                try:
+                    search_term = terms.next_term()
+                except TermPoolExhausted:
+                    logger.warning("Todos os termos de pesquisa disponíveis já foram usados")
+                    break
+
+                page_time = page_seconds(self.metrics)
+                succeeded = await self.perform_search_async(search_term)
+                # Pesquisas interrompidas pela parada não contam para o controle de intervalo
+                if self.is_running:
+                    self.interval_controller.record(succeeded, page_seconds(self.metrics) - page_time)
+
+                if succeeded:
+                    searches_completed += 1
+                    self.metrics.inc('searches')
+                    if history is not None:
+                        history.add(search_term)
+                    logger.info(f"Pesquisa {searches_completed}/{search_count} realizada: {search_term}")
+
+                # Com o intervalo adaptativo a pausa vale também após uma falha
+                if (self.is_running and searches_completed < search_count
+                        and (succeeded or self.interval_controller.adaptive)):
+                    delay = self.interval_controller.next_interval()
+                    self.metrics.observe('search_interval_seconds', delay)
+                    await self._pause(delay)
+
+        except asyncio.CancelledError:
+            # Cancelada por stop_automation depois de STOP_TIMEOUT sem responder
+            pass
+        except Exception as e:
+            logger.error(f"Erro durante a automação: {str(e)}")
+        finally:
+            self.is_running = False
+            if history is not None:
+                history.close()
+            try:
+                await self.stop_automation_async()
+            finally:
+                self._in_progress = False
+                self._task = None
+                self._finished.set()
+                if self._stop_requested_at is not None:
+                    self.metrics.observe('stop_latency_seconds', time.perf_counter() - self._stop_requested_at)
+
+    async def stop_automation_async(self):
+        """Fecha a conexão e o navegador e remove o diretório temporário"""
+        teardown_start = time.perf_counter()
+        has_resources = bool(self.browser or self.temp_dir or self.context)
+        self.is_running = False
+        if self._stopped is not None:
+            self._stopped.set()
+
+        # No navegador compartilhado apenas o contexto da sessão é descartado
+        if self.context is not None:
+            context, self.context = self.context, None
+            await context.dispose()
+            self.connection = None
+            self.page = None
+
+        if self.connection is not None:
+            try:
+                await self.connection.send('Browser.close', timeout=5)
+            except Exception:
+                pass
+            await self.connection.close()
+            self.connection = None
+            self.page = None
+
+        if self.browser is not None:
+            await self.browser.terminate()
+            self.browser = None
+
+        temp_dir, self.temp_dir = self.temp_dir, None
+        janitor.schedule(temp_dir)
+
+        if has_resources:
+            self.metrics.observe('phase_seconds', time.perf_counter() - teardown_start, phase='teardown')
+            logger.info("Automação parada com sucesso")
+
+    # Interface síncrona, compatível com o EdgeAutomation
+
+    def _run(self, coroutine):
+        if self.shared_browser is not None:
+            return self.shared_browser.run(coroutine)
+        if self.loop is None or self.loop.is_closed():
+            self.loop = asyncio.new_event_loop()
+        return self.loop.run_until_complete(coroutine)
+
+    def _close_loop(self):
+        if self.loop is not None and not self.loop.is_running():
+            self.loop.close()
+            self.loop = None
+
+    def setup_driver(self):
+        self._run(self.setup_async())
+
+    def perform_search(self, search_term: str) -> bool:
+        return self._run(self.perform_search_async(search_term))
+
+    def start_automation(self, search_count: int = DEFAULT_SEARCH_COUNT):
+        """Inicia o processo de automação, bloqueando até o fim"""
+        try:
+            self._run(self.start_automation_async(search_count))
+        finally:
+            self._close_loop()
+
+    def stop_automation(self):
+        """
+        Para a automação; pode ser chamado de outra thread durante start_automation
+
+        Com uma execução em andamento apenas sinaliza a parada: as pausas são
+        interrompidas e a execução libera os próprios recursos. Se ela não terminar
+        em STOP_TIMEOUT (ex.: presa em um navigate ou aguardando loadEventFired), a
+        tarefa é cancelada, o que interrompe qualquer espera do CDP; se nem assim
+        terminar, o Edge da sessão é encerrado à força.
+        """
+        self.is_running = False
+        if self._stop_requested_at is None:
+            self._stop_requested_at = time.perf_counter()
+        self.stop_event.set()
+
+        loop = self._run_loop
+        if not self._in_progress or loop is None:
+            # Sem execução em andamento; uma execução que ainda vai começar vê o stop_event
+            if self.browser or self.temp_dir or self.context:
+                self._run(self.stop_automation_async())
+                self._close_loop()
+            return
+
+        # A execução em andamento acorda das pausas e libera os recursos ao sair
+        stopped = self._stopped
+        if stopped is not None:
+            loop.call_soon_threadsafe(stopped.set)
+        if self._worker is threading.current_thread():
+            return
+
+        if self._finished.wait(STOP_TIMEOUT):
+            return
+        task = self._task
+        if task is not None:
+            logger.warning("Automação não respondeu à parada a tempo, cancelando a execução")
+            loop.call_soon_threadsafe(task.cancel)
+        if not self._finished.wait(STOP_TIMEOUT):
+            logger.warning("Automação não respondeu ao cancelamento, encerrando o navegador")
+            self._force_close()
+
+    def _force_close(self):
+        """Encerra o Edge da sessão sem passar pelo loop (o navegador compartilhado não é encerrado)"""
+        browser = self.browser
+        if browser is not None:
+            kill_process_tree(browser.pid)
+
+
+async def run_sessions(automations: List[CdpAutomation], search_count: int = DEFAULT_SEARCH_COUNT):
+    """Conduz várias automações ao mesmo tempo em um único loop asyncio"""
+    await asyncio.gather(*(automation.start_automation_async(search_count) for automation in automations))
@@ -0,0 +1,296 @@
+import os
+import uuid
+import random
+import asyncio
+import logging
+import tempfile
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+from ..config.settings import (
+    MOBILE_USER_AGENTS,
+    DESKTOP_USER_AGENTS,
+    MOBILE_DEVICE_METRICS,
+    BROWSER_HEADLESS,
+    BROWSER_LEAN_MODE
+)
+from .snapshot import prepare_profile
+from .browser import BASE_EDGE_ARGUMENTS, edge_arguments
+from .cdp import CdpConnection, CdpPage, EdgeProcess
+from .driver_resolver import find_edge_binary
+from .resources import process_tree_rss_mb
+from .janitor import janitor, mark_owner
+
+logger = logging.getLogger(__name__)
+
+# Campos de Storage.getCookies que não fazem parte de um CookieParam
+_COOKIE_READ_ONLY_FIELDS = ('size', 'session')
+
+
+def _cookie_params(cookies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Converte cookies lidos do navegador no formato aceito por Storage.setCookies"""
+    params = []
+    for cookie in cookies:
+        param = {k: v for k, v in cookie.items() if k not in _COOKIE_READ_ONLY_FIELDS}
+        if cookie.get('session'):
+            param.pop('expires', None)
+        params.append(param)
+    return params
+
+
+class BrowserContext:
+    """Sessão lógica isolada (cookies, cache, armazenamento) dentro do navegador compartilhado"""
+
+    def __init__(self, browser: 'SharedBrowser', context_id: str, profile_path: str,
+                 device_type: str, user_agent: str):
+        self.browser = browser
+        self.context_id = context_id
+        self.profile_path = profile_path
+        self.device_type = device_type
+        self.user_agent = user_agent
+        self.pages: List[CdpPage] = []
+
+    @property
+    def connection(self) -> CdpConnection:
+        return self.browser.connection
+
+    async def new_page(self) -> CdpPage:
+        """Abre uma aba no contexto com o user agent e a emulação do dispositivo"""
+        page = await CdpPage.create(self.connection, browser_context_id=self.context_id)
+        await page.send('Emulation.setUserAgentOverride', {'userAgent': self.user_agent})
+        if self.device_type == 'mobile':
+            await page.send('Emulation.setDeviceMetricsOverride', MOBILE_DEVICE_METRICS)
+            await page.send('Emulation.setTouchEmulationEnabled', {'enabled': True})
+        self.pages.append(page)
+        return page
+
+    async def close_page(self, page: CdpPage):
+        if page in self.pages:
+            self.pages.remove(page)
+        await page.close()
+
+    async def js_heap_mb(self) -> float:
+        """Heap JavaScript em uso somando todas as abas do contexto"""
+        total = 0.0
+        for page in list(self.pages):
+            try:
+                await page.send('Performance.enable')
+                result = await page.send('Performance.getMetrics')
+            except Exception:
+                continue
+            metrics = {m['name']: m['value'] for m in result.get('metrics', [])}
+            total += metrics.get('JSHeapUsedSize', 0)
+        return total / (1024 * 1024)
+
+    async def dispose(self):
+        """Fecha todas as abas e descarta os dados do contexto"""
+        self.pages.clear()
+        try:
+            await self.connection.send('Target.disposeBrowserContext', {'browserContextId': self.context_id})
+        except Exception as e:
+            logger.warning(f"Erro ao descartar contexto {self.context_id}: {str(e)}")
+        self.browser.contexts.pop(self.context_id, None)
+
+
+class SharedBrowser:
+    """
+    Um único processo do Edge compartilhado por várias sessões lógicas.
+
+    Cada sessão (perfil + dispositivo) recebe um contexto de navegação isolado,
+    com os cookies do perfil original e o seu próprio user agent, em vez de um
+    navegador e um user-data-dir inteiros. O navegador e todas as sessões rodam
+    em um loop asyncio dedicado, em uma thread própria.
+    """
+
+    def __init__(self, headless: bool = BROWSER_HEADLESS, lean_mode: bool = BROWSER_LEAN_MODE):
+        self.headless = headless
+        self.lean_mode = lean_mode
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.browser: Optional[EdgeProcess] = None
+        self.connection: Optional[CdpConnection] = None
+        self.temp_dir: Optional[str] = None
+        self.contexts: Dict[str, BrowserContext] = {}
+        self.baseline_rss_mb: Optional[float] = None
+        self._cookies: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    # Loop dedicado
+
+    def start(self):
+        """Inicia o loop e o navegador, se ainda não estiverem em execução"""
+        with self._start_lock:
+            if self.loop is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self.loop.run_forever, name='shared-browser', daemon=True)
+            self._thread.start()
+            try:
+                self.run(self._launch())
+            except Exception:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self._thread.join()
+                self.loop.close()
+                self.loop = None
+                raise
+
+    def run(self, coroutine) -> Any:
+        """Executa uma corrotina no loop do navegador e aguarda o resultado"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    # Navegador
+
+    async def _launch(self):
+        binary = find_edge_binary()
+        if binary is None:
+            raise RuntimeError("Executável do Microsoft Edge não encontrado")
+
+        self.temp_dir = os.path.join(tempfile.gettempdir(), f'edge_automation_shared_{uuid.uuid4().hex[:8]}')
+        os.makedirs(self.temp_dir, exist_ok=True)
+        mark_owner(self.temp_dir)
+        arguments = BASE_EDGE_ARGUMENTS + edge_arguments(self.lean_mode, self.headless) + ['about:blank']
+        self.browser = await EdgeProcess.launch(binary, self.temp_dir, arguments)
+        self.connection = await CdpConnection.connect(self.browser.websocket_url)
+
+        # Custo fixo de um navegador, base para estimar a memória economizada
+        self.baseline_rss_mb = process_tree_rss_mb(self.browser.pid)
+        logger.info(f"Navegador compartilhado iniciado (PID {self.browser.pid})")
+
+    async def export_cookies(self, profile_path: str) -> List[Dict[str, Any]]:
+        """
+        Lê os cookies de um perfil do Edge
+
+        O banco de cookies é criptografado pelo navegador, então o perfil é aberto
+        em uma instância headless temporária e os cookies são lidos via CDP. O
+        resultado fica em cache enquanto o arquivo de cookies não mudar.
+        """
+        cookies_file = os.path.join(profile_path, 'Network', 'Cookies')
+        if not os.path.exists(cookies_file):
+            cookies_file = os.path.join(profile_path, 'Cookies')
+        try:
+            st = os.stat(cookies_file)
+            signature = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            signature = (0, 0)
+
+        cached = self._cookies.get(profile_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        temp_dir = os.path.join(tempfile.gettempdir(), f'edge_automation_{uuid.uuid4().hex[:8]}')
+        profile_name = os.path.basename(profile_path)
+        browser = connection = None
+        try:
+            os.makedirs(temp_dir, exist_ok=True)
+            mark_owner(temp_dir)
+            await asyncio.get_running_loop().run_in_executor(
+                None, prepare_profile, profile_path, os.path.join(temp_dir, profile_name)
+            )
+            arguments = ['--headless=new', '--no-first-run', '--no-default-browser-check', 'about:blank']
+            if profile_name != "Default":
+                arguments.insert(0, f'--profile-directory={profile_name}')
+            binary = find_edge_binary()
+            if binary is None:
+                raise RuntimeError("Executável do Microsoft Edge não encontrado")
+            browser = await EdgeProcess.launch(binary, temp_dir, arguments)
+            connection = await CdpConnection.connect(browser.websocket_url)
+            cookies = (await connection.send('Storage.getCookies'))['cookies']
+        finally:
+            if connection is not None:
+                await connection.close()
+            if browser is not None:
+                await browser.terminate()
+            janitor.schedule(temp_dir)
+
+        self._cookies[profile_path] = (signature, cookies)
+        logger.info(f"{len(cookies)} cookies exportados de {profile_path}")
+        return cookies
+
+    async def create_context(self, profile_path: str, device_type: str = 'desktop') -> BrowserContext:
+        """Cria um contexto isolado com os cookies do perfil e o user agent do dispositivo"""
+        cookies = await self.export_cookies(profile_path)
+        result = await self.connection.send('Target.createBrowserContext', {'disposeOnDetach': True})
+        context_id = result['browserContextId']
+        if cookies:
+            await self.connection.send('Storage.setCookies', {
+                'cookies': _cookie_params(cookies),
+                'browserContextId': context_id
+            })
+
+        user_agents = MOBILE_USER_AGENTS if device_type == 'mobile' else DESKTOP_USER_AGENTS
+        context = BrowserContext(self, context_id, profile_path, device_type, random.choice(user_agents))
+        self.contexts[context_id] = context
+        logger.info(f"Contexto {context_id} criado para {profile_path} ({device_type})")
+        return context
+
+    async def _memory_report(self) -> Dict[str, Any]:
+        rss = process_tree_rss_mb(self.browser.pid) if self.browser is not None else None
+        contexts = {}
+        for context_id, context in list(self.contexts.items()):
+            contexts[context_id] = {
+                'profile': context.profile_path,
+                'device_type': context.device_type,
+                'pages': len(context.pages),
+                'js_heap_mb': await context.js_heap_mb()
+            }
+
+        # Cada contexto a mais evitaria um navegador inteiro com o seu custo fixo
+        saved = None
+        if self.baseline_rss_mb is not None and contexts:
+            saved = self.baseline_rss_mb * (len(contexts) - 1)
+        return {
+            'browser_rss_mb': rss,
+            'baseline_rss_mb': self.baseline_rss_mb,
+            'contexts': contexts,
+            'estimated_saved_mb': saved
+        }
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Memória do navegador compartilhado, por contexto, e a economia estimada"""
+        if self.loop is None:
+            return {'browser_rss_mb': None, 'baseline_rss_mb': None, 'contexts': {}, 'estimated_saved_mb': None}
+        return self.run(self._memory_report())
+
+    async def _close(self):
+        for context in list(self.contexts.values()):
+            await context.dispose()
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+        if self.browser is not None:
+            await self.browser.terminate()
+            self.browser = None
+        janitor.schedule(self.temp_dir)
+        self.temp_dir = None
+
+    def close(self):
+        """Fecha o navegador compartilhado e encerra o loop"""
+        if self.loop is None:
+            return
+        try:
+            self.run(self._close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+            self.loop = None
+
+
+_shared_browser: Optional[SharedBrowser] = None
+_shared_browser_lock = threading.Lock()
+
+
+def get_shared_browser() -> SharedBrowser:
+    """Navegador compartilhado do processo, iniciado no primeiro uso"""
+    global _shared_browser
+    with _shared_browser_lock:
+        if _shared_browser is None:
+            _shared_browser = SharedBrowser()
+        browser = _shared_browser
+    browser.start()
+    return browser
+
+
+def get_running_shared_browser() -> Optional[SharedBrowser]:
+    """Navegador compartilhado, apenas se já estiver em execução"""
+    browser = _shared_browser
+    return browser if browser is not None and browser.loop is not None else None
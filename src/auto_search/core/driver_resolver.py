@@ -0,0 +1,184 @@
+import os
+import re
+import glob
+import shutil
+import logging
+import platform
+import threading
+import subprocess
+from typing import Optional, List
+from ..config.settings import DRIVER_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Variável de ambiente para fixar o binário do msedgedriver sem nenhuma busca
+DRIVER_PATH_ENV = 'EDGE_DRIVER_PATH'
+
+DRIVER_BINARY = 'msedgedriver.exe' if platform.system() == 'Windows' else 'msedgedriver'
+
+_VERSION_PATTERN = re.compile(r'(\d+\.\d+\.\d+\.\d+)')
+
+
+def find_edge_binary() -> Optional[str]:
+    """Localiza o executável do Microsoft Edge instalado"""
+    system = platform.system()
+
+    if system == 'Windows':
+        candidates = [
+            os.path.join(os.environ.get(var, ''), 'Microsoft', 'Edge', 'Application', 'msedge.exe')
+            for var in ('PROGRAMFILES(X86)', 'PROGRAMFILES', 'LOCALAPPDATA')
+        ]
+    elif system == 'Darwin':
+        candidates = ['/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge']
+    else:
+        candidates = [
+            shutil.which(name) or ''
+            for name in ('microsoft-edge', 'microsoft-edge-stable', 'msedge')
+        ]
+
+    for candidate in candidates:
+        if candidate and os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _read_windows_version() -> Optional[str]:
+    """Lê a versão do Edge do registro do Windows"""
+    import winreg
+
+    keys = [
+        (winreg.HKEY_CURRENT_USER, r'Software\Microsoft\Edge\BLBeacon', 'version'),
+        (winreg.HKEY_LOCAL_MACHINE,
+         r'SOFTWARE\WOW6432Node\Microsoft\EdgeUpdate\Clients\{56EB18F8-B008-4CBD-B6D2-8C97FE7E9062}',
+         'pv'),
+    ]
+    for hive, path, name in keys:
+        try:
+            with winreg.OpenKey(hive, path) as key:
+                return winreg.QueryValueEx(key, name)[0]
+        except OSError:
+            continue
+
+    # Último recurso: pastas de versão ao lado do msedge.exe
+    binary = find_edge_binary()
+    if binary:
+        versions = [
+            os.path.basename(p)
+            for p in glob.glob(os.path.join(os.path.dirname(binary), '*.*.*.*'))
+        ]
+        if versions:
+            return max(versions, key=lambda v: tuple(int(x) for x in v.split('.')))
+    return None
+
+
+def detect_edge_version() -> Optional[str]:
+    """Detecta localmente a versão do Edge instalado, sem acesso à rede"""
+    try:
+        if platform.system() == 'Windows':
+            version = _read_windows_version()
+        else:
+            binary = find_edge_binary()
+            if not binary:
+                return None
+            output = subprocess.run(
+                [binary, '--version'], capture_output=True, text=True, timeout=10
+            ).stdout
+            version = output.strip()
+
+        match = _VERSION_PATTERN.search(version or '')
+        return match.group(1) if match else None
+    except Exception as e:
+        logger.warning(f"Não foi possível detectar a versão do Edge: {str(e)}")
+        return None
+
+
+class DriverResolver:
+    """
+    Resolve o caminho do msedgedriver compatível com o Edge instalado.
+
+    Os binários são mantidos em cache no disco por versão principal, de forma
+    que, depois do primeiro download, a resolução funciona sem rede. O resultado
+    é memorizado e calculado apenas uma vez por processo.
+    """
+
+    def __init__(self, cache_dir: str = DRIVER_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._resolved: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _cached_driver(self, major: str) -> str:
+        return os.path.join(self.cache_dir, major, DRIVER_BINARY)
+
+    def _cached_majors(self) -> List[str]:
+        try:
+            majors = [
+                name for name in os.listdir(self.cache_dir)
+                if name.isdigit() and os.path.isfile(self._cached_driver(name))
+            ]
+        except OSError:
+            return []
+        return sorted(majors, key=int, reverse=True)
+
+    def _download(self, version: Optional[str]) -> str:
+        """Baixa o msedgedriver e o guarda no cache local"""
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+        downloaded = EdgeChromiumDriverManager(version).install()
+        major = (version or '').split('.')[0]
+        if not major.isdigit():
+            output = subprocess.run(
+                [downloaded, '--version'], capture_output=True, text=True, timeout=10
+            ).stdout
+            match = _VERSION_PATTERN.search(output)
+            major = match.group(1).split('.')[0] if match else 'unknown'
+
+        target = self._cached_driver(major)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(downloaded, target)
+        logger.info(f"msedgedriver {version or major} armazenado em cache: {target}")
+        return target
+
+    def _resolve(self) -> str:
+        version = detect_edge_version()
+        major = version.split('.')[0] if version else None
+
+        if major and os.path.isfile(self._cached_driver(major)):
+            return self._cached_driver(major)
+
+        # Versão desconhecida: prefere o cache a consultar a rede
+        cached = self._cached_majors()
+        if not major and cached:
+            return self._cached_driver(cached[0])
+
+        try:
+            return self._download(version)
+        except Exception as e:
+            # Sem rede: usa a versão mais recente disponível no cache
+            if not cached:
+                raise
+            logger.warning(
+                f"Falha ao baixar msedgedriver ({str(e)}), usando versão em cache {cached[0]}"
+            )
+            return self._cached_driver(cached[0])
+
+    def resolve(self) -> str:
+        """Retorna o caminho do msedgedriver a ser usado"""
+        override = os.getenv(DRIVER_PATH_ENV)
+        if override:
+            if not os.path.isfile(override):
+                raise FileNotFoundError(f"msedgedriver não encontrado em {override}")
+            return override
+
+        with self._lock:
+            if self._resolved is None or not os.path.isfile(self._resolved):
+                self._resolved = self._resolve()
+                logger.info(f"msedgedriver resolvido: {self._resolved}")
+            return self._resolved
+
+
+_default_resolver = DriverResolver()
+
+
+def resolve_driver_path() -> str:
+    """Resolve o msedgedriver usando o resolvedor padrão do processo"""
+    return _default_resolver.resolve()
@@ -0,0 +1,224 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Dict
+import numpy as np
+from ..config.settings import (
+    EMBEDDING_MODEL,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_DIR,
+    TERM_DIVERSITY_WINDOW
+)
+from .terms import TermGenerator, TermPoolExhausted
+
+logger = logging.getLogger(__name__)
+
+# Índices mantidos em memória por processo (sessões simultâneas compartilham o mmap)
+MAX_CACHED_INDEXES = 4
+
+_models: Dict[str, object] = {}
+_indexes: "OrderedDict[str, EmbeddingIndex]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def pool_hash(terms: List[str], model_name: str) -> str:
+    """Identifica um pool de termos (já ordenado) e o modelo que gerou os seus vetores"""
+    digest = hashlib.sha256(model_name.encode('utf-8') + b'\0')
+    digest.update('\n'.join(terms).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def _get_model(model_name: str):
+    """Carrega o modelo uma única vez por processo, sempre na CPU"""
+    model = _models.get(model_name)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        model = _models[model_name] = SentenceTransformer(model_name, device='cpu')
+    return model
+
+
+def encode_terms(terms: List[str], model_name: str = EMBEDDING_MODEL,
+                 batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    """Calcula os vetores normalizados (float32) dos termos, em lotes"""
+    start = time.perf_counter()
+    vectors = _get_model(model_name).encode(
+        terms,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False
+    )
+    logger.info(f"Embeddings de {len(terms)} termos calculados em {time.perf_counter() - start:.1f}s")
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+class EmbeddingIndex:
+    """Vetores normalizados de um pool de termos, uma linha por termo"""
+
+    def __init__(self, terms: List[str], vectors: np.ndarray):
+        if len(terms) != len(vectors):
+            raise ValueError(f"{len(terms)} termos para {len(vectors)} vetores")
+        self.terms = terms
+        self.vectors = vectors
+        self.rows = {term: row for row, term in enumerate(terms)}
+
+    @property
+    def dimensions(self) -> int:
+        return self.vectors.shape[1]
+
+    @classmethod
+    def load(cls, terms: List[str], model_name: str = EMBEDDING_MODEL, cache_dir: str = EMBEDDING_CACHE_DIR,
+             batch_size: int = EMBEDDING_BATCH_SIZE) -> 'EmbeddingIndex':
+        """
+        Retorna o índice do pool, calculando os vetores apenas na primeira vez
+
+        Os vetores ficam em cache_dir como um .npy nomeado pelo hash do pool e do
+        modelo e são abertos via mmap; o modelo só é carregado se o cache não existir.
+
+        Args:
+            terms: Pool de termos (a ordem não importa)
+            model_name: Modelo do sentence-transformers
+            cache_dir: Diretório do cache de vetores
+            batch_size: Termos por lote no cálculo dos vetores
+        """
+        terms = sorted(set(terms))
+        key = pool_hash(terms, model_name)
+        with _lock:
+            index = _indexes.get(key)
+            if index is not None:
+                _indexes.move_to_end(key)
+                return index
+
+            path = os.path.join(cache_dir, f'{key}.npy')
+            vectors = None
+            if os.path.exists(path):
+                try:
+                    vectors = np.load(path, mmap_mode='r')
+                    if vectors.shape[0] != len(terms):
+                        vectors = None
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Cache de embeddings inválido ({path}): {str(e)}")
+                    vectors = None
+
+            if vectors is None:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Grava em um arquivo temporário para que outro processo nunca leia um cache incompleto
+                temp_path = os.path.join(cache_dir, f'{key}.{os.getpid()}.tmp.npy')
+                np.save(temp_path, encode_terms(terms, model_name, batch_size))
+                os.replace(temp_path, path)
+                vectors = np.load(path, mmap_mode='r')
+
+            index = _indexes[key] = cls(terms, vectors)
+            while len(_indexes) > MAX_CACHED_INDEXES:
+                _indexes.popitem(last=False)
+            return index
+
+
+class CandidateWindow:
+    """
+    Candidatos avaliados a cada escolha, com a menor distância de cosseno de cada
+    um até os termos já usados. Pools maiores que a janela são percorridos aos
+    poucos: cada candidato escolhido é substituído pelo próximo termo da fila.
+    """
+
+    def __init__(self, rows: List[int], vectors: np.ndarray, size: int):
+        self.vectors = vectors
+        self._queue = list(rows)
+        count = min(max(size, 1), len(self._queue))
+        self.rows = np.array([self._queue.pop() for _ in range(count)], dtype=np.int64)
+        self.window = np.ascontiguousarray(vectors[self.rows], dtype=np.float32)
+        self.min_distance = np.full(count, 2.0, dtype=np.float32)
+        self.active = count
+
+    def __len__(self) -> int:
+        return self.active + len(self._queue)
+
+    def update(self, vector: np.ndarray):
+        """Considera um novo termo usado na distância de todos os candidatos"""
+        if self.active:
+            distance = self.min_distance[:self.active]
+            np.minimum(distance, 1.0 - self.window[:self.active] @ vector, out=distance)
+
+    def pop(self, used: np.ndarray) -> int:
+        """Remove e retorna a linha do candidato mais distante dos termos usados"""
+        slot = int(np.argmax(self.min_distance[:self.active]))
+        row = int(self.rows[slot])
+        if self._queue:
+            new_row = self._queue.pop()
+            self.rows[slot] = new_row
+            self.window[slot] = self.vectors[new_row]
+            self.min_distance[slot] = 1.0 - float((used @ self.window[slot]).max()) if len(used) else 2.0
+        else:
+            last = self.active - 1
+            self.rows[slot] = self.rows[last]
+            self.window[slot] = self.window[last]
+            self.min_distance[slot] = self.min_distance[last]
+            self.active = last
+        return row
+
+
+class DiverseTermGenerator(TermGenerator):
+    """
+    Fornece termos únicos escolhendo sempre o mais distante dos já usados.
+
+    A cada sorteio o termo escolhido é o que maximiza a menor distância de
+    cosseno até os termos já usados (max-min). As distâncias dos candidatos são
+    mantidas em um vetor e atualizadas com um único produto matriz-vetor por
+    termo usado, então cada escolha custa O(janela x dimensões) independente do
+    tamanho do pool. A escolha entre termos diretos e gerados segue
+    direct_term_probability, como no TermGenerator.
+    """
+
+    def __init__(self, extra_terms: Optional[List[str]] = None, seed: Optional[int] = None,
+                 index: Optional[EmbeddingIndex] = None, model_name: str = EMBEDDING_MODEL,
+                 window: int = TERM_DIVERSITY_WINDOW, **kwargs):
+        """
+        Args:
+            extra_terms: Termos personalizados adicionados aos termos diretos
+            seed: Semente para tornar a sequência reproduzível (ordem e desempate dos candidatos)
+            index: Índice de embeddings do pool (padrão: EmbeddingIndex.load)
+            model_name: Modelo usado quando o índice não é informado
+            window: Candidatos avaliados a cada escolha (o pool inteiro, se for menor)
+            **kwargs: Demais argumentos do TermGenerator
+        """
+        super().__init__(extra_terms=extra_terms, seed=seed, **kwargs)
+        if index is None:
+            index = EmbeddingIndex.load(self._direct + self._templated, model_name)
+        self.index = index
+
+        # Vetores dos termos já usados, em um buffer que cresce conforme necessário
+        self._used = np.empty((64, index.dimensions), dtype=np.float32)
+        self._used_count = 0
+
+        rows = index.rows
+        self._direct_window = CandidateWindow([rows[term] for term in self._direct], index.vectors, window)
+        self._templated_window = CandidateWindow([rows[term] for term in self._templated], index.vectors, window)
+        self._direct = self._templated = []
+
+    def __len__(self) -> int:
+        return len(self._direct_window) + len(self._templated_window)
+
+    def _mark_used(self, row: int):
+        if self._used_count == len(self._used):
+            self._used = np.concatenate([self._used, np.empty_like(self._used)])
+        vector = self._used[self._used_count]
+        vector[:] = self.index.vectors[row]
+        self._used_count += 1
+        self._direct_window.update(vector)
+        self._templated_window.update(vector)
+
+    def _draw(self) -> str:
+        direct, templated = self._direct_window, self._templated_window
+        if len(direct) and (not len(templated) or self._rng.random() < self.direct_term_probability):
+            window = direct
+        elif len(templated):
+            window = templated
+        else:
+            raise TermPoolExhausted("Todos os termos de pesquisa disponíveis já foram usados")
+        # Termos descartados pelo exclude também contam como usados, afastando os próximos deles
+        row = window.pop(self._used[:self._used_count])
+        self._mark_used(row)
+        return self.index.terms[row]
@@ -0,0 +1,181 @@
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Optional
+from ..config.settings import (
+    TERM_HISTORY_DB,
+    TERM_HISTORY_DAYS,
+    TERM_HISTORY_BLOOM_CAPACITY,
+    TERM_HISTORY_SHARED
+)
+
+logger = logging.getLogger(__name__)
+
+# Chave usada quando o histórico é compartilhado entre todos os perfis
+SHARED_PROFILE_KEY = '*'
+
+# Hashes lidos por vez ao carregar o filtro de Bloom em segundo plano
+LOAD_CHUNK_SIZE = 10000
+
+
+def term_hash(term: str) -> int:
+    """Hash estável de 64 bits (com sinal, compatível com INTEGER do SQLite) de um termo"""
+    digest = hashlib.blake2b(term.strip().lower().encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class BloomFilter:
+    """Filtro de Bloom de tamanho fixo sobre hashes de 64 bits"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: int):
+        # Double hashing a partir das duas metades do hash de 64 bits
+        value &= 0xFFFFFFFFFFFFFFFF
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, value: int):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: int) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+
+class TermHistory:
+    """
+    Histórico persistente dos termos pesquisados por perfil.
+
+    Os termos são guardados como hashes de 64 bits em uma tabela SQLite sem
+    rowid. Um filtro de Bloom em memória, de tamanho fixo, responde a maioria das
+    consultas sem acessar o disco; apenas positivos são confirmados no SQLite.
+
+    O filtro é carregado em segundo plano, com uma conexão própria, para que a
+    execução não espere a leitura de todo o histórico; até lá as consultas vão
+    direto à chave primária do SQLite.
+    """
+
+    def __init__(self, profile_path: str, db_path: str = TERM_HISTORY_DB,
+                 window_days: float = TERM_HISTORY_DAYS,
+                 bloom_capacity: int = TERM_HISTORY_BLOOM_CAPACITY,
+                 shared: bool = TERM_HISTORY_SHARED):
+        """
+        Args:
+            profile_path: Caminho do perfil dono do histórico
+            db_path: Arquivo SQLite do histórico
+            window_days: Termos usados nos últimos N dias são evitados
+            bloom_capacity: Número de termos para o qual o filtro de Bloom é dimensionado
+            shared: Usa um único histórico para todos os perfis
+        """
+        self.profile_key = SHARED_PROFILE_KEY if shared else os.path.abspath(profile_path)
+        self.window = window_days * 86400
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._bloom_lock = threading.Lock()
+        self._bloom_ready = threading.Event()
+        self._closed = threading.Event()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS term_history ('
+            ' profile TEXT NOT NULL,'
+            ' term_hash INTEGER NOT NULL,'
+            ' used_at REAL NOT NULL,'
+            ' PRIMARY KEY (profile, term_hash)'
+            ') WITHOUT ROWID'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS term_history_used_at ON term_history (profile, used_at)'
+        )
+
+        self._bloom = BloomFilter(bloom_capacity)
+        self._loader = threading.Thread(target=self._load, name='term-history-loader', daemon=True)
+        self._loader.start()
+
+    def _cutoff(self) -> float:
+        return time.time() - self.window
+
+    def _load(self):
+        """Remove entradas expiradas e carrega os hashes restantes no filtro de Bloom"""
+        count = 0
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            try:
+                with conn:
+                    conn.execute(
+                        'DELETE FROM term_history WHERE profile = ? AND used_at < ?',
+                        (self.profile_key, self._cutoff())
+                    )
+                cursor = conn.execute(
+                    'SELECT term_hash FROM term_history WHERE profile = ?', (self.profile_key,)
+                )
+                while not self._closed.is_set():
+                    rows = cursor.fetchmany(LOAD_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    with self._bloom_lock:
+                        for (value,) in rows:
+                            self._bloom.add(value)
+                    count += len(rows)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Sem o filtro as consultas continuam indo ao SQLite
+            logger.warning(f"Erro ao carregar o histórico de termos: {str(e)}")
+            return
+
+        if not self._closed.is_set():
+            self._bloom_ready.set()
+            logger.info(f"Histórico de termos carregado: {count} termos recentes")
+
+    def contains(self, term: str) -> bool:
+        """Indica se o termo foi usado dentro da janela configurada"""
+        value = term_hash(term)
+        if self._bloom_ready.is_set() and value not in self._bloom:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM term_history WHERE profile = ? AND term_hash = ? AND used_at >= ?',
+                (self.profile_key, value, self._cutoff())
+            ).fetchone()
+        return row is not None
+
+    __contains__ = contains
+
+    def last_used(self, term: str) -> float:
+        """Momento (epoch) do último uso do termo, ou 0 se ele não está no histórico"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT used_at FROM term_history WHERE profile = ? AND term_hash = ?',
+                (self.profile_key, term_hash(term))
+            ).fetchone()
+        return row[0] if row else 0.0
+
+    def add(self, term: str, used_at: Optional[float] = None):
+        """Registra o uso de um termo"""
+        value = term_hash(term)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO term_history (profile, term_hash, used_at) VALUES (?, ?, ?)',
+                (self.profile_key, value, used_at or time.time())
+            )
+        with self._bloom_lock:
+            self._bloom.add(value)
+
+    def close(self):
+        self._closed.set()
+        self._loader.join(timeout=5)
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,145 @@
+import time
+import random
+import threading
+import statistics
+from collections import deque
+from typing import Optional, Dict, Any
+from ..config.settings import (
+    ADAPTIVE_INTERVAL,
+    ADAPTIVE_INTERVAL_STEP,
+    ADAPTIVE_INTERVAL_BACKOFF,
+    ADAPTIVE_INTERVAL_WINDOW,
+    ADAPTIVE_LATENCY_TOLERANCE,
+    ADAPTIVE_MAX_FAILURE_RATE,
+    INTERVAL_HISTORY_SIZE
+)
+
+# Variação aleatória aplicada ao intervalo adaptativo (0.2 = ±20%)
+INTERVAL_JITTER = 0.2
+
+# Fases que compõem a latência de página de uma pesquisa
+PAGE_PHASES = ('page_load', 'results_wait')
+
+
+def page_seconds(metrics) -> float:
+    """Tempo acumulado da execução carregando páginas e aguardando resultados"""
+    return sum(metrics.histogram_sum('phase_seconds', phase=phase) for phase in PAGE_PHASES)
+
+
+class AdaptiveInterval:
+    """
+    Intervalo entre pesquisas ajustado pelo desempenho observado (AIMD).
+
+    Após cada pesquisa, o resultado e a latência das páginas entram em uma janela
+    móvel. Enquanto as pesquisas dão certo e a latência mediana fica próxima da
+    menor latência recente, o intervalo diminui um passo fixo; uma falha, uma
+    taxa de falhas acima do limite ou a latência subindo além da tolerância
+    multiplicam o intervalo. O intervalo fica sempre entre min_interval e
+    max_interval.
+
+    Com o ajuste desativado os intervalos são sorteados entre os limites, como
+    antes, mas as observações continuam registradas no histórico.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, adaptive: bool = ADAPTIVE_INTERVAL,
+                 step: float = ADAPTIVE_INTERVAL_STEP, backoff: float = ADAPTIVE_INTERVAL_BACKOFF,
+                 window: int = ADAPTIVE_INTERVAL_WINDOW, latency_tolerance: float = ADAPTIVE_LATENCY_TOLERANCE,
+                 max_failure_rate: float = ADAPTIVE_MAX_FAILURE_RATE, history_size: int = INTERVAL_HISTORY_SIZE):
+        """
+        Args:
+            min_interval: Menor intervalo entre pesquisas, em segundos
+            max_interval: Maior intervalo entre pesquisas, em segundos
+            adaptive: Ajusta o intervalo (False mantém o sorteio entre os limites)
+            step: Redução do intervalo após uma pesquisa saudável, em segundos
+            backoff: Fator de aumento do intervalo quando há sinais de sobrecarga
+            window: Pesquisas consideradas na latência mediana e na taxa de falhas
+            latency_tolerance: Razão máxima entre a latência mediana e a menor latência recente
+            max_failure_rate: Taxa de falhas na janela acima da qual o intervalo aumenta
+            history_size: Decisões mantidas no histórico
+        """
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max(min_interval, max_interval)
+        self.adaptive = adaptive
+        self.step = step
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.max_failure_rate = max_failure_rate
+
+        # Começa no meio dos limites, a média do sorteio uniforme
+        self.interval = (self.min_interval + self.max_interval) / 2
+        self.last_delay: Optional[float] = None
+        self.history = deque(maxlen=history_size)
+
+        self._results = deque(maxlen=max(1, window))
+        # Referência de latência: a menor entre as pesquisas bem-sucedidas mais recentes
+        self._baseline = deque(maxlen=max(1, window) * 5)
+        self._lock = threading.Lock()
+
+    def _window_state(self):
+        failures = sum(1 for success, _ in self._results if not success)
+        failure_rate = failures / len(self._results) if self._results else 0.0
+        latencies = [latency for success, latency in self._results if success]
+        latency_p50 = statistics.median(latencies) if latencies else None
+        return failure_rate, latency_p50
+
+    def record(self, success: bool, latency: float):
+        """
+        Registra o resultado de uma pesquisa e ajusta o intervalo
+
+        Args:
+            success: Se a pesquisa foi concluída
+            latency: Tempo gasto carregando páginas e aguardando resultados, em segundos
+        """
+        with self._lock:
+            self._results.append((success, latency))
+            if success and latency > 0:
+                self._baseline.append(latency)
+            failure_rate, latency_p50 = self._window_state()
+            min_latency = min(self._baseline) if self._baseline else None
+            ratio = latency_p50 / min_latency if latency_p50 and min_latency else 1.0
+
+            if not self.adaptive:
+                action = 'fixed'
+            elif not success or failure_rate > self.max_failure_rate or ratio > self.latency_tolerance:
+                action = 'increase'
+                self.interval = min(self.max_interval, max(self.interval * self.backoff, self.interval + self.step))
+            else:
+                action = 'decrease'
+                self.interval = max(self.min_interval, self.interval - self.step)
+
+            self.history.append({
+                'time': time.time(),
+                'action': action,
+                'interval': self.interval,
+                'success': success,
+                'latency': latency,
+                'latency_p50': latency_p50,
+                'latency_ratio': ratio,
+                'failure_rate': failure_rate
+            })
+
+    def next_interval(self) -> float:
+        """Intervalo até a próxima pesquisa, em segundos"""
+        with self._lock:
+            if self.adaptive:
+                delay = self.interval * random.uniform(1 - INTERVAL_JITTER, 1 + INTERVAL_JITTER)
+                delay = min(self.max_interval, max(self.min_interval, delay))
+            else:
+                delay = random.uniform(self.min_interval, self.max_interval)
+            self.last_delay = delay
+            return delay
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            failure_rate, latency_p50 = self._window_state()
+            return {
+                'adaptive': self.adaptive,
+                'interval': self.interval,
+                'last_delay': self.last_delay,
+                'min_interval': self.min_interval,
+                'max_interval': self.max_interval,
+                'failure_rate': failure_rate,
+                'latency_p50': latency_p50,
+                'min_latency': min(self._baseline) if self._baseline else None,
+                'history': list(self.history)
+            }
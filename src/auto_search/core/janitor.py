@@ -0,0 +1,277 @@
+import os
+import json
+import time
+import queue
+import shutil
+import logging
+import tempfile
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+from ..config.settings import (
+    PROFILE_STAGING_DIR,
+    PROFILE_STAGING_QUOTA_MB,
+    JANITOR_INTERVAL,
+    JANITOR_ORPHAN_AGE
+)
+from .snapshot import _get_staging_lock
+from .resources import pid_alive, process_create_time
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Prefixo dos diretórios de sessão criados em tempfile.gettempdir()
+SESSION_DIR_PREFIX = 'edge_automation_'
+
+# Arquivo com o PID do processo dono de um diretório de sessão
+OWNER_MARKER = '.auto_search_owner'
+
+# Tentativas de remoção de um diretório ainda bloqueado pelo navegador
+MAX_ATTEMPTS = 5
+
+
+def mark_owner(session_dir: str):
+    """Registra o processo atual como dono do diretório de sessão"""
+    pid = os.getpid()
+    with open(os.path.join(session_dir, OWNER_MARKER), 'w', encoding='utf-8') as f:
+        json.dump({'pid': pid, 'created': process_create_time(pid)}, f)
+
+
+def _read_owner(session_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(session_dir, OWNER_MARKER), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _freed_bytes(path: str) -> int:
+    """Bytes liberados ao remover a árvore (arquivos com hard links em outro lugar não contam)"""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            if st.st_nlink <= 1:
+                total += st.st_size
+    return total
+
+
+def _tree_size(path: str) -> int:
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+class TempJanitor:
+    """
+    Remove em segundo plano os diretórios temporários das sessões do Edge.
+
+    O encerramento de uma sessão apenas agenda a remoção, sem esperar o navegador
+    liberar os arquivos. Periodicamente (e na inicialização) o janitor também
+    recupera diretórios órfãos, cujo processo dono não existe mais, e mantém os
+    stagings de perfis dentro da cota de disco.
+    """
+
+    def __init__(self, temp_root: Optional[str] = None, staging_root: str = PROFILE_STAGING_DIR,
+                 staging_quota_mb: int = PROFILE_STAGING_QUOTA_MB, interval: float = JANITOR_INTERVAL,
+                 orphan_age: float = JANITOR_ORPHAN_AGE):
+        """
+        Args:
+            temp_root: Diretório onde as sessões são criadas (padrão: tempfile.gettempdir())
+            staging_root: Diretório raiz dos stagings de perfis
+            staging_quota_mb: Espaço máximo dos stagings (0 = sem limite)
+            interval: Intervalo entre varreduras periódicas
+            orphan_age: Idade mínima de um diretório sem marcador para ser considerado órfão
+        """
+        self.temp_root = temp_root or tempfile.gettempdir()
+        self.staging_root = os.path.abspath(staging_root)
+        self.staging_quota_bytes = staging_quota_mb * 1024 * 1024
+        self.interval = interval
+        self.orphan_age = orphan_age
+
+        self.bytes_reclaimed = 0
+        self.dirs_removed = 0
+        self.failures = 0
+        self._queue: "queue.Queue[Tuple[str, int]]" = queue.Queue()
+        self._scheduled = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Inicia a thread de limpeza e agenda a recuperação de órfãos"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='temp-janitor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def schedule(self, path: Optional[str]):
+        """Agenda a remoção de um diretório sem bloquear quem chamou"""
+        if not path:
+            return
+        with self._lock:
+            if path in self._scheduled:
+                return
+            self._scheduled.add(path)
+        self._queue.put((path, 0))
+        self.start()
+
+    def _remove(self, path: str, attempt: int):
+        if not os.path.exists(path):
+            with self._lock:
+                self._scheduled.discard(path)
+            return
+
+        freed = _freed_bytes(path)
+        shutil.rmtree(path, ignore_errors=True)
+        if os.path.exists(path):
+            freed -= _freed_bytes(path)
+            if attempt + 1 < MAX_ATTEMPTS:
+                # Arquivos ainda bloqueados pelo navegador que está saindo; tenta de novo depois
+                threading.Timer(2 ** attempt, self._queue.put, args=((path, attempt + 1),)).start()
+            else:
+                logger.error(f"Não foi possível remover o diretório temporário após {MAX_ATTEMPTS} tentativas: {path}")
+                self.failures += 1
+                with self._lock:
+                    self._scheduled.discard(path)
+        else:
+            self.dirs_removed += 1
+            logger.info(f"Diretório temporário removido: {path} ({freed / (1024 * 1024):.1f} MB)")
+            with self._lock:
+                self._scheduled.discard(path)
+        self._account(freed)
+
+    def _account(self, freed: int):
+        if freed <= 0:
+            return
+        self.bytes_reclaimed += freed
+        METRICS.inc('janitor_bytes_reclaimed', freed)
+
+    def _run(self):
+        self.sweep()
+        next_sweep = time.monotonic() + self.interval
+        while not self._stop.is_set():
+            try:
+                path, attempt = self._queue.get(timeout=max(0.0, min(1.0, next_sweep - time.monotonic())))
+            except queue.Empty:
+                if time.monotonic() >= next_sweep:
+                    self.sweep()
+                    next_sweep = time.monotonic() + self.interval
+                continue
+            try:
+                self._remove(path, attempt)
+            except Exception as e:
+                logger.warning(f"Erro ao remover {path}: {str(e)}")
+
+    def _is_orphan(self, session_dir: str) -> bool:
+        owner = _read_owner(session_dir)
+        if owner is not None:
+            if owner.get('pid') == os.getpid():
+                return False
+            return not pid_alive(owner['pid'], owner.get('created'))
+        # Diretórios sem marcador: considera a idade da última modificação
+        try:
+            return time.time() - os.path.getmtime(session_dir) > self.orphan_age
+        except OSError:
+            return False
+
+    def reclaim_orphans(self) -> List[str]:
+        """Agenda a remoção de diretórios de sessão cujo processo dono não existe mais"""
+        orphans = []
+        try:
+            entries = list(os.scandir(self.temp_root))
+        except OSError as e:
+            logger.warning(f"Erro ao listar {self.temp_root}: {str(e)}")
+            return orphans
+
+        for entry in entries:
+            if not entry.name.startswith(SESSION_DIR_PREFIX) or not entry.is_dir(follow_symlinks=False):
+                continue
+            if os.path.abspath(entry.path) == self.staging_root:
+                continue
+            if self._is_orphan(entry.path):
+                orphans.append(entry.path)
+                self.schedule(entry.path)
+
+        if orphans:
+            logger.info(f"{len(orphans)} diretórios de sessão órfãos agendados para remoção")
+        return orphans
+
+    def enforce_staging_quota(self) -> int:
+        """
+        Remove os stagings usados há mais tempo até caber na cota
+
+        Returns:
+            Bytes liberados
+        """
+        if not self.staging_quota_bytes or not os.path.isdir(self.staging_root):
+            return 0
+
+        stagings = []
+        for entry in os.scandir(self.staging_root):
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            manifest = entry.path + '.json'
+            try:
+                last_used = os.path.getmtime(manifest)
+            except OSError:
+                last_used = 0.0
+            stagings.append((last_used, entry.path, _tree_size(entry.path)))
+
+        total = sum(size for _, _, size in stagings)
+        freed = 0
+        for last_used, path, size in sorted(stagings):
+            if total <= self.staging_quota_bytes:
+                break
+            lock = _get_staging_lock(path)
+            # Stagings em uso (sincronizando ou materializando) ficam para a próxima varredura
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+                try:
+                    os.remove(path + '.json')
+                except OSError:
+                    pass
+            finally:
+                lock.release()
+            total -= size
+            freed += size
+            logger.info(f"Staging removido para respeitar a cota: {path} ({size / (1024 * 1024):.1f} MB)")
+
+        self._account(freed)
+        return freed
+
+    def sweep(self):
+        """Recupera órfãos e aplica a cota de staging"""
+        try:
+            self.reclaim_orphans()
+            self.enforce_staging_quota()
+        except Exception as e:
+            logger.warning(f"Erro na varredura de diretórios temporários: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._scheduled)
+        return {
+            'bytes_reclaimed': self.bytes_reclaimed,
+            'mb_reclaimed': self.bytes_reclaimed / (1024 * 1024),
+            'dirs_removed': self.dirs_removed,
+            'pending': pending,
+            'failures': self.failures
+        }
+
+
+# Janitor compartilhado pelo processo
+janitor = TempJanitor()
@@ -0,0 +1,222 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Tuple, Iterator
+
+# Limites dos buckets (segundos) usados nos histogramas de latência
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Limites dos buckets usados em histogramas de contagens (ex.: chamadas por pesquisa)
+COUNT_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 150, 250)
+
+# Quantis calculados a partir das amostras recentes de cada histograma
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Número de amostras recentes mantidas por histograma
+RESERVOIR_SIZE = 2048
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Histograma acumulativo com buckets fixos e quantis sobre amostras recentes"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._samples = deque(maxlen=RESERVOIR_SIZE)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self._samples.append(value)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.bucket_counts[index] += 1
+                    break
+
+    def quantiles(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {}
+        return {
+            f'p{int(q * 100)}': samples[min(len(samples) - 1, int(q * len(samples)))]
+            for q in QUANTILES
+        }
+
+    def cumulative_buckets(self) -> List[Tuple[float, int]]:
+        with self._lock:
+            total = 0
+            result = []
+            for bound, count in zip(self.buckets, self.bucket_counts):
+                total += count
+                result.append((bound, total))
+            return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'count': self.count, 'sum': self.sum, **self.quantiles()}
+
+
+class MetricsRegistry:
+    """Registro de histogramas, contadores e gauges identificados por nome e labels"""
+
+    def __init__(self, prefix: str = 'auto_search'):
+        self.prefix = prefix
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, LabelKey]:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def describe(self, name: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None):
+        """Registra a descrição de uma métrica para a exposição no formato Prometheus"""
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = buckets
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = self._key(name, labels)
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+            return self._histograms[key]
+
+    def observe(self, name: str, value: float, **labels):
+        self.histogram(name, **labels).observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def histogram_sum(self, name: str, **labels) -> float:
+        """Soma das observações de um histograma, sem criá-lo se ainda não existir"""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+        return histogram.sum if histogram is not None else 0.0
+
+    def set_gauge(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Mede a duração de uma fase da automação"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('phase_seconds', time.perf_counter() - start, phase=phase)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna os valores atuais em formato serializável"""
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = list(self._counters.items())
+            gauges = list(self._gauges.items())
+
+        def label_name(name: str, labels: LabelKey) -> str:
+            if not labels:
+                return name
+            return name + '{' + ','.join(f'{k}={v}' for k, v in labels) + '}'
+
+        return {
+            'histograms': {label_name(n, l): h.snapshot() for (n, l), h in histograms},
+            'counters': {label_name(n, l): v for (n, l), v in counters},
+            'gauges': {label_name(n, l): v for (n, l), v in gauges}
+        }
+
+    def render_prometheus(self) -> str:
+        """Exporta as métricas no formato texto do Prometheus"""
+        with self._lock:
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+
+        def fmt_labels(labels: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+            pairs = list(labels) + list((extra or {}).items())
+            if not pairs:
+                return ''
+            escaped = ('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in pairs)
+            return '{' + ','.join(escaped) + '}'
+
+        lines: List[str] = []
+        declared = set()
+
+        def declare(name: str, metric_type: str, base_name: str):
+            if name in declared:
+                return
+            declared.add(name)
+            if base_name in self._help:
+                lines.append(f'# HELP {name} {self._help[base_name]}')
+            lines.append(f'# TYPE {name} {metric_type}')
+
+        for (name, labels), histogram in histograms:
+            full_name = f'{self.prefix}_{name}'
+            declare(full_name, 'histogram', name)
+            for bound, count in histogram.cumulative_buckets():
+                lines.append(f'{full_name}_bucket{fmt_labels(labels, {"le": repr(bound)})} {count}')
+            lines.append(f'{full_name}_bucket{fmt_labels(labels, {"le": "+Inf"})} {histogram.count}')
+            lines.append(f'{full_name}_sum{fmt_labels(labels)} {histogram.sum}')
+            lines.append(f'{full_name}_count{fmt_labels(labels)} {histogram.count}')
+
+        for (name, labels), histogram in histograms:
+            full_name = f'{self.prefix}_{name}_quantile'
+            declare(full_name, 'gauge', name)
+            for quantile, value in histogram.quantiles().items():
+                q = str(int(quantile[1:]) / 100)
+                lines.append(f'{full_name}{fmt_labels(labels, {"quantile": q})} {value}')
+
+        for (name, labels), value in counters:
+            full_name = f'{self.prefix}_{name}_total'
+            declare(full_name, 'counter', name)
+            lines.append(f'{full_name}{fmt_labels(labels)} {value}')
+
+        for (name, labels), value in gauges:
+            full_name = f'{self.prefix}_{name}'
+            declare(full_name, 'gauge', name)
+            lines.append(f'{full_name}{fmt_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+class RunMetrics(MetricsRegistry):
+    """Métricas de uma execução, replicadas no registro global do processo"""
+
+    def __init__(self, parent: Optional[MetricsRegistry] = None):
+        super().__init__()
+        self.parent = METRICS if parent is None else parent
+        self._buckets = self.parent._buckets
+
+    def observe(self, name: str, value: float, **labels):
+        super().observe(name, value, **labels)
+        self.parent.observe(name, value, **labels)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        super().inc(name, value, **labels)
+        self.parent.inc(name, value, **labels)
+
+
+# Registro global do processo
+METRICS = MetricsRegistry()
+METRICS.describe('phase_seconds', 'Duração das fases da automação em segundos')
+METRICS.describe('searches', 'Pesquisas concluídas')
+METRICS.describe('search_failures', 'Pesquisas que falharam')
+METRICS.describe('page_loads', 'Páginas carregadas por tipo (homepage, results)')
+METRICS.describe('round_trips', 'Chamadas ao msedgedriver por pesquisa', buckets=COUNT_BUCKETS)
+METRICS.describe('stop_latency_seconds', 'Tempo entre o pedido de parada e a saída da automação')
+METRICS.describe('session_recycles', 'Navegadores reciclados pelo watchdog por motivo (memory, unresponsive)')
+METRICS.describe('search_interval_seconds', 'Intervalos usados entre pesquisas')
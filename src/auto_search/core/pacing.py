@@ -0,0 +1,108 @@
+import time
+import random
+import logging
+import threading
+from typing import Optional, Dict, Any, Tuple, Callable
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from ..config.settings import DWELL_BUDGET, WAIT_TIMEOUT, WAIT_POLL_FREQUENCY
+
+logger = logging.getLogger(__name__)
+
+
+class AutomationCancelled(Exception):
+    """A automação foi parada durante uma espera"""
+
+
+class Pacer:
+    """
+    Controla o ritmo da automação.
+
+    As esperas usam sinais reais de prontidão da página (readyState, presença de
+    elementos, abertura de janelas) em vez de pausas fixas. Pausas deliberadas,
+    que simulam um usuário, vêm de um orçamento configurável separado.
+
+    Todas as esperas observam o evento de cancelamento: pausas terminam assim que
+    ele é sinalizado e esperas por sinais da página levantam AutomationCancelled
+    na próxima verificação.
+    """
+
+    def __init__(self, driver, dwell_budget: Optional[Dict[str, Tuple[float, float]]] = None,
+                 dwell_scale: float = 1.0, timeout: float = WAIT_TIMEOUT,
+                 poll_frequency: float = WAIT_POLL_FREQUENCY,
+                 cancel_event: Optional[threading.Event] = None):
+        """
+        Args:
+            driver: WebDriver em uso
+            dwell_budget: Intervalos (min, max) em segundos para cada tipo de pausa
+            dwell_scale: Multiplicador aplicado a todas as pausas deliberadas
+            timeout: Tempo máximo de espera pelos sinais de prontidão
+            poll_frequency: Intervalo entre verificações dos sinais
+            cancel_event: Evento que interrompe as esperas quando sinalizado
+        """
+        self.driver = driver
+        self.dwell_budget = dict(DWELL_BUDGET)
+        if dwell_budget:
+            self.dwell_budget.update(dwell_budget)
+        self.dwell_scale = dwell_scale
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.cancel_event = cancel_event or threading.Event()
+
+        self.started_at = time.monotonic()
+        self.wait_time = 0.0
+        self.dwell_time = 0.0
+
+    def check_cancelled(self):
+        """Levanta AutomationCancelled se a parada foi solicitada"""
+        if self.cancel_event.is_set():
+            raise AutomationCancelled("Automação parada")
+
+    def wait_for(self, condition: Callable, timeout: Optional[float] = None) -> Any:
+        """Aguarda até que a condição seja satisfeita, contabilizando o tempo de espera"""
+        def cancellable(driver):
+            self.check_cancelled()
+            return condition(driver)
+
+        self.check_cancelled()
+        start = time.monotonic()
+        try:
+            return WebDriverWait(
+                self.driver, timeout or self.timeout, poll_frequency=self.poll_frequency
+            ).until(cancellable)
+        finally:
+            self.wait_time += time.monotonic() - start
+
+    def wait_page_ready(self, timeout: Optional[float] = None):
+        """Aguarda o carregamento completo do documento"""
+        self.wait_for(
+            lambda driver: driver.execute_script('return document.readyState') == 'complete',
+            timeout
+        )
+
+    def wait_element(self, locator: Tuple[str, str], timeout: Optional[float] = None):
+        """Aguarda a presença de um elemento e o retorna"""
+        return self.wait_for(EC.presence_of_element_located(locator), timeout)
+
+    def pause(self, seconds: float):
+        """Pausa deliberada com duração explícita, encerrada antes se a automação for parada"""
+        if seconds <= 0:
+            return
+        start = time.monotonic()
+        self.cancel_event.wait(seconds)
+        self.dwell_time += time.monotonic() - start
+
+    def dwell(self, kind: str):
+        """Pausa deliberada sorteada do orçamento configurado para o tipo informado"""
+        low, high = self.dwell_budget.get(kind, (0, 0))
+        self.pause(random.uniform(low, high) * self.dwell_scale)
+
+    def summary(self) -> Dict[str, float]:
+        """Resumo do tempo gasto aguardando, em pausas e com o navegador ocupado"""
+        total = time.monotonic() - self.started_at
+        return {
+            'total': total,
+            'waiting': self.wait_time,
+            'dwell': self.dwell_time,
+            'busy': max(0.0, total - self.wait_time - self.dwell_time)
+        }
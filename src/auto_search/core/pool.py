@@ -0,0 +1,202 @@
+import time
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from ..config.settings import DRIVER_POOL_TTL, DRIVER_POOL_MAX_IDLE
+from .janitor import janitor
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, ...]
+
+
+class PooledSession:
+    """Sessão do Edge (driver + diretório temporário) gerenciada pelo pool"""
+
+    def __init__(self, key: PoolKey, driver, temp_dir: Optional[str] = None):
+        self.key = key
+        self.driver = driver
+        self.temp_dir = temp_dir
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.leases = 0
+
+    def is_alive(self) -> bool:
+        """Verifica se o navegador ainda responde"""
+        try:
+            return bool(self.driver.window_handles)
+        except Exception:
+            return False
+
+    def reset(self):
+        """Restaura a sessão para um estado limpo entre empréstimos"""
+        handles = self.driver.window_handles
+        main_window = handles[0]
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(main_window)
+        self.driver.get('about:blank')
+
+    def close(self):
+        """Fecha o navegador e remove o diretório temporário"""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Erro ao fechar navegador do pool: {str(e)}")
+        janitor.schedule(self.temp_dir)
+
+
+class DriverPool:
+    """
+    Pool de sessões do Edge aquecidas, indexadas por (perfil, tipo de dispositivo).
+
+    Sessões devolvidas ao pool são resetadas e ficam ociosas até serem
+    emprestadas novamente ou expirarem após o TTL.
+    """
+
+    def __init__(self, ttl: float = DRIVER_POOL_TTL, max_idle: int = DRIVER_POOL_MAX_IDLE):
+        """
+        Args:
+            ttl: Tempo máximo (segundos) que uma sessão pode ficar ociosa
+            max_idle: Número máximo de sessões ociosas mantidas no pool
+        """
+        self.ttl = ttl
+        self.max_idle = max_idle
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._idle: Dict[PoolKey, List[PooledSession]] = {}
+        self._leased = 0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+
+        self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper.start()
+
+    def acquire(self, key: PoolKey, factory: Callable[[], PooledSession]) -> PooledSession:
+        """
+        Empresta uma sessão para a chave informada, criando uma nova se necessário
+
+        Args:
+            key: Chave da sessão (perfil, tipo de dispositivo)
+            factory: Função que cria uma nova sessão em caso de miss
+        """
+        while True:
+            with self._lock:
+                sessions = self._idle.get(key)
+                session = sessions.pop() if sessions else None
+                if sessions is not None and not sessions:
+                    del self._idle[key]
+
+            if session is None:
+                break
+
+            if session.is_alive():
+                with self._lock:
+                    self.hits += 1
+                    self._leased += 1
+                session.leases += 1
+                logger.info(f"Sessão reutilizada do pool ({self._format_stats()})")
+                return session
+
+            # Sessão morta enquanto estava ociosa
+            self._discard(session)
+
+        session = factory()
+        with self._lock:
+            self.misses += 1
+            self._leased += 1
+        session.leases += 1
+        logger.info(f"Nova sessão criada para o pool ({self._format_stats()})")
+        return session
+
+    def release(self, session: PooledSession, reusable: bool = True):
+        """Devolve uma sessão ao pool ou a descarta se não puder ser reutilizada"""
+        with self._lock:
+            self._leased = max(0, self._leased - 1)
+
+        if not reusable or self._closed.is_set():
+            self._discard(session)
+            return
+
+        try:
+            session.reset()
+        except Exception as e:
+            logger.warning(f"Erro ao resetar sessão do pool, descartando: {str(e)}")
+            self._discard(session)
+            return
+
+        session.last_used = time.monotonic()
+        with self._lock:
+            idle_count = sum(len(s) for s in self._idle.values())
+            if idle_count < self.max_idle:
+                self._idle.setdefault(session.key, []).append(session)
+                return
+
+        self._discard(session)
+
+    def evict_expired(self) -> int:
+        """Remove sessões ociosas há mais tempo que o TTL"""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key in list(self._idle):
+                keep = []
+                for session in self._idle[key]:
+                    if now - session.last_used > self.ttl:
+                        expired.append(session)
+                    else:
+                        keep.append(session)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+
+        for session in expired:
+            self._discard(session)
+
+        if expired:
+            logger.info(f"{len(expired)} sessões ociosas removidas do pool")
+        return len(expired)
+
+    def _discard(self, session: PooledSession):
+        with self._lock:
+            self.evictions += 1
+        session.close()
+
+    def _reap_loop(self):
+        interval = max(1.0, self.ttl / 2)
+        while not self._closed.wait(interval):
+            try:
+                self.evict_expired()
+            except Exception as e:
+                logger.error(f"Erro ao limpar sessões do pool: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna as estatísticas do pool"""
+        with self._lock:
+            idle = sum(len(s) for s in self._idle.values())
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'idle': idle,
+                'leased': self._leased,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+    def _format_stats(self) -> str:
+        stats = self.stats()
+        return f"hits={stats['hits']}, misses={stats['misses']}, ociosas={stats['idle']}"
+
+    def close_all(self):
+        """Fecha todas as sessões ociosas e encerra o pool"""
+        self._closed.set()
+        with self._lock:
+            sessions = [s for group in self._idle.values() for s in group]
+            self._idle.clear()
+        for session in sessions:
+            self._discard(session)
@@ -1,73 +1,172 @@
 import os
 import json
 import logging
-from typing import List, Dict
+import threading
+from typing import List, Dict, Optional, Tuple, Callable, Any
 from ..config.settings import EDGE_PROFILES_PATH
 
 logger = logging.getLogger(__name__)
 
-def detect_edge_profiles() -> List[Dict[str, str]]:
-    """Detecta os perfis do Microsoft Edge instalados no sistema."""
-    profiles = []
-    
-    try:
-        if not os.path.exists(EDGE_PROFILES_PATH):
-            logger.warning(f"Caminho de perfis não encontrado: {EDGE_PROFILES_PATH}")
+# Campos do Preferences de onde o nome do perfil pode ser lido, em ordem de prioridade
+_NAME_FIELDS = (
+    ('profile', 'name'),
+    ('account_info', 'full_name'),
+    ('gaia_info', 'full_name'),
+)
+
+
+def _field_value(value: Any, field: str) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        return value.get(field)
+    return None
+
+
+def _read_profile_name(preferences_path: str) -> Optional[str]:
+    """Lê o nome do perfil do arquivo Preferences"""
+    with open(preferences_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    for key, field in _NAME_FIELDS:
+        if key in data:
+            return _field_value(data[key], field)
+    return None
+
+
+class ProfileRegistry:
+    """
+    Cache dos perfis do Edge detectados no sistema.
+
+    Cada perfil é indexado pelo mtime/tamanho do seu Preferences, então apenas
+    perfis alterados são lidos novamente. A lista fica em memória e é servida a
+    todos os clientes; um observador opcional avisa quando ela muda.
+    """
+
+    def __init__(self, base_path: str = EDGE_PROFILES_PATH):
+        self.base_path = base_path
+        self._cache: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+        self._profiles: Optional[List[Dict[str, str]]] = None
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    def _scan(self) -> List[Dict[str, str]]:
+        profiles = []
+
+        if not os.path.exists(self.base_path):
+            logger.warning(f"Caminho de perfis não encontrado: {self.base_path}")
+            self._cache.clear()
             return profiles
-            
+
+        seen = set()
         # Procura por pastas de perfil (Default, Profile 1, Profile 2, etc.)
-        for item in os.listdir(EDGE_PROFILES_PATH):
-            profile_path = os.path.join(EDGE_PROFILES_PATH, item)
-            preferences_path = os.path.join(profile_path, 'Preferences')
-            
-            # Verifica se é um diretório de perfil válido
-            if not os.path.isdir(profile_path):
+        for entry in os.scandir(self.base_path):
+            item = entry.name
+            if not entry.is_dir():
                 continue
-                
+
+            profile_path = os.path.join(self.base_path, item)
+            preferences_path = os.path.join(profile_path, 'Preferences')
+
             # Verifica se tem o arquivo Preferences
-            if not os.path.exists(preferences_path):
+            try:
+                st = os.stat(preferences_path)
+            except OSError:
                 continue
-                
+
+            seen.add(item)
+            signature = (st.st_mtime_ns, st.st_size)
+            cached = self._cache.get(item)
+            if cached and cached[0] == signature:
+                profiles.append(cached[1])
+                continue
+
             try:
-                with open(preferences_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
-                # Tenta obter o nome do perfil de diferentes locais no arquivo
-                profile_name = None
-                if 'profile' in data:
-                    profile_name = data['profile'].get('name')
-                elif 'account_info' in data:
-                    profile_name = data['account_info'].get('full_name')
-                elif 'gaia_info' in data:
-                    profile_name = data['gaia_info'].get('full_name')
-                
+                profile_name = _read_profile_name(preferences_path)
+
                 # Se não encontrou nome, usa o nome da pasta
                 if not profile_name:
                     profile_name = "Perfil " + item if item != "Default" else "Perfil Padrão"
-                    
-                # Adiciona o perfil à lista com o caminho completo
-                profiles.append({
+
+                profile = {
                     'name': profile_name,
                     'path': profile_path,
                     'profile_id': item
-                })
+                }
+                self._cache[item] = (signature, profile)
+                profiles.append(profile)
                 logger.info(f"Perfil detectado: {profile_name} em {profile_path}")
-                
+
             except json.JSONDecodeError as e:
                 logger.error(f"Erro ao ler arquivo de preferências do perfil {item}: {str(e)}")
                 continue
             except Exception as e:
                 logger.error(f"Erro ao processar perfil {item}: {str(e)}")
                 continue
-    
-    except Exception as e:
-        logger.error(f"Erro ao detectar perfis: {str(e)}")
-        
-    return sorted(profiles, key=lambda x: x['name'])
+
+        # Descarta do cache perfis que foram removidos
+        for item in list(self._cache):
+            if item not in seen:
+                del self._cache[item]
+
+        return sorted(profiles, key=lambda x: x['name'])
+
+    def refresh(self) -> bool:
+        """
+        Atualiza a lista relendo apenas perfis alterados
+
+        Returns:
+            True se a lista de perfis mudou
+        """
+        with self._lock:
+            try:
+                profiles = self._scan()
+            except Exception as e:
+                logger.error(f"Erro ao detectar perfis: {str(e)}")
+                profiles = []
+            changed = profiles != self._profiles
+            self._profiles = profiles
+            return changed
+
+    def get_profiles(self) -> List[Dict[str, str]]:
+        """Retorna a lista de perfis em memória, carregando-a na primeira chamada"""
+        if self._profiles is None:
+            self.refresh()
+        return list(self._profiles)
+
+    def start_watcher(self, interval: float, on_change: Callable[[List[Dict[str, str]]], None]):
+        """Verifica periodicamente os perfis e chama on_change quando a lista muda"""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop_watching.wait(interval):
+                if self.refresh():
+                    try:
+                        on_change(self.get_profiles())
+                    except Exception as e:
+                        logger.warning(f"Erro ao notificar alteração de perfis: {str(e)}")
+
+        self._watcher = threading.Thread(target=watch, name='profile-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop_watching.set()
+
+
+# Registro compartilhado pelo processo
+profile_registry = ProfileRegistry()
+
+
+def detect_edge_profiles() -> List[Dict[str, str]]:
+    """Detecta os perfis do Microsoft Edge instalados no sistema."""
+    profile_registry.refresh()
+    return profile_registry.get_profiles()
 
 def get_profile_path(profile_id: str) -> str:
     """Retorna o caminho completo para um perfil específico."""
     if not profile_id:
         return EDGE_PROFILES_PATH
-        
-    return os.path.join(EDGE_PROFILES_PATH, profile_id) 
\ No newline at end of file
+
+    return os.path.join(EDGE_PROFILES_PATH, profile_id)
@@ -0,0 +1,157 @@
+import os
+import signal
+import logging
+import platform
+import subprocess
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def psutil_available() -> bool:
+    try:
+        import psutil  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def process_tree_rss_mb(pid: int) -> Optional[float]:
+    """
+    Soma a memória residente (MB) de um processo e de todos os seus descendentes
+
+    Requer o psutil; retorna None se ele não estiver instalado ou o processo não existir.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+
+    rss = 0
+    for process in processes:
+        try:
+            rss += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return rss / (1024 * 1024)
+
+
+def driver_memory_mb(driver) -> Optional[float]:
+    """Memória usada pelo msedgedriver e pelos processos do navegador iniciados por ele"""
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    return process_tree_rss_mb(pid)
+
+
+def _child_pids(pid: int) -> List[int]:
+    """Descendentes de um processo via pgrep, usado quando o psutil não está instalado"""
+    children = []
+    pending = [pid]
+    while pending:
+        try:
+            result = subprocess.run(['pgrep', '-P', str(pending.pop())],
+                                    capture_output=True, text=True, timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            break
+        for line in result.stdout.split():
+            if line.isdigit():
+                children.append(int(line))
+                pending.append(int(line))
+    return children
+
+
+def kill_process_tree(pid: int):
+    """Encerra à força um processo e todos os seus descendentes"""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = root.children(recursive=True) + [root]
+        except psutil.Error:
+            return
+        for process in processes:
+            try:
+                process.kill()
+            except psutil.Error:
+                continue
+        return
+
+    if platform.system() == 'Windows':
+        try:
+            subprocess.run(['taskkill', '/T', '/F', '/PID', str(pid)],
+                           capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"Erro ao encerrar processo {pid}: {str(e)}")
+        return
+
+    # Descendentes primeiro, para que não sejam reparentados antes de serem encontrados
+    for target in reversed([pid] + _child_pids(pid)):
+        try:
+            os.kill(target, signal.SIGKILL)
+        except OSError as e:
+            logger.debug(f"Erro ao encerrar processo {target}: {str(e)}")
+
+
+def process_create_time(pid: int) -> Optional[float]:
+    """Momento de criação do processo (requer psutil), usado para detectar PIDs reutilizados"""
+    try:
+        import psutil
+        return psutil.Process(pid).create_time()
+    except Exception:
+        return None
+
+
+def pid_alive(pid: int, create_time: Optional[float] = None) -> bool:
+    """
+    Verifica se um processo ainda existe
+
+    Se create_time for informado (e o psutil estiver disponível), um processo
+    diferente que reaproveitou o mesmo PID é considerado morto.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            if create_time is not None and abs(process.create_time() - create_time) > 1:
+                return False
+            return process.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    if platform.system() == 'Windows':
+        # os.kill no Windows encerra o processo, então a consulta usa a API do sistema
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
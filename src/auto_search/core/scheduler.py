@@ -0,0 +1,280 @@
+import time
+import uuid
+import heapq
+import logging
+import threading
+import itertools
+import multiprocessing
+from typing import Optional, Dict, Any, List, Callable
+from ..config.settings import (
+    PARALLEL_SEARCHES,
+    MAX_CONCURRENT_SEARCHES,
+    SCHEDULER_USE_PROCESSES,
+    DEFAULT_SEARCH_COUNT
+)
+from ..config.logging_config import log_context, listen_queue, setup_worker_logging
+from .backends import create_automation
+from .pool import DriverPool
+
+logger = logging.getLogger(__name__)
+
+
+def _run_job_in_process(job_id: str, profile_path: str, device_type: str, config: Dict[str, Any],
+                        search_count: int, stop_event, log_queue):
+    """Executa uma automação isolada em um processo separado"""
+    # Os logs do processo filho são gravados pelo processo principal
+    setup_worker_logging(log_queue)
+    automation = create_automation(profile_path=profile_path, device_type=device_type, config=config)
+
+    def watch_stop():
+        stop_event.wait()
+        automation.stop_automation()
+
+    threading.Thread(target=watch_stop, daemon=True).start()
+    with log_context(run_id=job_id):
+        automation.start_automation(search_count)
+
+
+class AutomationJob:
+    """Execução de automação enfileirada no scheduler"""
+
+    def __init__(self, profile_path: str, device_type: str, config: Dict[str, Any],
+                 search_count: int, priority: int = 0):
+        self.job_id = uuid.uuid4().hex[:8]
+        self.profile_path = profile_path
+        self.device_type = device_type
+        self.config = config
+        self.search_count = search_count
+        self.priority = priority
+        self.status = 'queued'
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+        self.automation = None
+        self.stop_event = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.job_id,
+            'profile': self.profile_path,
+            'device_type': self.device_type,
+            'priority': self.priority,
+            'status': self.status,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class AutomationScheduler:
+    """
+    Fila de execuções de automação com limite de concorrência.
+
+    Jobs com maior prioridade são executados primeiro e um mesmo perfil nunca é
+    usado por duas execuções simultâneas. Opcionalmente cada navegador roda em um
+    processo próprio para isolamento.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, use_processes: bool = SCHEDULER_USE_PROCESSES,
+                 pool: Optional[DriverPool] = None,
+                 on_event: Optional[Callable[[str, AutomationJob], None]] = None):
+        """
+        Args:
+            max_workers: Número máximo de automações simultâneas
+            use_processes: Executa cada automação em um processo separado
+            pool: Pool de sessões usado no modo com threads
+            on_event: Callback chamado com ('queued' | 'started' | 'finished', job)
+        """
+        if max_workers is None:
+            max_workers = MAX_CONCURRENT_SEARCHES if PARALLEL_SEARCHES else 1
+        self.max_workers = max(1, max_workers)
+        self.use_processes = use_processes
+        self.pool = None if use_processes else pool
+        self.on_event = on_event
+
+        self._queue: List[tuple] = []
+        self._counter = itertools.count()
+        self._running: Dict[str, AutomationJob] = {}
+        self._completed = 0
+        self._condition = threading.Condition()
+        self._shutdown = False
+
+        if use_processes:
+            self._mp_context = multiprocessing.get_context('spawn')
+            self._log_queue = self._mp_context.Queue()
+            listen_queue(self._log_queue)
+
+        self._workers = []
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f'automation-worker-{index}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, profile_path: str, device_type: str = 'desktop', config: Optional[Dict[str, Any]] = None,
+               search_count: int = DEFAULT_SEARCH_COUNT, priority: int = 0) -> AutomationJob:
+        """Enfileira uma nova execução e retorna o job criado"""
+        job = AutomationJob(profile_path, device_type, config or {}, search_count, priority)
+        with self._condition:
+            heapq.heappush(self._queue, (-priority, next(self._counter), job))
+
+        logger.info(f"Job {job.job_id} enfileirado (prioridade {priority}, fila: {self.queue_depth()})")
+        self._emit('queued', job)
+
+        with self._condition:
+            self._condition.notify()
+        return job
+
+    def _busy_profiles(self) -> set:
+        return {job.profile_path for job in self._running.values()}
+
+    def _next_job(self) -> Optional[AutomationJob]:
+        """Retira o job de maior prioridade cujo perfil não está em uso"""
+        busy = self._busy_profiles()
+        for entry in sorted(self._queue):
+            job = entry[2]
+            if job.profile_path not in busy:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                return job
+        return None
+
+    def _worker_loop(self):
+        while True:
+            with self._condition:
+                job = None
+                while not self._shutdown:
+                    job = self._next_job()
+                    if job is not None:
+                        break
+                    self._condition.wait()
+                if self._shutdown:
+                    return
+                job.status = 'running'
+                job.started_at = time.time()
+                self._running[job.job_id] = job
+
+            self._emit('started', job)
+            try:
+                with log_context(run_id=job.job_id):
+                    if self.use_processes:
+                        self._run_in_process(job)
+                    else:
+                        self._run_in_thread(job)
+                if job.status == 'running':
+                    job.status = 'done'
+            except Exception as e:
+                job.status = 'failed'
+                job.error = str(e)
+                logger.error(f"Erro no job {job.job_id}: {str(e)}")
+            finally:
+                job.finished_at = time.time()
+                with self._condition:
+                    self._running.pop(job.job_id, None)
+                    self._completed += 1
+                    # Libera o perfil para outros jobs na fila
+                    self._condition.notify_all()
+                self._emit('finished', job)
+
+    def _run_in_thread(self, job: AutomationJob):
+        job.automation = create_automation(
+            profile_path=job.profile_path,
+            device_type=job.device_type,
+            config=job.config,
+            pool=self.pool
+        )
+        if job.status == 'cancelled':
+            return
+        job.automation.start_automation(job.search_count)
+
+    def _run_in_process(self, job: AutomationJob):
+        job.stop_event = self._mp_context.Event()
+        if job.status == 'cancelled':
+            return
+        process = self._mp_context.Process(
+            target=_run_job_in_process,
+            args=(job.job_id, job.profile_path, job.device_type, job.config, job.search_count,
+                  job.stop_event, self._log_queue),
+            daemon=True
+        )
+        process.start()
+        process.join()
+        if process.exitcode:
+            raise RuntimeError(f"Processo da automação terminou com código {process.exitcode}")
+
+    def _emit(self, event: str, job: AutomationJob):
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event, job)
+        except Exception as e:
+            logger.warning(f"Erro ao notificar evento '{event}' do job {job.job_id}: {str(e)}")
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancela um job enfileirado ou interrompe um job em execução"""
+        cancelled = job = None
+        with self._condition:
+            for entry in self._queue:
+                if entry[2].job_id == job_id:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    entry[2].status = 'cancelled'
+                    cancelled = entry[2]
+                    break
+            else:
+                job = self._running.get(job_id)
+
+        if cancelled is not None:
+            self._emit('finished', cancelled)
+            return True
+        if job is None:
+            return False
+
+        job.status = 'cancelled'
+        if job.stop_event is not None:
+            job.stop_event.set()
+        elif job.automation is not None:
+            # stop_automation pode aguardar até STOP_TIMEOUT e encerrar o navegador à força;
+            # em uma thread própria, quem cancela (ex.: o handler do Socket.IO) não fica bloqueado
+            threading.Thread(
+                target=job.automation.stop_automation, name=f'automation-stop-{job.job_id}', daemon=True
+            ).start()
+        return True
+
+    def stop_all(self):
+        """Cancela todos os jobs enfileirados e em execução, sem aguardar o fim das execuções"""
+        with self._condition:
+            job_ids = [entry[2].job_id for entry in self._queue] + list(self._running)
+        for job_id in job_ids:
+            self.cancel(job_id)
+
+    def running_jobs(self) -> List[AutomationJob]:
+        """Retorna os jobs em execução"""
+        with self._condition:
+            return list(self._running.values())
+
+    def queue_depth(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna o estado atual da fila"""
+        with self._condition:
+            return {
+                'queued': len(self._queue),
+                'running': len(self._running),
+                'completed': self._completed,
+                'max_workers': self.max_workers,
+                'use_processes': self.use_processes,
+                'jobs': [job.to_dict() for job in self._running.values()]
+                        + [entry[2].to_dict() for entry in sorted(self._queue)]
+            }
+
+    def shutdown(self):
+        """Interrompe tudo e encerra os workers"""
+        self.stop_all()
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
@@ -0,0 +1,320 @@
+import os
+import json
+import errno
+import shutil
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Iterator, Tuple
+from ..config.settings import PROFILE_STAGING_DIR, PROFILE_SKIP_DIRS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ioctl do Linux para clonar um arquivo (reflink) em sistemas com copy-on-write
+_FICLONE = 0x40049409
+
+# Erros que indicam que o método de clonagem não é suportado no destino
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP),
+}
+
+# Conteúdo que o Edge nunca altera no lugar (tabelas do LevelDB e pacotes de
+# extensões são substituídos por arquivos novos) e que pode ser compartilhado via
+# hard link. Todo o resto, como os bancos SQLite (Cookies, History, Login Data,
+# Web Data) e seus journals, é gravado no lugar e recebe uma cópia por sessão.
+_SHAREABLE_SUFFIXES = ('.ldb', '.sst')
+_SHAREABLE_DIRS = {'Extensions'}
+
+# Um lock por diretório de staging para evitar sincronizações simultâneas
+_staging_locks: Dict[str, threading.Lock] = {}
+_staging_locks_guard = threading.Lock()
+
+
+def _get_staging_lock(staging_dir: str) -> threading.Lock:
+    with _staging_locks_guard:
+        if staging_dir not in _staging_locks:
+            _staging_locks[staging_dir] = threading.Lock()
+        return _staging_locks[staging_dir]
+
+
+def _reflink(src: str, dst: str):
+    """Clona um arquivo via reflink (copy-on-write)"""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, 'reflink não suportado nesta plataforma')
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        raise
+
+
+def is_shareable(rel: str) -> bool:
+    """Verifica se um arquivo do perfil pode ser compartilhado entre sessões via hard link"""
+    if rel.endswith(_SHAREABLE_SUFFIXES):
+        return True
+    return rel.split(os.sep, 1)[0] in _SHAREABLE_DIRS
+
+
+class ProfileSnapshot:
+    """
+    Mantém uma cópia persistente (staging) de um perfil do Edge e a materializa
+    em diretórios de sessão sem copiar o perfil inteiro a cada execução.
+
+    O staging é sincronizado de forma incremental usando um manifesto com
+    mtime/tamanho de cada arquivo. As sessões recebem reflinks dos arquivos do
+    staging; sem reflink, apenas o conteúdo imutável é compartilhado via hard
+    link e os arquivos que o Edge grava no lugar são copiados, para que sessões
+    simultâneas do mesmo perfil nunca escrevam nos mesmos bancos de dados.
+    """
+
+    # Ordem de preferência dos métodos de materialização
+    CLONE_METHODS = ('reflink', 'hardlink', 'copy')
+
+    def __init__(self, profile_path: str, staging_root: str = PROFILE_STAGING_DIR,
+                 skip_dirs: Optional[List[str]] = None):
+        """
+        Args:
+            profile_path: Caminho para o perfil original do Edge
+            staging_root: Diretório raiz onde os stagings são mantidos
+            skip_dirs: Nomes de diretórios ignorados na sincronização (caches)
+        """
+        self.profile_path = os.path.abspath(profile_path)
+        self.profile_name = os.path.basename(self.profile_path.rstrip(os.sep))
+        self.skip_dirs = set(PROFILE_SKIP_DIRS if skip_dirs is None else skip_dirs)
+
+        key = hashlib.sha1(self.profile_path.encode('utf-8')).hexdigest()[:12]
+        self.staging_dir = os.path.join(staging_root, key)
+        self.manifest_path = os.path.join(staging_root, f'{key}.json')
+        self._clone_methods = list(self.CLONE_METHODS)
+
+    def _load_manifest(self) -> Dict[str, List[int]]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, List[int]]):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _walk_source(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Percorre o perfil original ignorando caches e links simbólicos"""
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                entries = list(os.scandir(os.path.join(self.profile_path, rel_dir)))
+            except OSError as e:
+                logger.debug(f"Não foi possível listar {rel_dir or self.profile_path}: {str(e)}")
+                continue
+
+            for entry in entries:
+                rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir():
+                        if entry.name not in self.skip_dirs:
+                            stack.append(rel)
+                    elif entry.is_file():
+                        yield rel, entry.stat()
+                except OSError as e:
+                    logger.debug(f"Erro ao inspecionar {rel}: {str(e)}")
+
+    def _staged_file_matches(self, rel: str, entry: List[int]) -> bool:
+        """Verifica se o arquivo no staging continua igual ao registrado no manifesto"""
+        try:
+            st = os.stat(os.path.join(self.staging_dir, rel))
+        except OSError:
+            return False
+        return st.st_mtime_ns == entry[2] and st.st_size == entry[3]
+
+    def _stage_file(self, rel: str) -> os.stat_result:
+        """Copia um arquivo do perfil para o staging de forma atômica"""
+        src = os.path.join(self.profile_path, rel)
+        dst = os.path.join(self.staging_dir, rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+
+        # Copia para um arquivo temporário e substitui, assim sessões que ainda
+        # usam hard links para a versão anterior não são afetadas
+        tmp_path = dst + '.snapshot_tmp'
+        try:
+            shutil.copy2(src, tmp_path)
+            os.replace(tmp_path, dst)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return os.stat(dst)
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Sincroniza o staging com o perfil original, copiando apenas o que mudou
+
+        Returns:
+            Contadores de arquivos copiados, inalterados, removidos e com falha
+        """
+        stats = {'copied': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+
+        with _get_staging_lock(self.staging_dir):
+            os.makedirs(self.staging_dir, exist_ok=True)
+            manifest = self._load_manifest()
+            new_manifest: Dict[str, List[int]] = {}
+
+            seen = set()
+
+            for rel, st in self._walk_source():
+                seen.add(rel)
+                entry = manifest.get(rel)
+                if (entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size
+                        and self._staged_file_matches(rel, entry)):
+                    new_manifest[rel] = entry
+                    stats['unchanged'] += 1
+                    continue
+
+                try:
+                    staged = self._stage_file(rel)
+                except OSError as e:
+                    # Arquivos bloqueados pelo Edge em execução caem aqui
+                    logger.debug(f"Erro ao sincronizar {rel}: {str(e)}")
+                    stats['failed'] += 1
+                    # Mantém a última cópia boa (ex.: Cookies bloqueado pelo Edge aberto);
+                    # a entrada antiga não bate com o original, então a cópia é tentada de novo
+                    if entry and self._staged_file_matches(rel, entry):
+                        new_manifest[rel] = entry
+                    continue
+
+                new_manifest[rel] = [st.st_mtime_ns, st.st_size, staged.st_mtime_ns, staged.st_size]
+                stats['copied'] += 1
+
+            # Remove do staging o que não existe mais no perfil original
+            for rel in manifest.keys() - seen:
+                try:
+                    os.remove(os.path.join(self.staging_dir, rel))
+                except OSError:
+                    pass
+                stats['removed'] += 1
+
+            self._save_manifest(new_manifest)
+
+        if stats['failed']:
+            logger.warning(f"{stats['failed']} arquivos do perfil não puderam ser sincronizados")
+
+        return stats
+
+    def _clone_file(self, src: str, dst: str, shareable: bool = True):
+        """
+        Materializa um arquivo usando o método mais barato disponível
+
+        Args:
+            src: Arquivo no staging
+            dst: Arquivo na sessão
+            shareable: Se o arquivo pode ser um hard link (False para arquivos gravados no lugar)
+        """
+        for method in list(self._clone_methods):
+            if method == 'hardlink' and not shareable:
+                continue
+            try:
+                if method == 'reflink':
+                    _reflink(src, dst)
+                elif method == 'hardlink':
+                    os.link(src, dst)
+                else:
+                    shutil.copy2(src, dst)
+                return
+            except OSError as e:
+                if method == 'copy' or e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                # Método não suportado neste sistema de arquivos, não tenta novamente
+                self._clone_methods.remove(method)
+
+    def materialize(self, target_dir: str) -> str:
+        """
+        Cria a árvore do perfil em um diretório de sessão a partir do staging
+
+        Returns:
+            Método de clonagem utilizado ('reflink', 'hardlink' ou 'copy')
+        """
+        with _get_staging_lock(self.staging_dir):
+            manifest = self._load_manifest()
+            created_dirs = set()
+
+            for rel in manifest:
+                dst = os.path.join(target_dir, rel)
+                parent = os.path.dirname(dst)
+                if parent not in created_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    created_dirs.add(parent)
+
+                try:
+                    self._clone_file(os.path.join(self.staging_dir, rel), dst, is_shareable(rel))
+                except OSError as e:
+                    logger.debug(f"Erro ao materializar {rel}: {str(e)}")
+
+        return self._clone_methods[0]
+
+
+# Arquivos/pastas copiados diretamente quando o snapshot não pode ser usado
+IMPORTANT_PROFILE_ITEMS = [
+    'Preferences',
+    'Cookies',
+    'Login Data',
+    'Web Data',
+    'Network',
+    'Local Storage',
+    'Extension State',
+    'Sync Data',
+    'Sessions',
+    'Accounts'
+]
+
+
+def prepare_profile(profile_path: str, temp_profile_dir: str):
+    """Prepara o perfil da sessão a partir do snapshot persistente do perfil original"""
+    try:
+        snapshot = ProfileSnapshot(profile_path)
+        stats = snapshot.sync()
+        method = snapshot.materialize(temp_profile_dir)
+        logger.info(
+            f"Perfil preparado via {method}: {stats['copied']} copiados, "
+            f"{stats['unchanged']} inalterados, {stats['removed']} removidos"
+        )
+        return
+    except Exception as e:
+        logger.warning(f"Erro ao usar snapshot do perfil, tentando copiar arquivos importantes: {str(e)}")
+
+    try:
+        os.makedirs(temp_profile_dir, exist_ok=True)
+        for item in IMPORTANT_PROFILE_ITEMS:
+            src = os.path.join(profile_path, item)
+            dst = os.path.join(temp_profile_dir, item)
+            if os.path.exists(src):
+                try:
+                    if os.path.isfile(src):
+                        shutil.copy2(src, dst)
+                    elif os.path.isdir(src):
+                        shutil.copytree(src, dst, dirs_exist_ok=True)
+                except Exception as e:
+                    logger.warning(f"Erro ao copiar {item}: {str(e)}")
+                    continue
+    except Exception as e:
+        logger.warning(f"Erro ao copiar arquivos do perfil: {str(e)}")
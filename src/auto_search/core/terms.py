@@ -0,0 +1,165 @@
+import random
+import logging
+from functools import lru_cache
+from itertools import combinations
+from typing import Optional, List, Tuple, Iterator, Callable
+from ..config.settings import (
+    SEARCH_TERMS,
+    QUESTION_TEMPLATES,
+    SEARCH_TOPICS,
+    DIRECT_TERM_PROBABILITY
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TermPoolExhausted(Exception):
+    """Todos os termos de pesquisa disponíveis já foram usados"""
+
+
+@lru_cache(maxsize=8)
+def expand_templates(templates: Tuple[str, ...], topics: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Gera todas as combinações de templates e tópicos, sem repetições
+
+    Templates com mais de um espaço são simétricos ("diferença entre A e B" é a
+    mesma pergunta que "diferença entre B e A"), então cada conjunto de tópicos
+    entra uma única vez, na ordem da lista de tópicos.
+    """
+    expanded = {}
+    for template in templates:
+        slots = template.count("{}")
+        if slots == 0:
+            expanded[template] = None
+            continue
+        for combination in combinations(topics, slots):
+            expanded[template.format(*combination)] = None
+    return tuple(expanded)
+
+
+class TermGenerator:
+    """
+    Fornece termos de pesquisa únicos em O(1) por sorteio.
+
+    O espaço completo (termos diretos + templates x tópicos) é montado uma única
+    vez e embaralhado sem reposição, então nenhum termo se repete e não há laço
+    de rejeição. Termos diretos são escolhidos com a probabilidade configurada
+    enquanto houver algum disponível.
+    """
+
+    def __init__(self, extra_terms: Optional[List[str]] = None, seed: Optional[int] = None,
+                 direct_term_probability: float = DIRECT_TERM_PROBABILITY,
+                 base_terms: Optional[List[str]] = None,
+                 templates: Optional[List[str]] = None,
+                 topics: Optional[List[str]] = None,
+                 exclude: Optional[Callable[[str], bool]] = None,
+                 last_used: Optional[Callable[[str], float]] = None):
+        """
+        Args:
+            extra_terms: Termos personalizados adicionados aos termos diretos
+            seed: Semente para tornar a sequência reproduzível
+            direct_term_probability: Chance de sortear um termo direto
+            base_terms: Termos diretos (padrão: SEARCH_TERMS)
+            templates: Templates de perguntas (padrão: QUESTION_TEMPLATES)
+            topics: Tópicos usados nos templates (padrão: SEARCH_TOPICS)
+            exclude: Função que indica termos a evitar (ex.: histórico de execuções anteriores)
+            last_used: Momento do último uso de um termo evitado (ex.: TermHistory.last_used);
+                quando o pool se esgota, os termos evitados voltam, dos menos recentes aos mais recentes
+        """
+        self._rng = random.Random(seed)
+        self.direct_term_probability = direct_term_probability
+        self.exclude = exclude
+        self.last_used = last_used
+        # Termos descartados pelo exclude, reaproveitados quando o pool se esgota
+        self._skipped: List[str] = []
+        self._reusing = False
+
+        base_terms = SEARCH_TERMS if base_terms is None else base_terms
+        direct = list(dict.fromkeys(list(base_terms) + list(extra_terms or [])))
+        direct_set = set(direct)
+
+        generated = expand_templates(
+            tuple(QUESTION_TEMPLATES if templates is None else templates),
+            tuple(SEARCH_TOPICS if topics is None else topics)
+        )
+        templated = [term for term in generated if term not in direct_set]
+
+        self._rng.shuffle(direct)
+        self._rng.shuffle(templated)
+        self._direct = direct
+        self._templated = templated
+
+    def __len__(self) -> int:
+        """Número de termos ainda disponíveis"""
+        return len(self._direct) + len(self._templated)
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        try:
+            return self.next_term()
+        except TermPoolExhausted:
+            raise StopIteration
+
+    def _draw(self) -> str:
+        if self._direct and (not self._templated or self._rng.random() < self.direct_term_probability):
+            return self._direct.pop()
+        if self._templated:
+            return self._templated.pop()
+        raise TermPoolExhausted("Todos os termos de pesquisa disponíveis já foram usados")
+
+    def _reuse(self) -> str:
+        """Retorna o termo evitado usado há mais tempo"""
+        if not self._skipped:
+            raise TermPoolExhausted("Todos os termos de pesquisa disponíveis já foram usados")
+        if not self._reusing:
+            self._reusing = True
+            logger.warning(
+                f"Termos inéditos esgotados, reaproveitando {len(self._skipped)} termos do histórico "
+                f"a partir dos usados há mais tempo"
+            )
+            if self.last_used is not None:
+                self._skipped.sort(key=self.last_used, reverse=True)
+            else:
+                self._skipped.reverse()
+        return self._skipped.pop()
+
+    def next_term(self) -> str:
+        """
+        Retorna o próximo termo inédito
+
+        Se todos os termos inéditos já foram usados, reaproveita os evitados pelo
+        exclude, começando pelos usados há mais tempo.
+        """
+        if self._reusing:
+            return self._reuse()
+        # Termos excluídos são descartados do pool, então o laço nunca repete um termo
+        try:
+            term = self._draw()
+            while self.exclude is not None and self.exclude(term):
+                self._skipped.append(term)
+                term = self._draw()
+        except TermPoolExhausted:
+            return self._reuse()
+        return term
+
+
+def create_term_generator(diverse: bool = False, **kwargs) -> TermGenerator:
+    """
+    Cria o gerador de termos da execução
+
+    Com diverse, usa o DiverseTermGenerator (embeddings); se numpy ou
+    sentence-transformers não estiverem instalados, ou se o modelo falhar ao
+    carregar, volta ao sorteio aleatório.
+    """
+    if diverse:
+        try:
+            from .embeddings import DiverseTermGenerator
+            return DiverseTermGenerator(**kwargs)
+        except ImportError as e:
+            logger.warning(f"Seleção diversa de termos indisponível ({str(e)}), usando sorteio aleatório")
+        except Exception as e:
+            # Falhas ao carregar o modelo ou calcular embeddings não devem impedir a automação
+            logger.warning(f"Erro ao preparar a seleção diversa de termos ({str(e)}), usando sorteio aleatório")
+    return TermGenerator(**kwargs)
@@ -0,0 +1,168 @@
+import time
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable
+from ..config.settings import WATCHDOG_INTERVAL, WATCHDOG_PING_TIMEOUT
+from .resources import driver_memory_mb, psutil_available
+
+logger = logging.getLogger(__name__)
+
+# Callback chamado com (tipo do problema, descrição) quando uma sessão precisa ser reciclada
+TroubleCallback = Callable[[str, str], None]
+
+
+class WatchedSession:
+    """Estado de uma sessão monitorada pelo watchdog"""
+
+    def __init__(self, name: str, driver, memory_limit_mb: int, on_trouble: TroubleCallback):
+        self.name = name
+        self.driver = driver
+        self.memory_limit_mb = memory_limit_mb
+        self.on_trouble = on_trouble
+        self.memory_mb: Optional[float] = None
+        self.ping_ms: Optional[float] = None
+        self.ping_error: Optional[str] = None
+        self.ping_started: Optional[float] = None
+        self.ping_thread: Optional[threading.Thread] = None
+        self.reported: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'memory_mb': self.memory_mb,
+            'memory_limit_mb': self.memory_limit_mb,
+            'ping_ms': self.ping_ms,
+            'trouble': self.reported
+        }
+
+
+class BrowserWatchdog:
+    """
+    Monitora a memória e a responsividade dos navegadores em execução.
+
+    Uma única thread amostra periodicamente o RSS da árvore de processos
+    msedgedriver/Edge de cada sessão e envia um ping ao WebDriver em uma thread
+    auxiliar. Acima do limite de memória, ou sem resposta ao ping dentro do
+    timeout, o dono da sessão é avisado para reciclá-la. Cada sessão é
+    reportada no máximo uma vez.
+    """
+
+    def __init__(self, interval: float = WATCHDOG_INTERVAL, ping_timeout: float = WATCHDOG_PING_TIMEOUT):
+        """
+        Args:
+            interval: Intervalo entre amostras (0 desativa o watchdog)
+            ping_timeout: Tempo máximo de resposta ao ping do WebDriver (0 desativa o ping)
+        """
+        self.interval = interval
+        self.ping_timeout = ping_timeout
+        self.reports = 0
+        self._sessions: Dict[Any, WatchedSession] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._warned_psutil = False
+
+    def watch(self, key: Any, driver, memory_limit_mb: int, on_trouble: TroubleCallback, name: str = ''):
+        """Passa a monitorar o navegador de uma sessão (substitui o anterior com a mesma chave)"""
+        if not self.interval:
+            return
+        if memory_limit_mb and not self._warned_psutil and not psutil_available():
+            self._warned_psutil = True
+            logger.warning(
+                f"psutil não instalado: o limite de memória de {memory_limit_mb} MB não será "
+                f"aplicado (instale com pip install psutil)"
+            )
+        with self._lock:
+            self._sessions[key] = WatchedSession(name, driver, memory_limit_mb, on_trouble)
+        self.start()
+
+    def unwatch(self, key: Any):
+        with self._lock:
+            self._sessions.pop(key, None)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='browser-watchdog', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check_all()
+
+    def check_all(self):
+        """Amostra todas as sessões monitoradas"""
+        with self._lock:
+            sessions = list(self._sessions.items())
+        for key, session in sessions:
+            try:
+                self._check(key, session)
+            except Exception as e:
+                logger.warning(f"Erro ao verificar o navegador {session.name}: {str(e)}")
+
+    def _check(self, key: Any, session: WatchedSession):
+        if session.reported is not None:
+            return
+
+        session.memory_mb = driver_memory_mb(session.driver)
+        if (session.memory_limit_mb and session.memory_mb is not None
+                and session.memory_mb > session.memory_limit_mb):
+            self._report(key, session, 'memory',
+                         f"memória do navegador em {session.memory_mb:.0f} MB "
+                         f"(limite de {session.memory_limit_mb} MB)")
+            return
+
+        if not self.ping_timeout:
+            return
+        if session.ping_thread is not None and session.ping_thread.is_alive():
+            # O ping anterior ainda não voltou
+            if time.monotonic() - session.ping_started > self.ping_timeout:
+                self._report(key, session, 'unresponsive',
+                             f"WebDriver sem resposta há mais de {self.ping_timeout:g}s")
+            return
+        if session.ping_error is not None:
+            self._report(key, session, 'unresponsive', f"falha no ping do WebDriver: {session.ping_error}")
+            return
+
+        session.ping_started = time.monotonic()
+        session.ping_thread = threading.Thread(target=self._ping, args=(session,),
+                                               name='browser-watchdog-ping', daemon=True)
+        session.ping_thread.start()
+
+    def _ping(self, session: WatchedSession):
+        # Usa o execute original para que o ping não entre na contagem de round trips
+        execute = getattr(session.driver, '_untracked_execute', None) or session.driver.execute
+        try:
+            execute('getTitle')
+            session.ping_ms = (time.monotonic() - session.ping_started) * 1000
+        except Exception as e:
+            session.ping_error = str(e)
+
+    def _report(self, key: Any, session: WatchedSession, kind: str, reason: str):
+        with self._lock:
+            # A sessão pode ter sido encerrada durante a verificação
+            if self._sessions.get(key) is not session:
+                return
+        session.reported = kind
+        self.reports += 1
+        logger.warning(f"Watchdog: navegador {session.name} precisa ser reciclado ({reason})")
+        session.on_trouble(kind, reason)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = [session.to_dict() for session in self._sessions.values()]
+        return {
+            'enabled': bool(self.interval),
+            'interval': self.interval,
+            'ping_timeout': self.ping_timeout,
+            'reports': self.reports,
+            'sessions': sessions
+        }
+
+
+# Watchdog compartilhado pelo processo
+watchdog = BrowserWatchdog()
@@ -1,45 +1,166 @@
 import os
-from flask import Flask, render_template, request, jsonify
-from flask_socketio import SocketIO
+from flask import Flask, render_template, request, jsonify, Response
+from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_cors import CORS
-from ..core.automation import EdgeAutomation
-from ..core.profiles import detect_edge_profiles
+from ..core.pool import DriverPool
+from ..core.scheduler import AutomationScheduler
+from ..core.metrics import METRICS
+from ..core.janitor import janitor
+from ..core.watchdog import watchdog
+from ..core.profiles import detect_edge_profiles, profile_registry
+from .events import EventStream, run_room
 from ..config.settings import (
     SECRET_KEY,
     DEFAULT_SEARCH_COUNT,
     MIN_SEARCH_INTERVAL,
-    MAX_SEARCH_INTERVAL
+    MAX_SEARCH_INTERVAL,
+    ADAPTIVE_INTERVAL,
+    DRIVER_POOL_ENABLED,
+    STATS_INTERVAL,
+    AUTO_DETECT_PROFILES,
+    PROFILE_REFRESH_INTERVAL,
+    CONCURRENT_READING,
+    TERM_DIVERSITY,
+    SHARED_BROWSER
 )
-from threading import Thread
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = SECRET_KEY
 CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
-# Dicionário para armazenar instâncias ativas de automação
-active_automations = {}
+# Pool de sessões do Edge reaproveitadas entre execuções
+driver_pool = DriverPool() if DRIVER_POOL_ENABLED else None
+
+# Eventos das execuções, entregues em lotes apenas aos clientes de cada execução
+events = EventStream(socketio)
+
+def handle_job_event(event, job):
+    """Repassa os eventos do scheduler para os clientes da execução"""
+    stats = scheduler.stats()
+    if event == 'queued':
+        events.publish(job.job_id, 'log', f'Automação {job.job_id} enfileirada (fila: {stats["queued"]})')
+    elif event == 'started':
+        events.publish(job.job_id, 'automation_started')
+        events.publish(job.job_id, 'log', f'Automação {job.job_id} iniciada')
+    elif event == 'finished':
+        if job.error:
+            events.publish(job.job_id, 'log', f'Erro durante a automação {job.job_id}: {job.error}')
+        else:
+            events.publish(job.job_id, 'log', f'Automação {job.job_id} finalizada ({job.status})')
+        events.publish(job.job_id, 'automation_stopped', {'status': job.status})
+    events.publish_global('queue_updated', {key: stats[key] for key in ('queued', 'running', 'max_workers')})
+
+# Scheduler que limita o número de automações simultâneas
+scheduler = AutomationScheduler(pool=driver_pool, on_event=handle_job_event)
 
 @app.route('/')
 def index():
     """Renderiza a página principal"""
     return render_template('index.html')
 
+@app.route('/api/pool')
+def pool_stats():
+    """Retorna as estatísticas do pool de sessões"""
+    if driver_pool is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **driver_pool.stats()})
+
+def shared_browser_stats():
+    """Memória do navegador compartilhado por contexto, se ele estiver em execução"""
+    if not SHARED_BROWSER:
+        return None
+    from ..core.contexts import get_running_shared_browser
+    browser = get_running_shared_browser()
+    return browser.memory_report() if browser is not None else None
+
+@app.route('/api/browser')
+def browser_stats():
+    """Retorna o uso de memória do navegador compartilhado"""
+    report = shared_browser_stats()
+    if report is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **report})
+
+@app.route('/api/scheduler')
+def scheduler_stats():
+    """Retorna o estado da fila de automações"""
+    return jsonify(scheduler.stats())
+
+@app.route('/metrics')
+def metrics():
+    """Exporta as métricas de latência no formato do Prometheus"""
+    return Response(METRICS.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def collect_stats():
+    """Monta o resumo de estatísticas enviado aos clientes"""
+    runs = {}
+    pacing = {}
+    for job in scheduler.running_jobs():
+        if job.automation is not None:
+            runs[job.job_id] = job.automation.metrics.snapshot()
+            # Histórico do intervalo entre pesquisas escolhido pelo controle adaptativo
+            if job.automation.interval_controller is not None:
+                pacing[job.job_id] = job.automation.interval_controller.stats()
+    return {
+        'process': METRICS.snapshot(),
+        'runs': runs,
+        'pacing': pacing,
+        'scheduler': {key: value for key, value in scheduler.stats().items() if key != 'jobs'},
+        'pool': driver_pool.stats() if driver_pool is not None else None,
+        'shared_browser': shared_browser_stats(),
+        'janitor': janitor.stats(),
+        'watchdog': watchdog.stats(),
+        'events': events.stats()
+    }
+
+@app.route('/api/stats')
+def stats_summary():
+    """Retorna o mesmo resumo de estatísticas enviado periodicamente aos clientes"""
+    return jsonify(collect_stats())
+
+def stats_loop():
+    """Envia periodicamente as estatísticas para os clientes conectados"""
+    while True:
+        socketio.sleep(STATS_INTERVAL)
+        try:
+            socketio.emit('stats', collect_stats())
+        except Exception as e:
+            app.logger.warning(f'Erro ao enviar estatísticas: {str(e)}')
+
 @socketio.on('connect')
 def handle_connect():
     """Manipula conexão do WebSocket"""
-    profiles = detect_edge_profiles()
-    socketio.emit('profiles_updated', profiles)
+    emit('profiles_updated', profile_registry.get_profiles())
+    # Execuções em andamento, para que o painel possa acompanhá-las
+    emit('active_runs', scheduler.stats()['jobs'])
+
+@socketio.on('join_run')
+def handle_join_run(data):
+    """Inscreve o cliente nos eventos de uma execução e envia os eventos recentes"""
+    run_id = data.get('run_id')
+    if not run_id:
+        return
+    join_room(run_room(run_id))
+    backlog = events.backlog(run_id, int(data.get('after', 0)))
+    if backlog:
+        emit('events', backlog)
+
+@socketio.on('leave_run')
+def handle_leave_run(data):
+    """Cancela a inscrição do cliente nos eventos de uma execução"""
+    if data.get('run_id'):
+        leave_room(run_room(data['run_id']))
 
 @socketio.on('refresh_profiles')
 def handle_refresh_profiles():
     """Atualiza a lista de perfis"""
     try:
         profiles = detect_edge_profiles()
-        socketio.emit('profiles_updated', profiles)
-        socketio.emit('log', 'Perfis atualizados com sucesso')
+        emit('profiles_updated', profiles)
+        emit('log', 'Perfis atualizados com sucesso')
     except Exception as e:
-        socketio.emit('log', f'Erro ao atualizar perfis: {str(e)}')
+        emit('log', f'Erro ao atualizar perfis: {str(e)}')
 
 @socketio.on('start_automation')
 def handle_start_automation(config):
@@ -47,70 +168,70 @@ def handle_start_automation(config):
     try:
         profile_path = config.get('profile')
         if not profile_path:
-            socketio.emit('log', 'Perfil não selecionado')
+            emit('log', 'Perfil não selecionado')
             return
             
         if not os.path.exists(profile_path):
-            socketio.emit('log', 'Caminho do perfil não existe')
+            emit('log', 'Caminho do perfil não existe')
             return
             
         # Verifica se o caminho do perfil é válido
         if not os.path.isdir(profile_path):
-            socketio.emit('log', 'Caminho do perfil inválido')
+            emit('log', 'Caminho do perfil inválido')
             return
             
-        # Cria uma nova instância de automação
-        automation = EdgeAutomation(
+        # Enfileira a automação no scheduler
+        job = scheduler.submit(
             profile_path=profile_path,
             device_type=config.get('deviceType', 'desktop'),
             config={
                 'typing_speed': config.get('typingSpeed', 'normal'),
                 'min_interval': config.get('minInterval', MIN_SEARCH_INTERVAL),
                 'max_interval': config.get('maxInterval', MAX_SEARCH_INTERVAL),
+                'adaptive_interval': config.get('adaptiveInterval', ADAPTIVE_INTERVAL),
                 'click_results': config.get('clickResults', False),
                 'click_count': config.get('clickCount', 2),
                 'read_time': config.get('readTime', 10),
-                'random_scroll': config.get('randomScroll', False)
-            }
+                'concurrent_reading': config.get('concurrentReading', CONCURRENT_READING),
+                'random_scroll': config.get('randomScroll', False),
+                'term_diversity': config.get('termDiversity', TERM_DIVERSITY)
+            },
+            search_count=config.get('searchCount', DEFAULT_SEARCH_COUNT),
+            priority=int(config.get('priority', 0))
         )
         
-        active_automations[profile_path] = automation
-        
-        def run_automation():
-            try:
-                socketio.emit('automation_started')
-                automation.start_automation(config.get('searchCount', DEFAULT_SEARCH_COUNT))
-            except Exception as e:
-                socketio.emit('log', f'Erro durante a automação: {str(e)}')
-            finally:
-                if profile_path in active_automations:
-                    del active_automations[profile_path]
-                socketio.emit('automation_stopped')
-                
-        thread = Thread(target=run_automation)
-        thread.daemon = True
-        thread.start()
+        # Quem iniciou a execução passa a receber os seus eventos
+        join_room(run_room(job.job_id))
+        emit('run_created', job.to_dict())
+        emit('events', events.backlog(job.job_id))
         
     except Exception as e:
-        socketio.emit('log', f'Erro ao iniciar automação: {str(e)}')
+        emit('log', f'Erro ao iniciar automação: {str(e)}')
 
 @socketio.on('stop_automation')
-def handle_stop_automation():
-    """Para a automação em execução"""
+def handle_stop_automation(data=None):
+    """Para uma execução (run_id) ou todas as automações em execução"""
     try:
-        # Cria uma cópia das chaves para evitar erro de modificação durante iteração
-        profiles_to_stop = list(active_automations.keys())
-        
-        for profile in profiles_to_stop:
-            automation = active_automations.get(profile)
-            if automation:
-                automation.stop_automation()
-                del active_automations[profile]
-                
-        socketio.emit('log', 'Automação interrompida com sucesso')
+        run_id = (data or {}).get('run_id')
+        if run_id:
+            if not scheduler.cancel(run_id):
+                emit('log', f'Automação {run_id} não encontrada')
+                return
+        else:
+            scheduler.stop_all()
+        emit('log', 'Automação interrompida com sucesso')
     except Exception as e:
-        socketio.emit('log', f'Erro ao parar automação: {str(e)}')
+        emit('log', f'Erro ao parar automação: {str(e)}')
 
 def run_server(host='0.0.0.0', port=5000, debug=False):
     """Inicia o servidor Flask"""
+    # Recupera diretórios de sessões anteriores e mantém a limpeza em segundo plano
+    janitor.start()
+    events.start()
+    socketio.start_background_task(stats_loop)
+    if AUTO_DETECT_PROFILES:
+        profile_registry.start_watcher(
+            PROFILE_REFRESH_INTERVAL,
+            lambda profiles: socketio.emit('profiles_updated', profiles)
+        )
     socketio.run(app, host=host, port=port, debug=debug) 
\ No newline at end of file
@@ -0,0 +1,116 @@
+import time
+import logging
+import threading
+import itertools
+from collections import deque, OrderedDict
+from typing import Optional, Dict, Any, List
+from ..config.settings import EVENT_FLUSH_INTERVAL, EVENT_BACKLOG_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Número de execuções cujo histórico de eventos é mantido para quem entrar depois
+MAX_RUN_BACKLOGS = 50
+
+
+def run_room(run_id: str) -> str:
+    """Sala do Socket.IO com os eventos de uma execução"""
+    return f'run:{run_id}'
+
+
+class EventStream:
+    """
+    Agrupa os eventos enviados ao painel e os entrega por execução.
+
+    Cada execução tem uma sala própria e um buffer circular com os eventos mais
+    recentes, enviado a quem entra na sala depois. Os eventos não são emitidos
+    um a um: a cada flush_interval cada sala recebe um único lote ('events') e
+    os eventos globais recebem apenas o valor mais recente.
+    """
+
+    def __init__(self, socketio, flush_interval: float = EVENT_FLUSH_INTERVAL,
+                 backlog_size: int = EVENT_BACKLOG_SIZE):
+        """
+        Args:
+            socketio: Instância do SocketIO usada para emitir os lotes
+            flush_interval: Intervalo entre lotes, em segundos
+            backlog_size: Eventos mantidos por execução para quem entrar depois
+        """
+        self.socketio = socketio
+        self.flush_interval = flush_interval
+        self.backlog_size = backlog_size
+        self.batches_sent = 0
+        self.events_published = 0
+
+        self._seq = itertools.count(1)
+        self._backlogs: "OrderedDict[str, deque]" = OrderedDict()
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_global: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        """Inicia a tarefa que envia os lotes periodicamente"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.socketio.start_background_task(self._flush_loop)
+
+    def publish(self, run_id: str, event: str, data: Any = None):
+        """Registra um evento de uma execução para o próximo lote da sua sala"""
+        entry = {
+            'run_id': run_id,
+            'seq': next(self._seq),
+            'time': time.time(),
+            'event': event,
+            'data': data
+        }
+        with self._lock:
+            backlog = self._backlogs.get(run_id)
+            if backlog is None:
+                backlog = self._backlogs[run_id] = deque(maxlen=self.backlog_size)
+                while len(self._backlogs) > MAX_RUN_BACKLOGS:
+                    self._backlogs.popitem(last=False)
+            backlog.append(entry)
+            self._pending.setdefault(run_id, []).append(entry)
+            self.events_published += 1
+
+    def publish_global(self, event: str, data: Any = None):
+        """Registra um evento para todos os clientes; dentro de um lote vale o último valor"""
+        with self._lock:
+            self._pending_global[event] = data
+
+    def backlog(self, run_id: str, after_seq: int = 0) -> List[Dict[str, Any]]:
+        """Eventos recentes de uma execução, a partir de after_seq"""
+        with self._lock:
+            return [entry for entry in self._backlogs.get(run_id, ()) if entry['seq'] > after_seq]
+
+    def flush(self):
+        """Envia os eventos acumulados desde o último lote"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            pending_global, self._pending_global = self._pending_global, {}
+
+        for run_id, entries in pending.items():
+            self.socketio.emit('events', entries, to=run_room(run_id))
+            self.batches_sent += 1
+        for event, data in pending_global.items():
+            self.socketio.emit(event, data)
+
+    def _flush_loop(self):
+        while True:
+            self.socketio.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Erro ao enviar eventos: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            runs = len(self._backlogs)
+        return {
+            'runs': runs,
+            'events_published': self.events_published,
+            'batches_sent': self.batches_sent,
+            'flush_interval': self.flush_interval
+        }
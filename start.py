@@ -14,9 +14,9 @@ import platform
 import subprocess
 import importlib.util
 import re
-import webbrowser
-import urllib.request
 import json
+import argparse
+from src.auto_search.config.environment import load_environment
 
 # Verificar versão do Python
 python_version = platform.python_version()
@@ -33,12 +33,16 @@ DEPENDENCIES = [
 
 def check_python_update():
     """Verifica se há uma versão mais recente do Python disponível"""
+    # Importados aqui para não pesar no início rápido (--fast), que não faz esta verificação
+    import urllib.request
+    import webbrowser
+
     print("Verificando atualizações do Python...")
     current_version = tuple(map(int, platform.python_version().split('.')))
     
     try:
         # Obtém a versão mais recente do Python da API do Python.org
-        with urllib.request.urlopen("https://www.python.org/api/v2/downloads/release/?is_published=true&status=final&version_type=release") as response:
+        with urllib.request.urlopen("https://www.python.org/api/v2/downloads/release/?is_published=true&status=final&version_type=release", timeout=5) as response:
             data = json.loads(response.read().decode())
             
         # Filtra apenas as versões 3.x
@@ -102,35 +106,54 @@ def check_and_install_dependencies():
     else:
         print("Todas as dependências estão instaladas.")
 
-from src.auto_search.web.app import run_server
-from src.auto_search.config.settings import LOG_LEVEL, LOG_FILE
-
-def setup_logging():
+def setup_logging(json_output: bool = False):
     """Configura o sistema de logging"""
-    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-    
-    logging.basicConfig(
-        level=getattr(logging, LOG_LEVEL.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(LOG_FILE),
-            logging.StreamHandler()
-        ]
-    )
+    from src.auto_search.config.logging_config import setup_logging as configure_logging
+
+    configure_logging(json_output=True if json_output else None)
     
     logger = logging.getLogger("auto_search")
     logger.info(f"Iniciando Auto Search 1.0.2 (Python {python_version})")
 
+def parse_args():
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description="Auto Search 1.0.2")
+    parser.add_argument(
+        '--driver-path',
+        help='Caminho de um msedgedriver fixo (dispensa a resolução automática)'
+    )
+    parser.add_argument(
+        '--log-json',
+        action='store_true',
+        help='Grava os logs em JSON, um objeto por linha'
+    )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        default=os.getenv('FAST_START', 'false').lower() == 'true',
+        help='Inicia sem verificar atualizações do Python e dependências (FAST_START=true)'
+    )
+    return parser.parse_args()
+
 def main():
     """Função principal que inicia a aplicação"""
-    # Verificar atualizações do Python
-    check_python_update()
+    # Carregar variáveis do .env antes de ler os argumentos (o --fast usa FAST_START)
+    # e de importar as configurações
+    load_environment()
     
-    # Verificar e instalar dependências
-    check_and_install_dependencies()
+    args = parse_args()
+    if args.driver_path:
+        os.environ['EDGE_DRIVER_PATH'] = os.path.abspath(args.driver_path)
+    
+    if not args.fast:
+        # Verificar atualizações do Python
+        check_python_update()
+        
+        # Verificar e instalar dependências
+        check_and_install_dependencies()
     
     # Configurar logging
-    setup_logging()
+    setup_logging(args.log_json)
     
     # Definir configurações do servidor
     host = os.getenv('HOST', '127.0.0.1')  # Usando localhost por padrão para maior segurança
@@ -143,7 +166,8 @@ def main():
     print(f"Servidor iniciado em http://{host}:{port}")
     print(f"Pressione Ctrl+C para encerrar")
     
-    # Iniciar servidor web
+    # Iniciar servidor web (importado só agora, depois das dependências verificadas)
+    from src.auto_search.web.app import run_server
     try:
         run_server(host=host, port=port, debug=debug)
     except KeyboardInterrupt: